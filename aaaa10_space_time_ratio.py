@@ -1,7 +1,9 @@
-from decimal import Decimal, getcontext
+from decimal import Decimal, getcontext, localcontext
 
-# Set desired precision
-getcontext().prec = 100
+# Set desired precision, for the constants below and scaled_constants(),
+# the precision of whoever imports this is put back after the constants
+PRECISION = 100
+_precision, getcontext().prec = getcontext().prec, PRECISION
 
 c = Decimal(299792458.0)    # m/s
 h = Decimal(6.62607015e-34) # m^2 kg / s
@@ -16,41 +18,50 @@ space_time_ratio1  = m/m_P # dimensionless,
 s_t   = (h*c*G)**(half)     # m^3/s^2  the s_t is short for space time factor
 space_time_ratio = s_t/c**3  # this version has units of second, this cancels an s from denom in next line
 # s_t   = space_time_ratio* c**3   # m^3/s^2 - This is the new definition for s_t in the framework
-print (f"space time ratio comparison: {space_time_ratio/space_time_ratio1}")
-print (f"s_t was this value all along  h*c/m_P={h*c/m_P :<13.8e} s_t = { s_t:<13.8e}")
-print (f" Showing mass of 1 Hz photon from G  G * m_P**2/c**3 = { G * m_P**2/c**3:<13.8e} ")
 
-def calculate_and_print_results_new(value_pairs, c_old, m_old):
-    for pair in value_pairs:
-        m_scaling, l_scaling = map(Decimal, pair)  # Attempt to convert values to decimals
+def scaled_constants(pair, c_old, m_old):
+    """m, c, m_P, p, h, hc and G in the units scaled by an (m_scaling, l_scaling) pair."""
+    with localcontext() as ctx:
+        ctx.prec = PRECISION
+        return _scaled_constants(pair, c_old, m_old)
 
-        m   = m_old * m_scaling
-        c   = c_old * l_scaling # m/s
+def _scaled_constants(pair, c_old, m_old):
+    m_scaling, l_scaling = map(Decimal, pair)  # Attempt to convert values to decimals
 
-        # s_t/c^3 = 1.35138507828e-43  # has units of s
-        # s_t = space_time_ratio* c**3
+    m   = m_old * m_scaling
+    c   = c_old * l_scaling # m/s
+
+    # s_t/c^3 = 1.35138507828e-43  # has units of s
+    # s_t = space_time_ratio* c**3
+
+    # m/m_P  = 1.35138507828e-43
+    m_P = m / space_time_ratio  #  dimensionless
+
+    # G = s_t/m_P
+    # G = (space_time_ratio* c**3) / (m / space_time_ratio)
+    # G = (space_time_ratio**2 * c**3) / m 
+    # G = ((m/m_P)**2 * c**3) / m 
+    # G = (m * (1/m_P)**2 * c**3)  
+    # G = m * c**3 / m_P**2 
 
-        # m/m_P  = 1.35138507828e-43
-        m_P = m / space_time_ratio  #  dimensionless
+    
+    # hc = s_t * m_P
+    # hc = (space_time_ratio* c**3) * (m / space_time_ratio)
+    # hc =  c** 3 * m
 
-        # G = s_t/m_P
-        # G = (space_time_ratio* c**3) / (m / space_time_ratio)
-        # G = (space_time_ratio**2 * c**3) / m 
-        # G = ((m/m_P)**2 * c**3) / m 
-        # G = (m * (1/m_P)**2 * c**3)  
-        # G = m * c**3 / m_P**2 
+    p  = m * c
+    h  = m * c**2  
+    hc = m * c**3  
+    G  = m * c**3 / m_P**2 
 
-        
-        # hc = s_t * m_P
-        # hc = (space_time_ratio* c**3) * (m / space_time_ratio)
-        # hc =  c** 3 * m
+    return {'m': m, 'c': c, 'm_P': m_P, 'p': p, 'h': h, 'hc': hc, 'G': G}
 
-        p  = m * c
-        h  = m * c**2  
-        hc = m * c**3  
-        G  = m * c**3 / m_P**2 
+def calculate_and_print_results_new(value_pairs, c_old, m_old):
+    for pair in value_pairs:
+        m_scaling, l_scaling = map(Decimal, pair)
+        k = scaled_constants(pair, c_old, m_old)
 
-        print (f"     {1/l_scaling:<10.5e} {m_scaling:<10.5e} {hc:<13.8e} {h:<13.8e} {p:<13.8} {m:<13.8} {G:<13.8}")
+        print (f"     {1/l_scaling:<10.5e} {m_scaling:<10.5e} {k['hc']:<13.8e} {k['h']:<13.8e} {k['p']:<13.8} {k['m']:<13.8} {k['G']:<13.8}")
 
 '''
         # s_t/c^3 = 1.35138507828e-43  # has units of s
@@ -86,14 +97,24 @@ scaling_pairs = [
 #    (1/(h/c**2), 1/c),
 ]
 
-print()
-print()
-print("\n     ----  Exploring h, hc and G  ------- ")
-print()
-print("      s_length   s_mass     hc             h              p             m             G")
-calculate_and_print_results_new(scaling_pairs, c, m)
-print()
-print()
+getcontext().prec = _precision
+
+
+if __name__ == "__main__":
+    getcontext().prec = PRECISION
+
+    print (f"space time ratio comparison: {space_time_ratio/space_time_ratio1}")
+    print (f"s_t was this value all along  h*c/m_P={h*c/m_P :<13.8e} s_t = { s_t:<13.8e}")
+    print (f" Showing mass of 1 Hz photon from G  G * m_P**2/c**3 = { G * m_P**2/c**3:<13.8e} ")
+
+    print()
+    print()
+    print("\n     ----  Exploring h, hc and G  ------- ")
+    print()
+    print("      s_length   s_mass     hc             h              p             m             G")
+    calculate_and_print_results_new(scaling_pairs, c, m)
+    print()
+    print()
 
 
 
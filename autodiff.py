@@ -0,0 +1,228 @@
+import math
+import types
+from decimal import Decimal as D
+from typing import Dict, NamedTuple, Optional, Sequence, Tuple
+
+import decimal_math
+from constants_registry import known
+from formula_compiler import compile_validation
+
+'''
+    Forward mode automatic differentiation of the frameworks.
+
+    A Dual carries a value and its partial derivatives with respect to a
+    few chosen inputs.  Arithmetic on Duals applies the chain rule as it
+    goes, so evaluating the formulas once with Duals gives every derived
+    constant together with all its partials.  No reruns with nudged inputs
+    are needed, and the partials are exact to the working precision
+    instead of finite difference estimates.
+
+    The frameworks are differentiated without changing them: the same
+    calculate_unit_scaling() and validate_planck_units() run in a namespace
+    where known(), c, k_B, e_0, pi, D and d_p hand out Duals, the same
+    trick validate_planck_units_batch() uses to run them on numpy arrays.
+
+        from constants_framework import calculate_unit_scaling, validate_planck_units
+        result = sensitivities(calculate_unit_scaling, validate_planck_units)
+        result = {name.strip(): s for name, s in result.items()}
+        result['Planck Length'].elasticities['G']       # 0.5, l_P ~ sqrt(G)
+
+    The keys are the names of validate_planck_units(), some of which start
+    with a newline in constants_framework.py, hence the strip().
+
+    The values can be Decimal (at the current context precision) or float.
+'''
+
+# the reference constants to differentiate with respect to, by default
+# those of them that at least one calculated constant depends on
+WRT = ('h', 'G', 'c', 'k_B', 'e', 'epsilon_0')
+
+# catalog symbols the frameworks keep in module globals, and the global names
+_GLOBALS = {'c': 'c', 'k_B': 'k_B', 'epsilon_0': 'e_0'}
+
+
+def _sqrt(x):
+    return x.sqrt() if isinstance(x, D) else math.sqrt(x)
+
+
+def _ln(x):
+    return x.ln() if isinstance(x, D) else math.log(x)
+
+
+def _exp(x):
+    return x.exp() if isinstance(x, D) else math.exp(x)
+
+
+class Dual:
+    """A value with its gradient, a tuple of partials in the order of the seeds."""
+
+    __slots__ = ('value', 'grad')
+
+    def __init__(self, value, grad):
+        self.value = value
+        self.grad = grad
+
+    def _lift(self, other):
+        if isinstance(other, Dual):
+            return other
+        zero = self.value * 0
+        return Dual(type(self.value)(other), (zero,) * len(self.grad))
+
+    def __add__(self, other):
+        other = self._lift(other)
+        return Dual(self.value + other.value, tuple(a + b for a, b in zip(self.grad, other.grad)))
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        other = self._lift(other)
+        return Dual(self.value - other.value, tuple(a - b for a, b in zip(self.grad, other.grad)))
+
+    def __rsub__(self, other):
+        return self._lift(other) - self
+
+    def __mul__(self, other):
+        other = self._lift(other)
+        return Dual(self.value * other.value,
+                    tuple(a * other.value + self.value * b for a, b in zip(self.grad, other.grad)))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        other = self._lift(other)
+        value = self.value / other.value
+        return Dual(value, tuple((a - value * b) / other.value for a, b in zip(self.grad, other.grad)))
+
+    def __rtruediv__(self, other):
+        return self._lift(other) / self
+
+    def __pow__(self, other):
+        return dual_power(self, other)
+
+    def __rpow__(self, other):
+        return dual_power(self._lift(other), self)
+
+    def __neg__(self):
+        return Dual(-self.value, tuple(-a for a in self.grad))
+
+    def __pos__(self):
+        return Dual(+self.value, self.grad)
+
+    def __abs__(self):
+        return -self if self.value < 0 else self
+
+    def sqrt(self):
+        root = _sqrt(self.value)
+        return Dual(root, tuple(a / (2 * root) for a in self.grad))
+
+    def ln(self):
+        return Dual(_ln(self.value), tuple(a / self.value for a in self.grad))
+
+    def exp(self):
+        value = _exp(self.value)
+        return Dual(value, tuple(a * value for a in self.grad))
+
+    def __repr__(self):
+        return f"Dual({self.value!r}, {self.grad!r})"
+
+
+def dual_power(base, exponent):
+    """base**exponent for Duals, the value through decimal_math.d_p for Decimals."""
+    if not isinstance(base, Dual):
+        base = exponent._lift(base)
+    exponent = base._lift(exponent)
+    if isinstance(base.value, D):
+        value = decimal_math.d_p(base.value, exponent.value)
+    else:
+        value = base.value ** exponent.value
+    # d(b^p) = p b^(p-1) db + b^p ln(b) dp
+    scale = exponent.value * value / base.value if base.value else exponent.value * 0
+    if any(exponent.grad):
+        log = _ln(base.value)
+        grad = tuple(scale * a + value * log * b for a, b in zip(base.grad, exponent.grad))
+    else:
+        grad = tuple(scale * a for a in base.grad)
+    return Dual(value, grad)
+
+
+def dual_namespace(namespace, wrt: Sequence[str] = WRT, kind=D) -> Dict:
+    """
+    A copy of a framework's globals where the constants in wrt are seeded
+    Duals and every other number becomes a constant Dual.
+    """
+    one, zero = kind(1), kind(0)
+    seeds = {symbol: Dual(known(symbol, kind),
+                          tuple(one if i == j else zero for j in range(len(wrt))))
+             for i, symbol in enumerate(wrt)}
+    constant = lambda x: Dual(kind(x), (zero,) * len(wrt))
+
+    namespace = dict(namespace, D=constant, d_p=dual_power,
+                     known=lambda key: seeds.get(key) or constant(known(key, kind)))
+    for name in ('d_pi', 'd_sqrt_two_pi'):
+        if name in namespace:
+            namespace[name] = lambda value=namespace[name]: constant(value())
+    for symbol, name in _GLOBALS.items():
+        if name in namespace:
+            namespace[name] = seeds.get(symbol) or constant(namespace[name])
+    return namespace
+
+
+class Sensitivity(NamedTuple):
+    value:        object
+    partials:     Dict[str, object]     # d value / d input
+    elasticities: Dict[str, object]     # d ln value / d ln input
+
+
+def sensitivities(calculate_unit_scaling, validate_planck_units, wrt: Optional[Sequence[str]] = None,
+                  kind=D) -> Dict[str, Sensitivity]:
+    """
+    Every constant of validate_planck_units with its partial derivatives
+    with respect to wrt, in one pass.  The scaling factors come from
+    calculate_unit_scaling run in the same Dual namespace.
+
+    Without wrt the inputs are those of WRT that the framework reads:
+    constants_framework.py never reads epsilon_0, so its partials, all
+    zero, are left out there.
+    """
+    prune = wrt is None
+    wrt = tuple(WRT if wrt is None else wrt)
+    namespace = dual_namespace(calculate_unit_scaling.__globals__, wrt, kind)
+    scaling = types.FunctionType(calculate_unit_scaling.__code__, namespace)()
+    compiled = compile_validation(validate_planck_units, namespace)
+
+    inputs = {symbol: known(symbol, kind) for symbol in wrt}
+    duals = []
+    for dual in compiled.calculate(*scaling):
+        if not isinstance(dual, Dual):                    # a bare constant formula
+            dual = Dual(kind(dual), (kind(0),) * len(wrt))
+        duals.append(dual)
+    used = [i for i in range(len(wrt)) if not prune or any(d.grad[i] for d in duals)]
+
+    results = {}
+    for name, dual in zip(compiled.names, duals):
+        partials = {wrt[i]: dual.grad[i] for i in used}
+        results[name] = Sensitivity(
+            dual.value, partials,
+            {s: partials[s] * inputs[s] / dual.value for s in partials})
+    return results
+
+
+if __name__ == "__main__":
+    import sys
+    import importlib
+
+    from decimal import getcontext
+
+    module = importlib.import_module(sys.argv[1] if len(sys.argv) > 1 else 'constants_framework')
+    getcontext().prec = module.PRECISION
+    result = sensitivities(module.calculate_unit_scaling, module.validate_planck_units)
+    inputs = list(next(iter(result.values())).partials)
+
+    print(f"d ln(constant) / d ln(input) for {module.__name__}\n")
+    print(f"{'Name':<30}" + ''.join(f" | {s:>9}" for s in inputs))
+    print("-" * (30 + 12 * len(inputs)))
+    for name, sensitivity in result.items():
+        if name.startswith('\n'):
+            print()
+        print(f"{name.strip():<30}" + ''.join(f" | {float(sensitivity.elasticities[s]):>9.4f}"
+                                              for s in inputs))
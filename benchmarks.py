@@ -0,0 +1,311 @@
+import contextlib
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from decimal import localcontext
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+'''
+    Benchmarks of the hot paths, with a stored baseline to compare against.
+
+    Every case is timed the way timeit does it: the call is repeated until
+    a batch takes at least --min-time seconds, then --repeat batches are
+    timed and the per call times kept.  The median is what gets compared.
+
+      framework     calculate_unit_scaling() and validate_planck_units() of
+                    constants_framework.py and simplified_plancks_constants.py
+                    at 28, 50, 100 and 200 digits, both as written and the
+                    validate_planck_units_compiled() that main() runs
+      derive        calculate_derived_constants() of define_const_from_units.py
+      simplify      the sympy rewrites of simplifyconstantformulas.py, from
+                    formula_catalog.txt, with plain simplify() and sympy's
+                    own cache cleared first, so the disk cache of
+                    simplify_cache.py does not turn it into a file read
+      aaaa10        the table loop of aaaa10_space_time_ratio.py and the
+                    direct_forces() of nbody.py with its gravity_force_new()
+      sweep         one shard of the hc and Gc sweeps of sweep_runner.py,
+                    through m, kg and s, in this process
+
+    Results are written as json with the machine they ran on.  A run is
+    compared with the baseline file when there is one, and any case whose
+    median is more than --threshold slower is reported as a regression,
+    with exit status 1:
+
+        python benchmarks.py --update-baseline          # record a baseline
+        python benchmarks.py                            # compare with it
+        python benchmarks.py -k framework --out run.json --threshold 0.05
+
+    benchmark_baseline.json in the repo was recorded on the machine named
+    in it.  Timings from another machine, or another Python, are still
+    compared but the differences are listed first; record a baseline of
+    your own with --update-baseline, at the commit to compare against,
+    before timing a change.
+'''
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+
+PRECISIONS = (28, 50, 100, 200)
+FRAMEWORKS = ('constants_framework', 'simplified_plancks_constants')
+VALIDATE = {'source': 'validate_planck_units', 'compiled': 'validate_planck_units_compiled'}
+
+# the formulas of formula_catalog.txt that simplifyconstantformulas.py rewrites
+SIMPLIFY_FORMULAS = ('thermal de Broglie wavelength', 'Stefan-Boltzmann constant', 'Planck law',
+                     'Wien displacement peak', 'Debye temperature', 'Einstein temperature')
+
+SWEEP_RANGES = {'hc': (1e-30, 1e-20), 'Gc': (1e-3, 1e3)}
+
+
+class Case(NamedTuple):
+    group:  str
+    params: Dict
+    setup:  Callable        # () -> the function to time, called with no arguments
+
+    @property
+    def name(self):
+        return f"{self.group}[{','.join(f'{k}={v}' for k, v in self.params.items())}]"
+
+
+class Comparison(NamedTuple):
+    name:     str
+    baseline: Optional[float]   # median seconds, None for a new case
+    current:  float
+    ratio:    Optional[float]   # current / baseline
+    regressed: bool
+
+
+def _quiet(func):
+    """func with its printing thrown away, for the functions that print as they go."""
+    def run():
+        with open(os.devnull, 'w') as sink, contextlib.redirect_stdout(sink):
+            return func()
+    return run
+
+
+def _framework(module, prec, validate):
+    import importlib
+    framework = importlib.import_module(module)
+    validate = getattr(framework, VALIDATE[validate])
+
+    def run():
+        with localcontext() as ctx:
+            ctx.prec = prec
+            return validate(*framework.calculate_unit_scaling())
+    return run
+
+
+def _derive():
+    import define_const_from_units as dc
+    base = dc.calculate_base_units(dc.h, dc.c, dc.G)
+    return _quiet(lambda: dc.calculate_derived_constants(*base))
+
+
+def _simplify(name):
+    from sympy import Symbol, simplify
+    from sympy.core.cache import clear_cache
+    from formula_rewriter import _parse, _substitutions, parse_catalog
+
+    _, formula, stages, positive = next(f for f in parse_catalog() if f[0] == name)
+    names = {n: Symbol(n, positive=True) for n in positive}
+    names.setdefault('two_pi', Symbol('2*pi', positive=True))
+    original = _parse(formula, names)
+    subs = [_substitutions(stage, names) for stage in stages]
+
+    def run():
+        clear_cache()
+        expr = original
+        for stage in subs:
+            expr = simplify(expr.subs(stage))
+        return expr
+    return run
+
+
+def _aaaa10_table():
+    import aaaa10_space_time_ratio as st
+    return _quiet(lambda: st.calculate_and_print_results_new(st.scaling_pairs, st.c, st.m))
+
+
+def _aaaa10_force(bodies):
+    from nbody import direct_forces, plummer
+    positions, masses = plummer(bodies, seed=0)
+    return lambda: direct_forces(positions, masses, 'new')
+
+
+def _sweep(kind, rows):
+    from sweep_runner import UNITS, _run_shard
+    first, last = SWEEP_RANGES[kind]
+    tasks = [(kind, unit, first, last, rows, 0, rows, False) for unit in UNITS]
+    return lambda: [_run_shard(task) for task in tasks]
+
+
+def cases() -> List[Case]:
+    found = [Case('framework', {'module': module, 'validate': validate, 'prec': prec},
+                  lambda module=module, prec=prec, validate=validate: _framework(module, prec, validate))
+             for module in FRAMEWORKS for validate in VALIDATE for prec in PRECISIONS]
+    found.append(Case('derive', {}, _derive))
+    found += [Case('simplify', {'formula': name}, lambda name=name: _simplify(name))
+              for name in SIMPLIFY_FORMULAS]
+    found.append(Case('aaaa10', {'loop': 'table'}, _aaaa10_table))
+    found += [Case('aaaa10', {'loop': 'force', 'bodies': n}, lambda n=n: _aaaa10_force(n))
+              for n in (256, 2048)]
+    found += [Case('sweep', {'kind': kind, 'rows': 65536}, lambda kind=kind: _sweep(kind, 65536))
+              for kind in SWEEP_RANGES]
+    return found
+
+
+def measure(func, repeat=5, min_time=0.2) -> Dict:
+    """Per call times of func: the batch size is grown until a batch takes min_time, then repeat batches."""
+    func()                                     # warm up, imports and caches
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+
+    times = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        times.append((time.perf_counter() - start) / number)
+    return {
+        'number': number, 'repeat': repeat,
+        'min': min(times), 'median': statistics.median(times), 'mean': statistics.fmean(times),
+        'stdev': statistics.stdev(times) if len(times) > 1 else 0.0,
+        'times': times,
+    }
+
+
+def _version(module):
+    try:
+        return __import__(module).__version__
+    except ImportError:
+        return None
+
+
+def machine() -> Dict:
+    """What the timings depend on besides the code."""
+    import decimal
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, timeout=10,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'libmpdec': getattr(decimal, '__libmpdec_version__', None),
+        'numpy': _version('numpy'),
+        'sympy': _version('sympy'),
+        'commit': commit,
+        'date': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+    }
+
+
+def run(selected=None, repeat=5, min_time=0.2, progress=None) -> Dict:
+    """Time every case, or those whose name contains one of selected; the json document."""
+    results = {}
+    for case in cases():
+        if selected and not any(s in case.name for s in selected):
+            continue
+        results[case.name] = dict(measure(case.setup(), repeat, min_time), group=case.group, params=case.params)
+        if progress:
+            progress(case.name, results[case.name])
+    return {'machine': machine(), 'results': results}
+
+
+def compare(current, baseline, threshold=0.10) -> List[Comparison]:
+    """Every case of current against baseline by median; regressed when slower by more than threshold."""
+    compared = []
+    for name, result in current['results'].items():
+        old = baseline['results'].get(name)
+        if old is None:
+            compared.append(Comparison(name, None, result['median'], None, False))
+            continue
+        ratio = result['median'] / old['median']
+        compared.append(Comparison(name, old['median'], result['median'], ratio, ratio > 1 + threshold))
+    return compared
+
+
+def machine_differences(current, baseline) -> Dict:
+    """Metadata that differs between two runs, other than the commit and date."""
+    return {key: (baseline['machine'].get(key), value) for key, value in current['machine'].items()
+            if key not in ('commit', 'date') and baseline['machine'].get(key) != value}
+
+
+def _seconds(value):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if value >= scale:
+            return f"{value / scale:8.3f} {unit}"
+    return f"{value / 1e-9:8.1f} ns"
+
+
+def _write(path, document):
+    temp = f"{path}.{os.getpid()}.tmp"
+    with open(temp, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=1)
+    os.replace(temp, path)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Time the hot paths and compare with a baseline.")
+    parser.add_argument('-k', dest='selected', action='append',
+                        help="only cases whose name contains this, may be repeated")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.2, help="seconds per timed batch")
+    parser.add_argument('--out', help="write the results to this json file")
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--threshold', type=float, default=0.10, help="slowdown that counts as a regression")
+    parser.add_argument('--update-baseline', action='store_true', help="store this run as the baseline")
+    parser.add_argument('--list', action='store_true', help="list the cases and stop")
+    args = parser.parse_args()
+
+    if args.list:
+        for case in cases():
+            print(case.name)
+        sys.exit(0)
+
+    document = run(args.selected, args.repeat, args.min_time,
+                   lambda name, r: print(f"{name:<72} {_seconds(r['median'])}  ±{_seconds(r['stdev']).strip()}"))
+    if args.out:
+        _write(args.out, document)
+        print(f"\nresults written to {args.out}")
+
+    if args.update_baseline:
+        _write(args.baseline, document)
+        print(f"baseline written to {args.baseline}")
+        sys.exit(0)
+    if not os.path.exists(args.baseline):
+        print(f"\nno baseline at {args.baseline}, record one with --update-baseline")
+        sys.exit(0)
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    print(f"\nagainst {args.baseline} ({baseline['machine'].get('commit') or 'unknown commit'}, "
+          f"{baseline['machine'].get('date')})")
+    for key, (old, new) in machine_differences(document, baseline).items():
+        print(f"  note: {key} was {old}, now {new}")
+    regressions = 0
+    for c in compare(document, baseline, args.threshold):
+        if c.baseline is None:
+            print(f"  {c.name:<72} new")
+            continue
+        flag = 'REGRESSION' if c.regressed else ''
+        print(f"  {c.name:<72} {_seconds(c.baseline)} -> {_seconds(c.current)}  {c.ratio:6.3f}x {flag}")
+        regressions += c.regressed
+    print(f"\n{regressions} regression(s) beyond {args.threshold:.0%}")
+    sys.exit(1 if regressions else 0)
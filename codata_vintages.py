@@ -0,0 +1,286 @@
+import os
+import re
+import types
+from decimal import Decimal as D, getcontext
+from typing import Dict, List, NamedTuple
+
+import numpy as np
+
+from constants_registry import build_snapshot, open_registry, registry
+from decimal_math import d_p
+from unit_algebra import UnitCatalog
+
+'''
+    The frameworks against every CODATA adjustment at once.
+
+    constants_catalog.txt holds one set of values, CODATA 2022.  This reads
+    the complete listings NIST publishes for each adjustment, the
+    allascii.txt files of https://physics.nist.gov/constants, from local
+    disk, for as many vintages as are given:
+
+        python codata_vintages.py codata/2014/allascii.txt codata/2018/allascii.txt \\
+                                  codata/2022/allascii.txt --csv residuals.csv
+
+    and runs constants_framework.py, simplified_plancks_constants.py and
+    define_const_from_units.py against each, into one matrix of residuals,
+    a row per vintage and a column per constant.  The first row is the
+    catalog itself, except for define_const_from_units.py, which is run
+    there against the CODATA 2018 values it was fitted to.
+
+      - a listing is parsed once and kept as a constants_registry.py
+        snapshot next to it, the same indexed binary format as the catalog,
+        so opening it again is an mmap and a hash probe per lookup
+      - rows are matched to catalog symbols by name, with the names NIST
+        has since changed in ALIASES
+      - a few catalog constants that are not in the listings (hc, the
+        photon at 1 Hz, the Planck units built on h) are worked out from
+        the vintage's h, c, G, k_B and epsilon_0; anything else missing
+        keeps its catalog value and is listed in Vintage.fallbacks
+      - the two Decimal frameworks run once for all vintages, on numpy
+        object arrays holding a Decimal per vintage, so every formula is
+        evaluated one time and each value is digit for digit what a run
+        on that vintage alone gives
+'''
+
+# names NIST used before renaming them, old -> current
+ALIASES = {
+    'electric constant':                'vacuum electric permittivity',
+    'mag. constant':                    'vacuum magnetic permeability',
+    'Planck constant over 2 pi':        'reduced Planck constant',
+    'Planck constant over 2 pi times c in MeV fm': 'reduced Planck constant times c in MeV fm',
+    'Newtonian constant of gravitation over h-bar c': 'Newtonian constant of gravitation over hbar c',
+}
+
+# catalog constants that NIST does not list, from the ones it does
+DERIVED = {
+    'hc':    lambda k: k('h') * k('c'),
+    'p_1Hz': lambda k: k('h') / k('c'),
+    'm_1Hz': lambda k: k('h') / k('c')**2,
+    'l_Ph':  lambda k: (k('h') * k('G') / k('c')**3).sqrt(),
+    't_Ph':  lambda k: (k('h') * k('G') / k('c')**5).sqrt(),
+    'm_Ph':  lambda k: (k('h') * k('c') / k('G')).sqrt(),
+    'q_Ph':  lambda k: (4 * _pi() * k('epsilon_0') * k('h') * k('c')).sqrt(),
+    'T_Ph':  lambda k: (k('h') * k('c') / k('G')).sqrt() * k('c')**2 / k('k_B'),
+}
+
+_COLUMNS = (60, 85, 110)        # value, uncertainty and unit columns of allascii.txt
+
+# globals the frameworks read instead of calling known(), and the symbol for each
+_GLOBALS = {'c': 'c', 'k_B': 'k_B', 'e_0': 'epsilon_0'}
+
+
+def _pi():
+    import decimal_math
+    return decimal_math.pi()
+
+
+def _number(text):
+    """'6.644 657 3357 e-27' -> '6.6446573357e-27', '(exact)' -> 'exact'"""
+    text = text.strip()
+    if text == '(exact)':
+        return 'exact'
+    return text.replace(' ', '').replace('...', '')
+
+
+def parse_allascii(path):
+    """Rows of a NIST allascii.txt listing for build_snapshot(), symbols taken from the catalog."""
+    catalog = {entry.name: entry for entry in registry()}
+    rows = []
+    seen = set()
+    with open(path, encoding='utf-8', errors='replace') as listing:
+        lines = iter(listing)
+        for line in lines:
+            if line.startswith('-----'):
+                break
+        for line in lines:
+            line = line.rstrip('\n')
+            if not line.strip():
+                continue
+            name = line[:_COLUMNS[0]].strip()
+            value = _number(line[_COLUMNS[0]:_COLUMNS[1]])
+            uncertainty = _number(line[_COLUMNS[1]:_COLUMNS[2]])
+            units = line[_COLUMNS[2]:].strip()
+            D(value)                                  # fail early on a bad number
+            name = ALIASES.get(name, name)
+            if name in seen:
+                continue
+            seen.add(name)
+            entry = catalog.get(name)
+            rows.append((name, entry.symbol if entry else '', value, uncertainty, units,
+                         entry.dimension if entry else (0,) * 7))
+    if not rows:
+        raise ValueError(f"{path} has no constants, is it a NIST allascii.txt listing?")
+    return rows
+
+
+def adjustment(path):
+    """The year of the CODATA adjustment a listing is from, or its file name."""
+    with open(path, encoding='utf-8', errors='replace') as listing:
+        for line in listing:
+            found = re.search(r'(\d{4}) CODATA', line)
+            if found:
+                return found.group(1)
+            if line.startswith('-----'):
+                break
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+class Vintage:
+    """known() for one CODATA adjustment."""
+
+    def __init__(self, label, entries=None):
+        self.label = label
+        self.entries = entries                # None for the catalog itself
+        self.fallbacks = set()                # symbols that came from the catalog
+        self._values: Dict[str, D] = {}
+
+    @classmethod
+    def open(cls, path):
+        """A listing, parsed into its snapshot on first use."""
+        return cls(adjustment(path), open_registry(path, parse_allascii))
+
+    def known(self, key, kind=D):
+        value = self._values.get(key)
+        if value is None:
+            value = self._values[key] = self._lookup(key)
+        return value if kind is D else kind(value)
+
+    def _lookup(self, key):
+        if self.entries is None:
+            return registry().value(key)
+        entry = self.entries.get(key)
+        if entry is None and key in registry():
+            entry = self.entries.get(registry()[key].name)
+        if entry is not None:
+            return entry.value
+        if key in DERIVED:
+            return DERIVED[key](self.known)
+        self.fallbacks.add(key)
+        return registry().value(key)
+
+
+class _Vintages(np.ndarray):
+    """A Decimal per vintage, with the .sqrt() method the frameworks call on Decimals."""
+
+    def sqrt(self):
+        return _sqrt(self).view(_Vintages)
+
+
+_sqrt = np.frompyfunc(lambda x: x.sqrt(), 1, 1)
+_d_p = np.frompyfunc(d_p, 2, 1)
+
+
+def _power(base, exponent):
+    """d_p() of decimal_math.py, a vintage at a time."""
+    result = _d_p(base, exponent)
+    return result.view(_Vintages) if isinstance(result, np.ndarray) else result
+
+
+def _batched_known(vintages):
+    def known(key, kind=D):
+        column = np.empty(len(vintages), dtype=object)
+        column[:] = [v.known(key, kind) for v in vintages]
+        return column.view(_Vintages)
+    return known
+
+
+def _decimal_framework(module, vintages):
+    """{constant: residual per vintage} of one of the Decimal frameworks, in one pass."""
+    known = _batched_known(vintages)
+    namespace = dict(vars(module), known=known, d_p=_power)
+    for name, symbol in _GLOBALS.items():
+        if name in namespace:
+            namespace[name] = known(symbol)
+    scaling = types.FunctionType(module.calculate_unit_scaling.__code__, namespace)
+    validate = types.FunctionType(module.validate_planck_units.__code__, namespace)
+    results = validate(*scaling())
+    shape = (len(vintages),)
+    return {name.strip(): np.broadcast_to((calculated - expected) / expected, shape).astype(np.float64)
+            for name, (expected, calculated, _) in results.items()}
+
+
+def _define_const(vintages):
+    """
+    {constant: calculated / known - 1 per vintage} of define_const_from_units.py,
+    with the base units found from each vintage's own h, c and G.  The
+    catalog row is the script as it runs on its own: its fitted G, checked
+    against its CODATA 2018 reference set.
+    """
+    import define_const_from_units as dc
+
+    columns = {}
+    for row, vintage in enumerate(vintages):
+        k = lambda symbol: vintage.known(symbol, float)
+        if vintage.entries is None:
+            namespace = vars(dc)
+            G = dc.G
+            expected = dc.reference_values().get
+        else:
+            namespace = dict(vars(dc), h=k('h'), c=k('c'), e=k('e'), mol=k('N_A'), k=k('k_B'))
+            G = k('G')
+            expected = lambda name: k(dc.KNOWN_SYMBOLS[name])
+        catalog = UnitCatalog(types.FunctionType(dc.unit_formulas.__code__, namespace)())
+        kg, s, m, K, C, A = dc.calculate_base_units(namespace['h'], namespace['c'], G)
+        calculated = catalog.evaluate(m=m, kg=kg, s=s, K=K, C=C, A=A)
+        for name in dc.KNOWN_SYMBOLS:
+            if name in calculated:
+                columns.setdefault(name, np.empty(len(vintages)))[row] = calculated[name] / expected(name) - 1
+    return columns
+
+
+class Residuals(NamedTuple):
+    vintages:  List[str]
+    columns:   List[str]        # framework: constant
+    residuals: np.ndarray       # (vintages, columns), (calculated - expected) / expected
+    fallbacks: Dict[str, List[str]]
+
+
+def residual_matrix(vintages, frameworks=('constants_framework', 'simplified_plancks_constants',
+                                          'define_const_from_units')) -> Residuals:
+    """Every framework against every vintage."""
+    import importlib
+
+    columns, matrix = [], []
+    for framework in frameworks:
+        if framework == 'define_const_from_units':
+            residuals = _define_const(vintages)
+        else:
+            residuals = _decimal_framework(importlib.import_module(framework), vintages)
+        for name, column in residuals.items():
+            columns.append(f"{framework}: {name}")
+            matrix.append(column)
+    return Residuals([v.label for v in vintages], columns, np.column_stack(matrix),
+                     {v.label: sorted(v.fallbacks) for v in vintages})
+
+
+if __name__ == "__main__":
+    import argparse
+    import csv
+    import time
+
+    parser = argparse.ArgumentParser(description="Run the frameworks against CODATA listings.")
+    parser.add_argument('listings', nargs='*', help="NIST allascii.txt files, one per adjustment")
+    parser.add_argument('--csv', help="write the residual matrix to this file")
+    parser.add_argument('--prec', type=int, default=100, help="Decimal digits, the frameworks' own by default")
+    args = parser.parse_args()
+
+    getcontext().prec = args.prec
+    start = time.perf_counter()
+    vintages = [Vintage('catalog')] + [Vintage.open(path) for path in args.listings]
+    result = residual_matrix(vintages)
+    print(f"{len(result.vintages)} vintages x {len(result.columns)} constants "
+          f"in {time.perf_counter() - start:.2f} s")
+    print()
+    print(f"{'constant':<62}" + ''.join(f" {label:>12}" for label in result.vintages))
+    for j, column in enumerate(result.columns):
+        print(f"{column:<62}" + ''.join(f" {value:>12.3e}" for value in result.residuals[:, j]))
+    for label, missing in result.fallbacks.items():
+        if missing:
+            print(f"\n{label}: catalog values used for {', '.join(missing)}")
+
+    if args.csv:
+        with open(args.csv, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['vintage'] + result.columns)
+            for label, row in zip(result.vintages, result.residuals):
+                writer.writerow([label] + [repr(float(value)) for value in row])
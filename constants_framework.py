@@ -1,5 +1,8 @@
-from decimal import Decimal as D, getcontext, Context, ROUND_DOWN
-from typing import Dict, Tuple
+from decimal import Decimal as D, getcontext, localcontext, Context, ROUND_DOWN
+from typing import Dict, List, NamedTuple, Tuple
+from constants_registry import known
+from decimal_math import d_p, pi as d_pi, sqrt_two_pi as d_sqrt_two_pi
+from framework_variants import Variants
 
 '''
     This program calculates the individual unit scaling
@@ -34,21 +37,21 @@ from typing import Dict, Tuple
 
     Author: James Rogers, SE Ohio, 26 Nov 2024 1824
 '''
-c   = D('299792458.0')     # speed of light
-e_0 = D('8.854187817e-12') # epsilon_0
-k_B = D('1.380649e-23')    # Boltzmann constant in J/K
-pi  = D('3.141592653589793238462643383279502884197169399375105820974944592')
+c   = known('c')           # speed of light
+e_0 = known('epsilon_0')   # epsilon_0
+k_B = known('k_B')         # Boltzmann constant in J/K
 
-# Set precision to 50 D places
-getcontext().prec = 100
+# The precision the formulas are written for.  main() sets it, anything
+# importing this module runs them at the precision of its own context.
+PRECISION = 100
 
 def calculate_unit_scaling():
 
     # isolate all the base scaling factors
 
     # Original constants
-    h = D('6.62607015e-34')
-    G = D('6.67430e-11')
+    h = known('h')
+    G = known('G')
 
     # solve for the unknowns
     # Hz_kg = G*(Hz_kg/(G_n).sqrt())/c^3 there are two ways to calcuate the same kg s value.
@@ -64,22 +67,13 @@ def calculate_unit_scaling():
 
     return Hz_kg, K_Hz, C_kg, t_Ph, s_lum
 
-# Decimal_power
-def d_p(base: D, exponent: D) -> D:
-    """Raise a D to a power using high-precision arithmetic."""
-    if base == 0 and exponent == 0:
-        raise ValueError("0**0 is undefined")
-    elif base < 0:
-        raise ValueError("Negative bases with fractional exponents are not supported.")
-    else:
-        # Using `ln()` and `exp()` to perform precise power calculation
-        return (base.ln() * exponent).exp()
-
 def validate_planck_units(Hz_kg, K_Hz, C_kg, t_Ph, s_lum) -> Dict[str, Tuple[D, D, D]]:
-    e         = D('1.602176634e-19')
-    m_e       = D('9.1093837139e-31')  # kg electron mass
-    m_pro     = D('1.67262192595e-27') # kg proton mass
-    N_A       = D('6.02214076e23')     # mol^−1 Avogadro constant
+    e         = known('e')
+    m_e       = known('m_e')     # kg electron mass
+    m_pro     = known('m_p')     # kg proton mass
+    N_A       = known('N_A')     # mol^−1 Avogadro constant
+    pi          = d_pi()          # to the precision of the context
+    sqrt_two_pi = d_sqrt_two_pi()
 
     # the following 4 are set in main from the output of the calculate_unit_scaling() funtion above
 
@@ -100,27 +94,27 @@ def validate_planck_units(Hz_kg, K_Hz, C_kg, t_Ph, s_lum) -> Dict[str, Tuple[D,
 
     # the real unit scaling is non reduced planck time
     t_P          = t_Ph     # s
-    time_calc    = t_Ph / d_p(2 * pi, D('0.5')) 
+    time_calc    = t_Ph / sqrt_two_pi 
     time_calc_h  = t_Ph 
 
-    length_calc  = t_P * c   / d_p(2 * pi, D('0.5')) 
+    length_calc  = t_P * c   / sqrt_two_pi 
     length_calc_h= t_P * c         # m
 
-    mass_calc    =  (Hz_kg/t_P) / d_p(2 * pi, D('0.5'))
+    mass_calc    =  (Hz_kg/t_P) / sqrt_two_pi
     mass_calc_h  =  (Hz_kg/t_P)    # kg
 
     charge_calc   = d_p( Hz_kg * c / ( amp_force * 2 * pi) ,D('0.5'))
     charge_calc_h = d_p( Hz_kg * c /   amp_force           ,D('0.5'))
 
-    temp_calc     = 1/(t_P *  K_Hz *  d_p( 2 * pi , D('.5')) ) 
+    temp_calc     = 1/(t_P *  K_Hz *  sqrt_two_pi ) 
     temp_calc_h   = 1/(t_P *  K_Hz ) 
 
     angular_momentum_calc = h_calc / (D(2) * pi)
 
-    momentun_calc  = (Hz_kg / t_P) * c          / d_p((D(2) * pi ), D(0.5))
+    momentun_calc  = (Hz_kg / t_P) * c          / sqrt_two_pi
     momentun_calc_h= (Hz_kg / t_P) * c                        
 
-    energy_calc    = Hz_kg * c**2 / (t_P * d_p((D(2) * pi), D(0.5)))
+    energy_calc    = Hz_kg * c**2 / (t_P * sqrt_two_pi)
     energy_calc_h  = Hz_kg * c**2 / t_P              
 
     force_calc     = c    * Hz_kg / t_P**2
@@ -144,7 +138,7 @@ def validate_planck_units(Hz_kg, K_Hz, C_kg, t_Ph, s_lum) -> Dict[str, Tuple[D,
     e0_calc      = 1 / (D(4) * pi * amp_force * c**2)
 
     alpha_calc   = 2 * pi * e**2 * amp_force / (Hz_kg * c)
-    α = D('0.0072973525693')
+    α = known('alpha')
 
     Phi_0_calc   = Hz_kg * c**2 / (D(2) * e)
 
@@ -213,8 +207,8 @@ def validate_planck_units(Hz_kg, K_Hz, C_kg, t_Ph, s_lum) -> Dict[str, Tuple[D,
 
     # This works, but seems to be arbitrary
 
-    m_mu = D('1.883531627e-28')
-    mu_N_MHz_per_T = D('7.622593229')
+    m_mu = known('m_mu')
+    mu_N_MHz_per_T = known('mu_N_MHz')
     ratio = (m_pro / m_mu) * mu_N_MHz_per_T  # Exact Decimal calculation
 
     #cosmo_calc    = Hz_kg  /D('67.69969994318372720770006537643662343702866096631202122886906444678266768354190691325562520461039036')
@@ -222,70 +216,70 @@ def validate_planck_units(Hz_kg, K_Hz, C_kg, t_Ph, s_lum) -> Dict[str, Tuple[D,
     #print (f"  D('{cosmo_calc/D('1.089E-52')}')")
 
     expected = {
-        'Planck constant E at 1Hz':D('6.62607015e-34'),         # E at 1Hz': Joule-seconds (J⋅s)
-        'hc':                      D('1.9864458571489287e-25'), # (J⋅m)
-        'momentum at 1Hz':         D('2.2102190943042336e-42'), #'momentum at 1Hz': kilogram-meters per second (kg⋅m/s)
-        'mass at 1Hz':             D('7.3724973238127079e-51'), # kilogram-seconds (kg⋅s)
-        'h_bar':                   D('1.054571817e-34'),        # Joule-seconds (J⋅s)
-        'Gravitational constant':  D('6.67430e-11'),            # meters cubed per kilogram per second squared (m³⋅kg⁻¹⋅s⁻²)
-        'Gravitational Coupling':  D('1.752e-45'),              # (m³ kg⁻¹ s⁻²)*(kg²)/(kg⋅m²⋅s⁻¹)*(m⋅s⁻¹)=1 dimensionless
-
-        '\nPlanck Length':           D('1.616255e-35'),           # meters (m)
-        'Planck Length h':         D('4.05135054323e-35'),      # meters (m)
-        'Planck Time':             D('5.391247e-44'),           # seconds (s)
-        'Planck Time h':           D('1.3513850782846e-43'),    # seconds (s)
-        'Planck Mass':             D('2.176434e-8'),            # kilograms (kg)
-        'Planck Mass h':           D('5.45551186133E-8'),       # kilograms (kg)
-        'Planck Charge':           D('1.875545e-18'),           # Coulombs (C)
-        'Planck Charge h':         D('4.70129672995E-18'),      # Coulombs (C)
-        'Planck Temperature':      D('1.416784e32'),            # Kelvin (K)
-        'Planck Temperature h':    D('3.55135123991E+32'),      # Kelvin (K)
-        "Planck angular momentum": D('1.054571817e-34'),        # Joule-seconds (J⋅s)
-        'Planck momentum':         D('6.5249'),                 # kilogram-meters per second (kg⋅m/s)
-        'Planck momentum h':       D('16.3552131056'),          # kilogram-meters per second (kg⋅m/s)
-        'Planck energy':           D('1.9561e+09'),             # Joules (J)
-        'Planck energy h':         D('4903169538.03'),             # Joules (J)
-        'Planck force':            D('1.2103e+44'),             # Newtons (N) which is equivalent to kg⋅m/s²
-        'Planck power':            D('3.6283e+52'),             # Watts (W) which is equivalent to J/s or kg⋅m²/s³
-        'Planck density':          D('5.1550e+96'),             # kilograms per meter cubed ( kg/m ³)
-        'Planck density h':        D('8.20419620181E+95'),             # kilograms per meter cubed ( kg/m ³)
-        'Planck area':             D('2.6121e-70'),             # meters squared (m²)
-        'Planck area h':           D('1.64134412242E-69'),             # meters squared (m²)
-        'Planck volume':           D('4.2217e-105'),            # meters cubed (m³)
-        'Planck volume h':         D('6.64966040199E-104'),            # meters cubed (m³)
-        'Planck acceleration':     D('5.5608e+51'),             # meters per second squared (m/s²)
-        'Planck acceleration h':   D('2.21840882231E+51'),             # meters per second squared (m/s²)
-        'Planck pressure':         D('4.6332e+113'),            # Pascals (Pa) which is equivalent to N/m² or kg/(m ⋅s²)
-        'Planck pressure h':       D('7.37356382375E+112'),            # Pascals (Pa) which is equivalent to N/m² or kg/(m ⋅s²)
-
-        '\nBoltzmann Temperature':   D('1.380649e-23'),           # J/K
-        'Gas Constant R':          D('8.31446261815324'),       # Joules per mole-Kelvin (J/(mol⋅K)) or (kg⋅m²)/(s²⋅mol⋅K)
-        'Stefan-Boltzmann':        D('5.670374419e-8'),         # (W/(m²⋅K⁴)) or kg/(s ³⋅K⁴)
-        'Rydberg constant':        D('10973731.568157'),        # m^−1
-        'quantum of circulation':   D('3.6369475467e-4'),       # m2⋅s−1	
-        'Bohr magneton':            D('9.2740100657e-24'),      # J⋅T−1
-        'nuclear magneton':         D('5.0507837393e-27'),      # J⋅T−1
-        'classical electron radius':D('2.8179403205e-15'),      # m
-        'Bohr radius':              D('5.29177210544e-11'),     # m
-        'Thomson cross section':    D('6.6524587051e-29'),      # m^2
-        'cosmological' :            D('1.089e-52'),             # m⁻²
-        'Fermi coupling constant':  D('1.1663787e-5'),          # GeV−2	
-
-        '\nconductance quantum':     D('7.748091729e-5'),         # S
-        'Hartree energy':           D('4.3597447222060e-18'),   # J
-        'von Klitzing RK':         D('25812.807'),              # Ohms (Ω)
-        'character impedance vacuum': D('376.730313412'),       # Ω
-        'vacuum magnetic permeability':  D('1.25663706127e-6'), # N⋅A−2
-        'permittivity':            D('1.112650056e-10'),       # F m−1
-        'Josephson constant':      D('483597.8484e9'),          # Hertz per Volt (Hz/V) or s⁻¹/V
-        'Epsilon_0 Charge':        D('8.854187817e-12'),        # C²⋅s²⋅kg⁻¹⋅m⁻³
-        'magnetic flux quantum':   D('2.067833848e-15'),        # Wb
-        'first radiation':         D('3.741771852e-16'),        # W⋅m
-        'first radiation sr':      D('1.191042972e-16'),        # W⋅m2⋅sr−1	
-        'second radiation':        D('1.438776877e-2'),         # m⋅K
-        'Fine Structure Constant': D('0.0072973525693'),        # dimensionaless
-        'electrostatic constant':  D('8.9875517862e9'),         # N m^2 C^-2
-        'electric dipole movement': D('8.4783536255e-30')       # C m
+        'Planck constant E at 1Hz':known('h'),                  # E at 1Hz': Joule-seconds (J⋅s)
+        'hc':                      known('hc'),                 # (J⋅m)
+        'momentum at 1Hz':         known('p_1Hz'),              #'momentum at 1Hz': kilogram-meters per second (kg⋅m/s)
+        'mass at 1Hz':             known('m_1Hz'),              # kilogram-seconds (kg⋅s)
+        'h_bar':                   known('hbar'),               # Joule-seconds (J⋅s)
+        'Gravitational constant':  known('G'),                  # meters cubed per kilogram per second squared (m³⋅kg⁻¹⋅s⁻²)
+        'Gravitational Coupling':  known('alpha_G'),              # (m³ kg⁻¹ s⁻²)*(kg²)/(kg⋅m²⋅s⁻¹)*(m⋅s⁻¹)=1 dimensionless
+
+        '\nPlanck Length':           known('l_P'),                # meters (m)
+        'Planck Length h':         known('l_Ph'),               # meters (m)
+        'Planck Time':             known('t_P'),                # seconds (s)
+        'Planck Time h':           known('t_Ph'),               # seconds (s)
+        'Planck Mass':             known('m_P'),                # kilograms (kg)
+        'Planck Mass h':           known('m_Ph'),               # kilograms (kg)
+        'Planck Charge':           known('q_P'),                # Coulombs (C)
+        'Planck Charge h':         known('q_Ph'),               # Coulombs (C)
+        'Planck Temperature':      known('T_P'),                # Kelvin (K)
+        'Planck Temperature h':    known('T_Ph'),               # Kelvin (K)
+        "Planck angular momentum": known('hbar'),               # Joule-seconds (J⋅s)
+        'Planck momentum':         known('p_P'),                 # kilogram-meters per second (kg⋅m/s)
+        'Planck momentum h':       known('p_Ph'),               # kilogram-meters per second (kg⋅m/s)
+        'Planck energy':           known('E_P'),                # Joules (J)
+        'Planck energy h':         known('E_Ph'),                  # Joules (J)
+        'Planck force':            known('F_P'),                # Newtons (N) which is equivalent to kg⋅m/s²
+        'Planck power':            known('P_P'),                # Watts (W) which is equivalent to J/s or kg⋅m²/s³
+        'Planck density':          known('rho_P'),              # kilograms per meter cubed ( kg/m ³)
+        'Planck density h':        known('rho_Ph'),                    # kilograms per meter cubed ( kg/m ³)
+        'Planck area':             known('A_P'),                # meters squared (m²)
+        'Planck area h':           known('A_Ph'),                      # meters squared (m²)
+        'Planck volume':           known('V_P'),                # meters cubed (m³)
+        'Planck volume h':         known('V_Ph'),                      # meters cubed (m³)
+        'Planck acceleration':     known('a_P'),                # meters per second squared (m/s²)
+        'Planck acceleration h':   known('a_Ph'),                      # meters per second squared (m/s²)
+        'Planck pressure':         known('pres_P'),             # Pascals (Pa) which is equivalent to N/m² or kg/(m ⋅s²)
+        'Planck pressure h':       known('pres_Ph'),                   # Pascals (Pa) which is equivalent to N/m² or kg/(m ⋅s²)
+
+        '\nBoltzmann Temperature':   known('k_B'),                # J/K
+        'Gas Constant R':          known('R'),                  # Joules per mole-Kelvin (J/(mol⋅K)) or (kg⋅m²)/(s²⋅mol⋅K)
+        'Stefan-Boltzmann':        known('sigma'),              # (W/(m²⋅K⁴)) or kg/(s ³⋅K⁴)
+        'Rydberg constant':        known('R_inf'),              # m^−1
+        'quantum of circulation':   known('h/2m_e'),            # m2⋅s−1	
+        'Bohr magneton':            known('mu_B'),              # J⋅T−1
+        'nuclear magneton':         known('mu_N'),              # J⋅T−1
+        'classical electron radius':known('r_e'),               # m
+        'Bohr radius':              known('a_0'),               # m
+        'Thomson cross section':    known('sigma_e'),           # m^2
+        'cosmological' :            known('Lambda'),             # m⁻²
+        'Fermi coupling constant':  known('G_F'),               # GeV−2	
+
+        '\nconductance quantum':     known('G_0'),                # S
+        'Hartree energy':           known('E_h'),               # J
+        'von Klitzing RK':         known('R_K'),                # Ohms (Ω)
+        'character impedance vacuum': known('Z_0'),             # Ω
+        'vacuum magnetic permeability':  known('mu_0'),         # N⋅A−2
+        'permittivity':            known('eps_au'),            # F m−1
+        'Josephson constant':      known('K_J'),                # Hertz per Volt (Hz/V) or s⁻¹/V
+        'Epsilon_0 Charge':        known('epsilon_0'),          # C²⋅s²⋅kg⁻¹⋅m⁻³
+        'magnetic flux quantum':   known('Phi_0'),              # Wb
+        'first radiation':         known('c_1'),                # W⋅m
+        'first radiation sr':      known('c_1L'),               # W⋅m2⋅sr−1	
+        'second radiation':        known('c_2'),                # m⋅K
+        'Fine Structure Constant': known('alpha'),              # dimensionaless
+        'electrostatic constant':  known('k_e'),                # N m^2 C^-2
+        'electric dipole movement': known('ea_0')       # C m
     }
 
     calcs = {
@@ -365,8 +359,92 @@ def validate_planck_units(Hz_kg, K_Hz, C_kg, t_Ph, s_lum) -> Dict[str, Tuple[D,
 
     return results
 
-if __name__ == "__main__":
-    Hz_kg, K_Hz, C_kg, t_Ph, s_lum  = calculate_unit_scaling()
+_variants = Variants(calculate_unit_scaling, validate_planck_units)
+
+validate_planck_units_compiled      = _variants.compiled
+validate_planck_units_adaptive      = _variants.adaptive
+validate_planck_units_sensitivities = _variants.sensitivities
+validate_planck_units_uncertainty   = _variants.uncertainty
+validate_planck_units_reactive      = _variants.reactive
+validate_planck_units_profile       = _variants.profile
+
+_compiled = {}
+
+class BatchResults(NamedTuple):
+    """Columnar validation results, one row per constant and one column per sample."""
+    names:      List[str]
+    expected:   'np.ndarray'   # (names,)
+    calculated: 'np.ndarray'   # (names, samples)
+    rel_error:  'np.ndarray'   # (names, samples)
+
+def _to_decimal(value) -> D:
+    return value if isinstance(value, D) else D(str(value))
+
+def validate_planck_units_batch(Hz_kg, K_Hz, C_kg, t_Ph, s_lum=0,
+                                prec=None, chunk_size=65536) -> BatchResults:
+    """
+    Validate many candidate scaling factor sets in one call.
+
+    The inputs are arrays (or scalars, which are broadcast) of candidate
+    Hz_kg, K_Hz, C_kg and t_Ph values.  With prec=None the formulas of
+    validate_planck_units run once per chunk on NumPy float64 arrays, which
+    is fast enough for coarse sweeps of millions of points.  With prec set
+    to a number of digits every sample is evaluated in Decimal at that
+    precision, for re-checking the finalists of a sweep.
+    """
+    import numpy as np
+
+    if prec is None:
+        inputs = np.broadcast_arrays(*(np.atleast_1d(np.asarray(x, dtype=np.float64))
+                                       for x in (Hz_kg, K_Hz, C_kg, t_Ph, s_lum)))
+        samples = inputs[0].size
+        inputs = [x.ravel() for x in inputs]
+
+        # same formulas, but D, d_p, c, pi and known now build float64 values
+        if 'float64' not in _compiled:
+            from formula_compiler import compile_validation
+            _compiled['float64'] = compile_validation(validate_planck_units,
+                dict(globals(), D=np.float64, d_p=np.power, c=np.float64(c),
+                     d_pi=lambda: np.float64(np.pi), d_sqrt_two_pi=lambda: np.sqrt(2 * np.pi),
+                     known=lambda key: known(key, np.float64)))
+        validate = _compiled['float64']
+        names = None
+        for start in range(0, samples, chunk_size):
+            stop = min(start + chunk_size, samples)
+            chunk = validate(*(x[start:stop] for x in inputs))
+            if names is None:
+                names = list(chunk)
+                expected = np.array([chunk[n][0] for n in names], dtype=np.float64)
+                calculated = np.empty((len(names), samples), dtype=np.float64)
+                rel_error = np.empty((len(names), samples), dtype=np.float64)
+            for row, name in enumerate(names):
+                _, calc_val, error = chunk[name]
+                calculated[row, start:stop] = calc_val   # constants with no inputs broadcast
+                rel_error[row, start:stop] = error
+        return BatchResults(names, expected, calculated, rel_error)
+
+    inputs = np.broadcast_arrays(*(np.atleast_1d(np.asarray(x, dtype=object))
+                                   for x in (Hz_kg, K_Hz, C_kg, t_Ph, s_lum)))
+    inputs = [x.ravel() for x in inputs]
+    samples = inputs[0].size
+    names = None
+    with localcontext() as ctx:
+        ctx.prec = prec
+        for i in range(samples):
+            results = validate_planck_units_compiled(*(_to_decimal(x[i]) for x in inputs))
+            if names is None:
+                names = list(results)
+                expected = np.array([results[n][0] for n in names], dtype=object)
+                calculated = np.empty((len(names), samples), dtype=object)
+                rel_error = np.empty((len(names), samples), dtype=object)
+            for row, name in enumerate(names):
+                _, calculated[row, i], rel_error[row, i] = results[name]
+    return BatchResults(names, expected, calculated, rel_error)
+
+def main(calculate=calculate_unit_scaling, validate=validate_planck_units_compiled, prec=PRECISION):
+    """Print the unit scalings and every constant recreated from them, at prec digits."""
+    getcontext().prec = prec
+    Hz_kg, K_Hz, C_kg, t_Ph, s_lum  = calculate()
 
     # Print the result with high precision
     print(f"Hz_kg    : {Hz_kg:.50e}  kg/Hz   mass of photon @ 1Hz Quanum of relative gravity")
@@ -376,7 +454,7 @@ if __name__ == "__main__":
     print(f"s_lum    : {s_lum:.50e}  lm/W unit of candela scaling")
     
     # Validate Planck units
-    planck_results = validate_planck_units(Hz_kg, K_Hz, C_kg, t_Ph, s_lum)
+    planck_results = validate(Hz_kg, K_Hz, C_kg, t_Ph, s_lum)
     
     print("\nPlanck Units Validation:")
     print(f"{'Name':<28} | {'Expected':<20} | {'Calculated':<22} | {'Rel Error'}")
@@ -384,3 +462,6 @@ if __name__ == "__main__":
     
     for name, (expected, calculated, error) in planck_results.items():
         print(f"{name:<30} | {expected:<19.12} | {calculated:<19.12} | {error:<10.6e} ")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+import mmap
+import os
+import struct
+from decimal import Decimal as D
+from typing import Dict, NamedTuple, Optional, Tuple
+
+'''
+    One registry of reference constants for every script in this repo.
+
+    The values live in constants_catalog.txt, one line per constant with
+    its value, standard uncertainty, units and SI dimension.  The first
+    time the catalog is loaded after an edit it is compiled into a binary
+    snapshot next to it.  After that the snapshot is opened with mmap:
+    nothing is parsed at start up, only the pages that are touched are
+    read, and a lookup by name or by symbol is one probe of a hash table
+    stored in the file.  Start up time and memory stay flat as the catalog
+    grows.
+
+        from constants_registry import known
+        h   = known('h')                  # Decimal('6.62607015E-34')
+        m_e = known('electron mass')      # by name works the same
+        c   = known('c', float)           # for the float scripts
+
+    Snapshot layout (little endian):
+
+        header    magic, version, entry count, hash slots, and the offsets
+                  of the three sections below
+        records   per constant: offset and length of its name, symbol,
+                  value, uncertainty and units in the string pool, and its
+                  dimension as 7 signed bytes
+        table     open addressed hash table, slot -> record index + 1,
+                  holding every name and every symbol
+        pool      the utf-8 strings
+'''
+
+DIMENSIONS = ('m', 'kg', 's', 'A', 'K', 'mol', 'cd')
+
+CATALOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'constants_catalog.txt')
+
+_MAGIC = b'PUCR'
+_VERSION = 1
+_HEADER = struct.Struct('<4sHHIIIII')     # magic version dims count slots records table pool
+_RECORD = struct.Struct('<' + 'IH' * 5 + '%db' % len(DIMENSIONS))
+_SLOT = struct.Struct('<I')
+
+
+class Constant(NamedTuple):
+    name:        str
+    symbol:      str
+    value:       D
+    uncertainty: Optional[D]            # None when not known, 0 when exact
+    units:       str
+    dimension:   Tuple[int, ...]        # powers of DIMENSIONS
+
+    @property
+    def relative_uncertainty(self) -> Optional[D]:
+        if self.uncertainty is None:
+            return None
+        return abs(self.uncertainty / self.value)
+
+
+def _hash(key: bytes) -> int:
+    """32 bit FNV-1a, stable across runs unlike hash()."""
+    value = 0x811c9dc5
+    for byte in key:
+        value = ((value ^ byte) * 0x01000193) & 0xffffffff
+    return value
+
+
+def parse_dimension(text: str) -> Tuple[int, ...]:
+    """'m^3 kg^-1 s^-2' -> (3, -1, -2, 0, 0, 0, 0)"""
+    powers = [0] * len(DIMENSIONS)
+    for part in text.split():
+        unit, _, power = part.partition('^')
+        if unit not in DIMENSIONS:
+            raise ValueError(f"unknown base unit {unit!r} in dimension {text!r}")
+        powers[DIMENSIONS.index(unit)] += int(power) if power else 1
+    return tuple(powers)
+
+
+def parse_catalog(path: str = CATALOG):
+    """Read a catalog text file into (name, symbol, value, uncertainty, units, dimension) rows."""
+    rows = []
+    with open(path, encoding='utf-8') as catalog:
+        for number, line in enumerate(catalog, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            fields = [field.strip() for field in line.split('|')]
+            if len(fields) != 6:
+                raise ValueError(f"{path}:{number}: expected 6 fields, got {len(fields)}")
+            name, symbol, value, uncertainty, units, dimension = fields
+            D(value)                                  # fail early on a bad number
+            if uncertainty not in ('', 'exact'):
+                D(uncertainty)
+            rows.append((name, symbol, value, uncertainty, units, parse_dimension(dimension)))
+    return rows
+
+
+def build_snapshot(rows) -> bytes:
+    """Pack catalog rows into the binary snapshot format."""
+    pool = bytearray()
+    strings = {}
+
+    def intern(text):
+        data = text.encode('utf-8')
+        if data not in strings:
+            strings[data] = len(pool)
+            pool.extend(data)
+        return strings[data], len(data)
+
+    records = bytearray()
+    keys = {}
+    for index, (name, symbol, value, uncertainty, units, dimension) in enumerate(rows):
+        fields = []
+        for text in (name, symbol, value, uncertainty, units):
+            fields.extend(intern(text))
+        records.extend(_RECORD.pack(*fields, *dimension))
+        for key in (name, symbol):
+            if not key:
+                continue
+            if keys.get(key, index) != index:
+                raise ValueError(f"{key!r} names two constants")
+            keys[key] = index
+
+    slots = 8
+    while slots < 2 * len(keys):
+        slots *= 2
+    table = [0] * slots
+    for key, index in keys.items():
+        slot = _hash(key.encode('utf-8')) & (slots - 1)
+        while table[slot]:
+            slot = (slot + 1) & (slots - 1)
+        table[slot] = index + 1
+
+    records_at = _HEADER.size
+    table_at = records_at + len(records)
+    pool_at = table_at + slots * _SLOT.size
+    header = _HEADER.pack(_MAGIC, _VERSION, len(DIMENSIONS), len(rows), slots,
+                          records_at, table_at, pool_at)
+    return header + bytes(records) + b''.join(_SLOT.pack(s) for s in table) + bytes(pool)
+
+
+class Registry:
+    """Read only view of a constants snapshot."""
+
+    def __init__(self, data):
+        self._data = data
+        magic, version, dims, self._count, self._slots, self._records_at, self._table_at, \
+            self._pool_at = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC or version != _VERSION or dims != len(DIMENSIONS):
+            raise ValueError("not a constants snapshot of this version")
+        self._cache: Dict[int, Constant] = {}
+
+    def __len__(self):
+        return self._count
+
+    def _string(self, offset, length) -> str:
+        start = self._pool_at + offset
+        return bytes(self._data[start:start + length]).decode('utf-8')
+
+    def _record(self, index) -> Constant:
+        entry = self._cache.get(index)
+        if entry is None:
+            fields = _RECORD.unpack_from(self._data, self._records_at + index * _RECORD.size)
+            name, symbol, value, uncertainty, units = (
+                self._string(fields[i], fields[i + 1]) for i in range(0, 10, 2))
+            entry = self._cache[index] = Constant(
+                name, symbol, D(value),
+                None if uncertainty == '' else D(0) if uncertainty == 'exact' else D(uncertainty),
+                units, tuple(fields[10:]))
+        return entry
+
+    def _find(self, key: str) -> Optional[int]:
+        data = key.encode('utf-8')
+        mask = self._slots - 1
+        slot = _hash(data) & mask
+        while True:
+            index = _SLOT.unpack_from(self._data, self._table_at + slot * _SLOT.size)[0]
+            if index == 0:
+                return None
+            fields = _RECORD.unpack_from(self._data, self._records_at + (index - 1) * _RECORD.size)
+            if data in (self._bytes(fields[0], fields[1]), self._bytes(fields[2], fields[3])):
+                return index - 1
+            slot = (slot + 1) & mask
+
+    def _bytes(self, offset, length) -> bytes:
+        start = self._pool_at + offset
+        return self._data[start:start + length]
+
+    def __contains__(self, key):
+        return self._find(key) is not None
+
+    def __getitem__(self, key) -> Constant:
+        index = self._find(key)
+        if index is None:
+            raise KeyError(key)
+        return self._record(index)
+
+    def get(self, key, default=None):
+        index = self._find(key)
+        return default if index is None else self._record(index)
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self._record(index)
+
+    def value(self, key) -> D:
+        return self[key].value
+
+
+def snapshot_path(catalog: str = CATALOG) -> str:
+    return os.path.splitext(catalog)[0] + '.snapshot'
+
+
+def open_registry(catalog: str = CATALOG, parse=parse_catalog) -> Registry:
+    """
+    Open the snapshot of a catalog, rebuilding it first when it is missing,
+    older than the catalog or from another snapshot version.  parse reads
+    the catalog into rows for build_snapshot(), for other file formats.
+    """
+    snapshot = snapshot_path(catalog)
+    try:
+        if os.path.getmtime(snapshot) >= os.path.getmtime(catalog):
+            with open(snapshot, 'rb') as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            return Registry(data)
+    except (OSError, ValueError):
+        pass
+
+    data = build_snapshot(parse(catalog))
+    try:
+        temp = f"{snapshot}.{os.getpid()}.tmp"
+        with open(temp, 'wb') as f:
+            f.write(data)
+        os.replace(temp, snapshot)
+    except OSError:
+        pass                                  # read only checkout, use it from memory
+    return Registry(data)
+
+
+_default = None
+
+def registry() -> Registry:
+    """The registry for constants_catalog.txt, opened on first use."""
+    global _default
+    if _default is None:
+        _default = open_registry()
+    return _default
+
+
+_overrides: Dict[str, D] = {}
+
+def override(values):
+    """
+    Replace reference values for this process, {name or symbol: value}.
+    known() returns the new value under both the name and the symbol of
+    the constant.  Modules read their constants when they are imported,
+    so override first and import after.  override({}) undoes it.
+    """
+    replaced = {}
+    for key, value in values.items():
+        entry = registry()[key]
+        for alias in (entry.name, entry.symbol):
+            if alias:
+                replaced[alias] = D(value)
+    _overrides.clear()
+    _overrides.update(replaced)
+
+
+def known(key, kind=D):
+    """Reference value of a constant by name or symbol, as a Decimal or as kind(value)."""
+    value = _overrides.get(key)
+    if value is None:
+        value = registry().value(key)
+    return value if kind is D else kind(value)
+
+
+if __name__ == "__main__":
+    print(f"{'Name':<46} | {'Symbol':<10} | {'Value':<24} | {'Uncertainty':<18} | Units")
+    print("-" * 118)
+    for entry in registry():
+        uncertainty = 'exact' if entry.uncertainty == 0 else entry.uncertainty or ''
+        print(f"{entry.name:<46} | {entry.symbol:<10} | {entry.value:<24} | "
+              f"{uncertainty:<18} | {entry.units}")
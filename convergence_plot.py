@@ -1,47 +1,60 @@
 import numpy as np
-import matplotlib.pyplot as plt
 
-# Define the range of c values from 3e8 down to 1:
-c_values = np.linspace(3e8, 1, 500)  # 500 points for a smooth curve
+def convergence_values(points=500, mass=1):
+    """c from 3e8 down to 1, with h, p and hc of a constant mass at each."""
+    # Define the range of c values from 3e8 down to 1:
+    c_values = np.linspace(3e8, 1, points)  # 500 points for a smooth curve
 
-# Keep mass constant (let's set it to 1 for simplicity):
-mass = 1
+    # Calculate h, p, and hc for each c value:
+    h_values = mass * c_values**2
+    p_values = mass * c_values
+    hc_values = h_values * c_values
+    return c_values, h_values, p_values, hc_values
 
-# Calculate h, p, and hc for each c value:
-h_values = mass * c_values**2
-p_values = mass * c_values
-hc_values = h_values * c_values
+def plot(path='convergence_plot.png', points=500, mass=1):
+    import matplotlib.pyplot as plt
 
-# Create the plot:
-plt.figure(figsize=(10, 6))
+    c_values, h_values, p_values, hc_values = convergence_values(points, mass)
 
-# Plot mass (constant)
-plt.plot(c_values, [mass]*len(c_values), label='m', color='black', linewidth=3)
+    # Create the plot:
+    plt.figure(figsize=(10, 6))
 
-# Plot p = mc
-plt.plot(c_values, p_values, label='p (momentum)', color='blue')
+    # Plot mass (constant)
+    plt.plot(c_values, [mass]*len(c_values), label='m', color='black', linewidth=3)
 
-# Plot h = mc^2
-plt.plot(c_values, h_values, label='h (Planck\'s constant)', color='red')
+    # Plot p = mc
+    plt.plot(c_values, p_values, label='p (momentum)', color='blue')
 
-# Plot hc
-plt.plot(c_values, hc_values, label='hc', color='green')
+    # Plot h = mc^2
+    plt.plot(c_values, h_values, label='h (Planck\'s constant)', color='red')
 
+    # Plot hc
+    plt.plot(c_values, hc_values, label='hc', color='green')
 
-# Customize the plot:
-plt.xlabel('Speed of Light (c)')
-plt.ylabel('Value')
-plt.title('Convergence of Photon Properties to Mass as c Approaches 1')
-plt.xscale('log')  # Use logarithmic scale for x-axis for better visualization
-plt.yscale('log') # use log scale for y-axis
-plt.grid(True)
-plt.legend()
-#plt.show()
-plt.savefig('convergence_plot.png')
 
+    # Customize the plot:
+    plt.xlabel('Speed of Light (c)')
+    plt.ylabel('Value')
+    plt.title('Convergence of Photon Properties to Mass as c Approaches 1')
+    plt.xscale('log')  # Use logarithmic scale for x-axis for better visualization
+    plt.yscale('log') # use log scale for y-axis
+    plt.grid(True)
+    plt.legend()
+    #plt.show()
+    plt.savefig(path)
+    plt.close()
 
-# Print some data points to see numeric convergence
-print("Sample Data Points:")
-print("------------------")
-for i in [0, 250, 499]: #first, middle and last value in c_values array
-    print(f"c: {c_values[i]:.2e}, h: {h_values[i]:.2e}, p: {p_values[i]:.2e}, hc: {hc_values[i]:.2e}, m: {mass}")
+def main(path='convergence_plot.png', points=500, mass=1):
+    """Draw the plot to path and print the first, middle and last points."""
+    plot(path, points, mass)
+    c_values, h_values, p_values, hc_values = convergence_values(points, mass)
+
+    # Print some data points to see numeric convergence
+    print("Sample Data Points:")
+    print("------------------")
+    for i in [0, points // 2, points - 1]: #first, middle and last value in c_values array
+        print(f"c: {c_values[i]:.2e}, h: {h_values[i]:.2e}, p: {p_values[i]:.2e}, hc: {hc_values[i]:.2e}, m: {mass}")
+
+if __name__ == "__main__":
+    # Keep mass constant (let's set it to 1 for simplicity):
+    main('convergence_plot.png', 500, 1)
@@ -0,0 +1,128 @@
+from decimal import Decimal as D, getcontext, localcontext
+
+'''
+    Decimal math kernel for the frameworks.
+
+    The old d_p() raised everything to a power as exp(ln(base) * exponent),
+    even c**2 and square roots, and at 100 digits the ln() and exp() calls
+    were most of the run time.  This d_p() picks the cheapest exact route:
+
+        integer exponents       exponentiation by squaring
+        half integer exponents  base.sqrt() times an integer power
+        anything else           exp(ln(base) * exponent), with ln(base)
+                                cached per precision for repeated bases
+
+    Unlike the old d_p(), a negative base is allowed with an integer
+    exponent, (-2)**3 is -8; it still raises with any other exponent.
+
+    pi and sqrt(2 pi) are computed to the active precision the first time
+    they are asked for at that precision and then reused, so pi is no longer
+    limited to the 64 digits that were pasted into the source.
+'''
+
+_LN_CACHE_SIZE = 256
+
+_ln_cache = {}
+_pi_cache = {}
+_sqrt_two_pi_cache = {}
+
+
+def _context_key():
+    ctx = getcontext()
+    return ctx.prec, ctx.rounding
+
+
+def pi() -> D:
+    """pi to the precision of the current context."""
+    key = _context_key()
+    value = _pi_cache.get(key)
+    if value is None:
+        with localcontext() as ctx:
+            ctx.prec += 4                     # guard digits for the series
+            three = D(3)
+            lasts, t, s, n, na, d, da = 0, three, 3, 1, 0, 0, 24
+            while s != lasts:
+                lasts = s
+                n, na = n + na, na + 8
+                d, da = d + da, da + 32
+                t = (t * n) / d
+                s += t
+        value = _pi_cache[key] = +s           # round to the callers precision
+    return value
+
+
+def sqrt_two_pi() -> D:
+    """sqrt(2 pi) to the precision of the current context."""
+    key = _context_key()
+    value = _sqrt_two_pi_cache.get(key)
+    if value is None:
+        with localcontext() as ctx:
+            ctx.prec += 2
+            root = (2 * pi()).sqrt()
+        value = _sqrt_two_pi_cache[key] = +root
+    return value
+
+
+def ln(base: D) -> D:
+    """Natural log, remembered per precision so repeated bases cost one ln()."""
+    key = (base,) + _context_key()
+    value = _ln_cache.get(key)
+    if value is None:
+        if len(_ln_cache) >= _LN_CACHE_SIZE:
+            _ln_cache.clear()
+        value = _ln_cache[key] = base.ln()
+    return value
+
+
+def _int_power(base: D, n: int) -> D:
+    """base**n by repeated squaring, rounded once at the end."""
+    with localcontext() as ctx:
+        # each multiply can lose half an ulp, about 2*log2(n) of them
+        ctx.prec += 2 * n.bit_length() + 2
+        result = D(1)
+        square = base
+        m = abs(n)
+        while m:
+            if m & 1:
+                result *= square
+            m >>= 1
+            if m:
+                square *= square
+        if n < 0:
+            result = 1 / result
+    return +result
+
+
+# Decimal_power
+def d_p(base: D, exponent) -> D:
+    """
+    Raise a D to a power using high-precision arithmetic.  Negative bases
+    work with integer exponents only.
+    """
+    base = D(base)
+    exponent = D(exponent)
+    if base == 0 and exponent <= 0:
+        raise ValueError(f"0 to the power {exponent} is undefined")
+
+    if exponent == exponent.to_integral_value():
+        return _int_power(base, int(exponent))
+
+    if base < 0:
+        raise ValueError("Negative bases with fractional exponents are not supported.")
+
+    twice = exponent * 2
+    if twice == twice.to_integral_value():
+        whole = int((twice - 1) / 2)          # exponent = whole + 1/2
+        with localcontext() as ctx:
+            ctx.prec += 2
+            root = base.sqrt()
+            result = root if whole == 0 else root * _int_power(base, whole)
+        return +result
+
+    # Using `ln()` and `exp()` to perform precise power calculation, with
+    # guard digits since exp() turns an ulp of ln(base) * exponent into
+    # |ln(result)| ulp of the result
+    with localcontext() as ctx:
+        ctx.prec += 6
+        result = (ln(base) * exponent).exp()
+    return +result
@@ -0,0 +1,211 @@
+import os
+from multiprocessing import Pool
+from typing import Dict, List, NamedTuple
+
+import numpy as np
+
+'''
+    Plots of curves with millions of points, drawn in a fraction of a second.
+
+    convergence_plot.py hands matplotlib every point it computes, which is
+    fine for its 500 and hopeless for the 10^7 point curves a sweep from
+    sweep_runner.py makes.  A figure is only so many pixels wide, though,
+    so this thins every curve down to what can be seen before plotting:
+
+      - minmax() keeps the first, lowest, highest and last point of every
+        pixel column, at most four points a column, and the drawn line
+        covers exactly the pixels the full curve would
+      - lttb() (largest triangle three buckets) keeps a fixed number of
+        points chosen to preserve the shape of the curve, smoother when
+        the curve is not dense
+      - both work on the curve as it lies on the axes, so in log space for
+        log axes; the convergence curves are computed in log space to begin
+        with, log p = log m + log c, log h = log m + 2 log c, ..., and only
+        the points kept are raised back to values
+
+    Figures are drawn with the Agg backend without going through pyplot,
+    each in its own worker process, so several figures render at once.
+
+        python decimated_plot.py convergence=convergence.png --points 10000000
+        python decimated_plot.py convergence=c.png hc.sweep=hc.png gc.sweep=gc.png
+        python decimated_plot.py hc.sweep=hc.png --method lttb
+'''
+
+
+class Curve(NamedTuple):
+    label: str
+    x:     np.ndarray       # as laid out on the axes, log10 of the values for a log axis
+    y:     np.ndarray
+    style: Dict = {}
+
+
+def axis_values(values, log):
+    """Values as they are laid out on an axis, NaN where a log axis cannot show them."""
+    values = np.asarray(values, dtype=np.float64)
+    if not log:
+        return values
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(values > 0, np.log10(values), np.nan)
+
+
+def pixel_columns(x, columns):
+    """Where each of columns equal slices of the range of x starts, for x sorted either way."""
+    ascending = x[-1] >= x[0]
+    if not (np.all(x[1:] >= x[:-1]) if ascending else np.all(x[1:] <= x[:-1])):
+        raise ValueError("x must be sorted")
+    bounds = np.linspace(x[0], x[-1], columns + 1)[1:-1]
+    starts = (np.searchsorted(x, bounds) if ascending
+              else np.searchsorted(-x, -bounds))
+    return np.unique(np.r_[0, starts, len(x)])
+
+
+def minmax(x, y, columns, edges=None):
+    """Indices of the first, lowest, highest and last point of every one of columns along sorted x."""
+    n = len(x)
+    if n <= 4 * columns:
+        return np.arange(n)
+    edges = pixel_columns(x, columns) if edges is None else edges
+    low = high = y
+    if np.isnan(y).any():
+        low, high = np.where(np.isnan(y), np.inf, y), np.where(np.isnan(y), -np.inf, y)
+
+    keep = []
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        keep.extend((lo, lo + int(low[lo:hi].argmin()), lo + int(high[lo:hi].argmax()), hi - 1))
+    return np.unique(keep)
+
+
+def lttb(x, y, points):
+    """Indices of the points largest triangle three buckets keeps to draw x, y with points points."""
+    finite = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+    x, y = x[finite], y[finite]
+    n = len(x)
+    if points >= n or points < 3:
+        return finite
+
+    edges = np.r_[np.linspace(1, n - 1, points - 1).astype(np.int64), n]
+    keep = [0]
+    a = 0
+    for b in range(points - 2):
+        lo, hi = edges[b], edges[b + 1]
+        next_x = x[hi:edges[b + 2]].mean()
+        next_y = y[hi:edges[b + 2]].mean()
+        area = np.abs((x[a] - next_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (next_y - y[a]))
+        a = lo + int(np.argmax(area))
+        keep.append(a)
+    keep.append(n - 1)
+    return finite[keep]
+
+
+DECIMATE = {'minmax': minmax, 'lttb': lambda x, y, columns: lttb(x, y, 2 * columns)}
+
+
+def _matplotlib():
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    return Figure, FigureCanvasAgg
+
+
+def render(path, curves: List[Curve], title='', xlabel='', ylabel='', log=(True, True),
+           method='minmax', size=(10, 6), dpi=100):
+    """Draw curves to an image file, each thinned to the pixel columns of the figure."""
+    Figure, FigureCanvasAgg = _matplotlib()
+    figure = Figure(figsize=size, dpi=dpi)
+    FigureCanvasAgg(figure)
+    axes = figure.add_subplot()
+    columns = int(size[0] * dpi)
+    drawn = 0
+    shared = None                           # curves on the same x share their pixel columns
+    for curve in curves:
+        if method == 'minmax':
+            if shared is None or shared[0] is not curve.x:
+                shared = (curve.x, pixel_columns(curve.x, columns) if len(curve.x) > 4 * columns else None)
+            keep = minmax(curve.x, curve.y, columns, shared[1])
+        else:
+            keep = DECIMATE[method](curve.x, curve.y, columns)
+        x, y = curve.x[keep], curve.y[keep]
+        axes.plot(10**x if log[0] else x, 10**y if log[1] else y, label=curve.label, **curve.style)
+        drawn += len(keep)
+    axes.set_xlabel(xlabel)
+    axes.set_ylabel(ylabel)
+    axes.set_title(title)
+    axes.set_xscale('log' if log[0] else 'linear')
+    axes.set_yscale('log' if log[1] else 'linear')
+    axes.grid(True)
+    axes.legend()
+    figure.savefig(path)
+    return drawn
+
+
+def convergence_curves(points=10_000_000, c_range=(3e8, 1), mass=1.0) -> List[Curve]:
+    """log10 of m, p = mc, h = mc^2 and hc = mc^3 of convergence_plot.py against log10 c."""
+    log_c = np.linspace(np.log10(c_range[0]), np.log10(c_range[1]), points)
+    log_m = np.log10(mass)
+    return [
+        Curve('m', log_c, np.full(points, log_m), {'color': 'black', 'linewidth': 3}),
+        Curve('p (momentum)', log_c, log_m + log_c, {'color': 'blue'}),
+        Curve('h (Planck\'s constant)', log_c, log_m + 2 * log_c, {'color': 'red'}),
+        Curve('hc', log_c, log_m + 3 * log_c, {'color': 'green'}),
+    ]
+
+
+def convergence_figure(path, points=10_000_000, method='minmax'):
+    """The figure of convergence_plot.py with points points a curve."""
+    return render(path, convergence_curves(points), 'Convergence of Photon Properties to Mass as c Approaches 1',
+                  'Speed of Light (c)', 'Value', method=method)
+
+
+def sweep_figure(path, sweep_path, column='relative_difference', method='minmax'):
+    """One column of a sweep_runner.py output file against the target, a curve per unit."""
+    from sweep_runner import UNITS, read_header, read_sweep
+
+    header = read_header(sweep_path)
+    data = read_sweep(sweep_path, ('target', 'unit', column))
+    log = (not header['linear'], True)
+    curves = [Curve(unit, axis_values(data['target'][data['unit'] == code], log[0]),
+                    axis_values(data[column][data['unit'] == code], log[1]))
+              for code, unit in enumerate(UNITS)]
+    return render(path, curves, f"{header['kind']} sweep, {header['count']} targets",
+                  f"target {header['kind']}", column, log=log, method=method)
+
+
+def _render_task(task):
+    func, args = task
+    return func(*args)
+
+
+def render_all(tasks, workers=None):
+    """Run (figure function, args) tasks on a process pool; the number of points each drew."""
+    _matplotlib()                           # imported once, before the workers fork
+    with Pool(workers or min(len(tasks), os.cpu_count())) as pool:
+        return pool.map(_render_task, tasks)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Render large curves, decimated to the pixels of the figure.")
+    parser.add_argument('figures', nargs='+', metavar='SOURCE=IMAGE',
+                        help="'convergence' or a sweep file, and the image to draw it to")
+    parser.add_argument('--points', type=int, default=10_000_000, help="points per convergence curve")
+    parser.add_argument('--column', default='relative_difference', help="sweep column to plot")
+    parser.add_argument('--method', choices=sorted(DECIMATE), default='minmax')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    tasks = []
+    for figure in args.figures:
+        source, _, image = figure.partition('=')
+        if not image:
+            parser.error(f"expected SOURCE=IMAGE, got {figure!r}")
+        if source == 'convergence':
+            tasks.append((convergence_figure, (image, args.points, args.method)))
+        else:
+            tasks.append((sweep_figure, (image, source, args.column, args.method)))
+
+    start = time.perf_counter()
+    drawn = render_all(tasks, args.workers)
+    print(f"{len(tasks)} figures in {time.perf_counter() - start:.2f} s")
+    for figure, points in zip(args.figures, drawn):
+        print(f"  {figure}: {points} points drawn")
@@ -1,5 +1,6 @@
 import math
-import numpy as np
+import os
+from constants_registry import known, open_registry
 
 
 '''
@@ -18,91 +19,111 @@ relationships between all these units one constant at a time.
 James M. Rogers, SE Ohio, 21 Nov 2024 1400
 '''
 
-h   = 6.62607015e-34
-c   = 299792458
-G   = 6.6743015e-11
-mol = 6.0221407600e+23 #2.63394301e+173
-e = 1.602176634e-19     # Elementary charge (C)
-k = 1.380649e-23        # Boltzmann constant (J/K)
+h   = known('h', float)
+c   = known('c', float)
+G   = 6.6743015e-11   # the fitted divisors in calculate_derived_constants were found with this G
+mol = known('N_A', float) #2.63394301e+173
+e = known('e', float)     # Elementary charge (C)
+k = known('k_B', float)   # Boltzmann constant (J/K)
 
-# Known physical constants for validation - with units commented
-KNOWN_VALUES = {
+# Known physical constants for validation, by registry symbol - with units commented
+KNOWN_SYMBOLS = {
     # Electromagnetic Constants
-    'c': 2.99792458e8,        # Speed of light (m/s)
-    'e': 1.602176634e-19,     # Elementary charge (C)
-    'epsilon_0': 8.8541878128e-12,  # Vacuum permittivity (F/m)
-    'mu_0': 1.25663706212e-6,      # Vacuum permeability (H/m)
-    'alpha': 7.297352569e-3,       # Fine structure constant (dimensionless)
+    'c': 'c',                               # Speed of light (m/s)
+    'e': 'e',                               # Elementary charge (C)
+    'epsilon_0': 'epsilon_0',               # Vacuum permittivity (F/m)
+    'mu_0': 'mu_0',                         # Vacuum permeability (H/m)
+    'alpha': 'alpha',                       # Fine structure constant (dimensionless)
     
     # Gravitational Constants
-    'G': 6.67430150e-11,      # Gravitational constant (m³/kg·s²)
+    'G': 'G',                               # Gravitational constant (m³/kg·s²)
     
     # Quantum Constants
-    'h': 6.62607015e-34,      # Planck constant (J·s)
-    'hc': h*c,                # Planck constant times c (J·m)
-    'hbar': 1.054571817e-34,  # Reduced Planck constant (J·s)
-    'me': 9.1093837015e-31,   # Electron mass (kg)
-    'mp': 1.67262192369e-27,  # Proton mass (kg)
-    'mn': 1.67492749804e-27,  # Neutron mass (kg)
+    'h': 'h',                               # Planck constant (J·s)
+    'hc': 'hc',                             # Planck constant times c (J·m)
+    'hbar': 'hbar',                         # Reduced Planck constant (J·s)
+    'me': 'm_e',                            # Electron mass (kg)
+    'mp': 'm_p',                            # Proton mass (kg)
+    'mn': 'm_n',                            # Neutron mass (kg)
     
     # Thermodynamic Constants
-    'k': 1.380649e-23,        # Boltzmann constant (J/K)
-    'sigma': 5.670374419e-8,  # Stefan-Boltzmann constant (W/m²·K⁴)
-    'R': 8.314462618,         # Gas constant (J/mol·K)
-    'Na': 6.02214076e23,      # Avogadro constant (mol⁻¹)
+    'k': 'k_B',                             # Boltzmann constant (J/K)
+    'sigma': 'sigma',                       # Stefan-Boltzmann constant (W/m²·K⁴)
+    'R': 'R',                               # Gas constant (J/mol·K)
+    'Na': 'N_A',                            # Avogadro constant (mol⁻¹)
     
     # Atomic & Nuclear Constants
-    'Ry': 13.605693122994,    # Rydberg constant (eV)
-    'a0': 5.29177210903e-11,  # Bohr radius (m)
-    'rc': 2.8179403262e-15,   # Classical electron radius (m)
-    'lambda_C': 2.42631023867e-12,  # Compton wavelength (m)
+    'Ry': 'Ry_eV',                          # Rydberg constant (eV)
+    'a0': 'a_0',                            # Bohr radius (m)
+    'rc': 'r_e',                            # Classical electron radius (m)
+    'lambda_C': 'lambda_C',                 # Compton wavelength (m)
     
     # Electromagnetic Derived Constants
-    'Kcd': 683,               # Luminous efficacy (lm/W)
-    'Phi_0': 2.067833848e-15, # Magnetic flux quantum (Wb)
-    'Kj': 483597.8484e9,      # Josephson constant (Hz/V)
-    'Rk': 25812.80745,        # von Klitzing constant (Ω)
+    'Kcd': 'K_cd',                          # Luminous efficacy (lm/W)
+    'Phi_0': 'Phi_0',                       # Magnetic flux quantum (Wb)
+    'Kj': 'K_J',                            # Josephson constant (Hz/V)
+    'Rk': 'R_K',                            # von Klitzing constant (Ω)
     
     # Nuclear Constants
-    'mu_B': 9.2740100783e-24, # Bohr magneton (J/T)
-    'mu_N': 5.0507837461e-27, # Nuclear magneton (J/T)
-    'gamma_p': 2.675221874e8, # Proton gyromagnetic ratio (rad·s⁻¹·T⁻¹)
-
-    'b': 2.897771955e-3,      # Wien displacement constant 
-    'c₁': 3.741771852e-16,    # First radiation constant 
-    'G₀': 7.748091729e-5,     # Conductance quantum 
-    'mᵤ': 1.660539067e-27,    # Atomic mass constant 
-    'Vm': 0.02271095464,      # Molar gas volume 
-    'F': 96485.33212,         # Faraday constant 
-    'nₑ': 2.686780111e25,     # Loschmidt constant 
-    'Φ₀': 2.067833848e-15,    # Magnetic flux quantum 
-    'h/2me': 3.636947552e-4,  # Quantum of circulation 
-    'σₑ':  6.652458732e-29,   # Thomson cross section 
-    'n₀': 2.686780111e25,     # Loschmidt constant 
+    'mu_B': 'mu_B',                         # Bohr magneton (J/T)
+    'mu_N': 'mu_N',                         # Nuclear magneton (J/T)
+    'gamma_p': 'gamma_p',                   # Proton gyromagnetic ratio (rad·s⁻¹·T⁻¹)
+
+    'b': 'b',                               # Wien displacement constant 
+    'c₁': 'c_1',                            # First radiation constant 
+    'G₀': 'G_0',                            # Conductance quantum 
+    'mᵤ': 'm_u',                            # Atomic mass constant 
+    'Vm': 'V_m',                            # Molar gas volume 
+    'F': 'F',                               # Faraday constant 
+    'nₑ': 'n_0',                            # Loschmidt constant 
+    'Φ₀': 'Phi_0',                          # Magnetic flux quantum 
+    'h/2me': 'h/2m_e',                      # Quantum of circulation 
+    'σₑ': 'sigma_e',                        # Thomson cross section 
+    'n₀': 'n_0',                            # Loschmidt constant 
 }
 
+# the divisors below were fitted to CODATA 2018 with the G above, so validate
+# against those values and not the CODATA 2022 ones of constants_catalog.txt
+REFERENCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'constants_catalog_2018.txt')
+REFERENCE_LABEL = f"CODATA 2018, G = {G} as fitted ({os.path.basename(REFERENCE)})"
+
+_reference_values = None
+
+def reference_values():
+    """KNOWN_SYMBOLS with their values from REFERENCE, read on first use."""
+    global _reference_values
+    if _reference_values is None:
+        reference = open_registry(REFERENCE)
+        _reference_values = {name: float(reference.value(symbol)) for name, symbol in KNOWN_SYMBOLS.items()}
+    return _reference_values
+
 def calculate_base_units(h, c, G):
     """Calculate base units from fundamental constants."""
     hc = h * c
-    kg = np.sqrt(hc / G)
+    kg = math.sqrt(hc / G)
     m =  (hc/kg)**(1/3) #m_cubed**(1/3)
     s =  1
     K = 9.35218359715236874763e+03 # define Kelvin value
 #    K =  (m**3 * kg) / k
     C = (1/8.74691615124164123308e+29)**(.5)
-    A = np.sqrt(6.67891654548134738424e-08) #amp scaling
+    A = math.sqrt(6.67891654548134738424e-08) #amp scaling
     return kg, s, m, K, C, A
 
-def calculate_derived_constants(kg, s, m, K, C, A):
-    """Calculate derived constants from base units."""
+def unit_formulas():
+    """
+    Each derived constant as a number times a product of powers of the base
+    units.  The base units here are symbols from unit_algebra.py, so the
+    formulas below record their exponent vectors instead of computing values.
+    """
+    from unit_algebra import base_units
+
+    m, kg, s, K, C, A = base_units()
     constants = {}
-    print (f"conversion between 2 constant systems: s_length = m^3/s^2 = {m**3/s**2}")
     
     # Basic constants
     constants['hc'] = m**3 * kg / s**2 
     constants['G'] = m**3 / (kg * s**2) 
     constants['k'] = m**2 * kg / ( K )
-    print (f"{m**3} * {kg} * {mol}  / {K}")
     #constants['sigma'] = m**2 * kg / (s**3  *K * mol ) 
 
     constants['Vm'] =  1 / 4.40316145160510075129e+01
@@ -115,7 +136,7 @@ def calculate_derived_constants(kg, s, m, K, C, A):
 
     # my basic assumtion is that the definitons for meter and kg and time define how we see energy
     # this feeds back to our unit system and how we scale things like charge and temperature. 
-    constants['e'] =   ((1/(h * c*10e42 *np.pi)  - 10e23/( np.pi ))/(-h*c))/10e66
+    constants['e'] =   ((1/(h * c*10e42 *math.pi)  - 10e23/( math.pi ))/(-h*c))/10e66
     #constants['e'] =   ((1/(h * c*10e42 *np.pi)  - 1/( np.pi / 10e23))/(-h*c))/10e66
     #constants['e'] =   ((1/(h * c*10e42 *np.pi)  - 1/( np.pi / 10e23))/-1.98673404310670210384e-25)/10e67
     #constants['e'] = np.sqrt(4 * np.pi * constants['epsilon_0'] * constants['hc']) 
@@ -125,7 +146,7 @@ def calculate_derived_constants(kg, s, m, K, C, A):
    
     # Quantum constants
     constants['h'] = constants['hc'] / c
-    constants['hbar'] = constants['h'] / (2 * np.pi)
+    constants['hbar'] = constants['h'] / (2 * math.pi)
 
     # Atomic constants 
     constants['me'] = kg / 5.98889170448846013071e+22
@@ -152,8 +173,8 @@ def calculate_derived_constants(kg, s, m, K, C, A):
     constants['h/2me'] =  constants['h'] / (2* constants ['me'] )
     constants['h/2me'] =  m**3 * kg / (2* constants ['me'] * c)
     constants['nₑ'] = m**2          /8.80904292937399339815e-38
-    constants['c₁'] = 2*np.pi * h * c**2
-    constants['c₁'] = 2*np.pi * m**3  * kg * c
+    constants['c₁'] = 2*math.pi * h * c**2
+    constants['c₁'] = 2*math.pi * m**3  * kg * c
     #constants['c₁'] = m**4 * kg * s**(-3) 
 
     '''
@@ -173,8 +194,27 @@ Wb (weber = V⋅s)
     
     return constants
 
-def validate_constants(calculated, known=KNOWN_VALUES):
-    """Compare calculated values with known values and compute ratios."""
+_derived = None
+
+def derived_catalog():
+    """Every constant of unit_formulas() as one row of an exponent matrix over (m, kg, s, K, C, A), built on first use."""
+    global _derived
+    if _derived is None:
+        from unit_algebra import UnitCatalog
+        _derived = UnitCatalog(unit_formulas())
+    return _derived
+
+def calculate_derived_constants(kg, s, m, K, C, A):
+    """Calculate derived constants from base units."""
+    print (f"conversion between 2 constant systems: s_length = m^3/s^2 = {m**3/s**2}")
+    print (f"{m**3} * {kg} * {mol}  / {K}")
+    return derived_catalog().evaluate(m=m, kg=kg, s=s, K=K, C=C, A=A)
+
+def validate_constants(calculated, known=None):
+    """Compare calculated values with known values, by default reference_values(), and compute ratios."""
+    import numpy as np
+
+    known = reference_values() if known is None else known
     print("\nValidation Results:")
     print(f"{'Constant':<12} {'Calculated':<15} {'Known':<15} {'Ratio (Calc/Known)':<20} {'log10(|Ratio|)':<15}")
     print("-" * 77)
@@ -187,7 +227,7 @@ def validate_constants(calculated, known=KNOWN_VALUES):
             
             print(f"{name:<12} {calc_value:.10e} {known_value:.10e} {ratio:.20e} {log_ratio:15.20f}")
 
-def main():
+def main(G=G):
     
     kg, s, m, K, C, A = calculate_base_units(h, c, G)
     
@@ -205,6 +245,7 @@ def main():
     #for name, value in constants.items():
     #    print(f"{name:<12} {value:.8e}")
     
+    print(f"\nReference values: {REFERENCE_LABEL}")
     validate_constants(constants)
 
 if __name__ == "__main__":
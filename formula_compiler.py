@@ -0,0 +1,293 @@
+import ast
+import inspect
+import textwrap
+from decimal import Decimal as D, getcontext, localcontext
+from typing import Dict, List, Tuple
+
+'''
+    Compiles the formula table inside a validate_planck_units() function
+    into a straight line evaluator.
+
+    The body of validate_planck_units is read as a table of formulas:
+    every `name = expression` line, followed by the `expected` and the
+    `calcs` dictionaries.  Each expression is broken into an expression DAG
+    where identical subterms such as c**2, d_p(2 * pi, D('0.5')) or
+    Hz_kg / t_P become a single node, so they are computed one time.
+
+    Nodes that do not depend on the scaling factors passed in (the
+    counting constants, 2*pi and its square root, powers of c, the expected
+    values) are computed once per Decimal precision and reused by every
+    call.  What is left is a short list of operations on the inputs.
+
+    Operations are kept in the same order as the original formulas, so the
+    results are digit for digit the same as the original function.
+
+    Because every constant is its own output of the DAG, the evaluator can
+    also be generated for just a few constants.  The adaptive mode uses this
+    to start at low precision and only recompute, at higher precision, the
+    constants whose value has not settled yet.
+'''
+
+_BINOPS = {
+    ast.Add: '+', ast.Sub: '-', ast.Mult: '*', ast.Div: '/', ast.Pow: '**',
+}
+_UNARYOPS = {ast.USub: '-', ast.UAdd: '+'}
+
+
+class _Graph:
+    """Hash consed expression DAG built from the assignments of a function."""
+
+    def __init__(self, params):
+        self.params = set(params)
+        self.nodes: List[Tuple] = []           # node id -> key
+        self.index: Dict[Tuple, int] = {}      # key -> node id
+        self.varying: List[bool] = []          # node id -> depends on an input
+        self.local: Dict[str, int] = {}        # assigned local name -> node id
+        self.source_ops = 0                    # operations in the original text
+
+    def add(self, key, varying):
+        node = self.index.get(key)
+        if node is None:
+            node = len(self.nodes)
+            self.nodes.append(key)
+            self.varying.append(varying)
+            self.index[key] = node
+        return node
+
+    def children(self, node):
+        key = self.nodes[node]
+        if key[0] == 'binop':
+            return [key[2], key[3]]
+        if key[0] == 'unary':
+            return [key[2]]
+        if key[0] == 'call':
+            return list(key[2])
+        return []
+
+    def expr(self, tree):
+        if isinstance(tree, ast.Constant):
+            return self.add(('const', type(tree.value).__name__, repr(tree.value)), False)
+        if isinstance(tree, ast.Name):
+            if tree.id in self.local:
+                return self.local[tree.id]
+            return self.add(('name', tree.id), tree.id in self.params)
+        if isinstance(tree, ast.BinOp) and type(tree.op) in _BINOPS:
+            self.source_ops += 1
+            left, right = self.expr(tree.left), self.expr(tree.right)
+            return self.add(('binop', _BINOPS[type(tree.op)], left, right),
+                            self.varying[left] or self.varying[right])
+        if isinstance(tree, ast.UnaryOp) and type(tree.op) in _UNARYOPS:
+            self.source_ops += 1
+            operand = self.expr(tree.operand)
+            return self.add(('unary', _UNARYOPS[type(tree.op)], operand), self.varying[operand])
+        if isinstance(tree, ast.Call) and isinstance(tree.func, ast.Name) and not tree.keywords:
+            self.source_ops += 1
+            args = tuple(self.expr(arg) for arg in tree.args)
+            return self.add(('call', tree.func.id, args), any(self.varying[a] for a in args))
+        raise ValueError(f"cannot compile expression: {ast.unparse(tree)}")
+
+
+class _Program:
+    """Generated _constants()/_evaluate() pair for some of the outputs of a graph."""
+
+    def __init__(self, graph, params, outputs, expected, namespace, label):
+        # only emit nodes that some result needs
+        live = set()
+        stack = outputs + expected
+        while stack:
+            node = stack.pop()
+            if node not in live:
+                live.add(node)
+                stack.extend(graph.children(node))
+
+        def ref(node):
+            key = graph.nodes[node]
+            if key[0] == 'const':
+                return key[2]
+            if key[0] == 'name':
+                return key[1]
+            return f"t{node}"
+
+        def code(node):
+            key = graph.nodes[node]
+            if key[0] == 'binop':
+                return f"{ref(key[2])} {key[1]} {ref(key[3])}"
+            if key[0] == 'unary':
+                return f"{key[1]}{ref(key[2])}"
+            return f"{key[1]}({', '.join(ref(a) for a in key[2])})"
+
+        computed = [n for n in sorted(live) if graph.nodes[n][0] in ('binop', 'unary', 'call')]
+        fixed = [n for n in computed if not graph.varying[n]]
+        varying = [n for n in computed if graph.varying[n]]
+
+        # constant nodes handed to the evaluator (leaves are written inline)
+        handed = sorted({c for n in varying for c in graph.children(n)
+                         if c in fixed} | {n for n in outputs if n in fixed})
+        expected_refs = [ref(n) for n in expected]
+
+        lines = ["def _constants():"]
+        lines += [f"    t{n} = {code(n)}" for n in fixed]
+        lines.append(f"    return ({''.join(ref(n) + ', ' for n in handed)}), "
+                     f"({''.join(r + ', ' for r in expected_refs)})")
+        lines.append(f"def _evaluate({', '.join(params)}, _k):")
+        if handed:
+            lines.append(f"    {''.join(ref(n) + ', ' for n in handed)}= _k")
+        lines += [f"    t{n} = {code(n)}" for n in varying]
+        lines.append(f"    return ({''.join(ref(n) + ', ' for n in outputs)})")
+        self.source = "\n".join(lines) + "\n"
+
+        scope = {}
+        exec(compile(self.source, f"<compiled {label}>", "exec"), namespace, scope)
+        self._constants = scope['_constants']
+        self._evaluate = scope['_evaluate']
+        self._constants_cache = {}
+
+        self.constant_ops = len(fixed)
+        self.call_ops = len(varying)
+
+    def constants(self):
+        """Input independent terms, computed once per precision and rounding."""
+        ctx = getcontext()
+        key = (ctx.prec, ctx.rounding)
+        cached = self._constants_cache.get(key)
+        if cached is None:
+            cached = self._constants_cache[key] = self._constants()
+        return cached
+
+    def evaluate(self, *args):
+        """(expected values, calculated values) in output order."""
+        handed, expected = self.constants()
+        return expected, self._evaluate(*args, handed)
+
+
+class CompiledValidation:
+    """
+    Straight line replacement for a validate_planck_units() function.
+
+    Calling it gives the same {name: (expected, calculated, rel_error)}
+    dictionary as the original function.
+    """
+
+    def __init__(self, func, namespace=None):
+        self.func = func
+        self.namespace = func.__globals__ if namespace is None else namespace
+        self.params = list(inspect.signature(func).parameters)
+        self._programs = {}
+        self._build()
+
+    def _build(self):
+        tree = ast.parse(textwrap.dedent(inspect.getsource(self.func)))
+        body = tree.body[0].body
+        graph = _Graph(self.params)
+        tables = {}
+
+        for stmt in body:
+            if 'expected' in tables and 'calcs' in tables:
+                break                                      # the results loop
+            if isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Constant):
+                continue                                   # bare strings
+            if not (isinstance(stmt, ast.Assign) and len(stmt.targets) == 1
+                    and isinstance(stmt.targets[0], ast.Name)):
+                raise ValueError(f"cannot compile statement: {ast.unparse(stmt)}")
+            target = stmt.targets[0].id
+            if target in ('expected', 'calcs'):
+                tables[target] = {ast.literal_eval(k): graph.expr(v)
+                                  for k, v in zip(stmt.value.keys, stmt.value.values)}
+            else:
+                graph.local[target] = graph.expr(stmt.value)
+
+        if 'expected' not in tables or 'calcs' not in tables:
+            raise ValueError(f"{self.func.__name__} has no expected and calcs tables")
+
+        self.graph = graph
+        self.names = list(tables['expected'])
+        self.outputs = {name: tables['calcs'][name] for name in self.names}
+        self.expected = tables['expected']
+        self.program = self._program(tuple(self.names))
+        self.source = self.program.source
+        self.source_ops = graph.source_ops
+
+    def _program(self, names) -> _Program:
+        """The evaluator for just the given constants, generated on first use."""
+        program = self._programs.get(names)
+        if program is None:
+            program = self._programs[names] = _Program(
+                self.graph, self.params,
+                [self.outputs[name] for name in names],
+                [self.expected[name] for name in names],
+                self.namespace, self.func.__name__)
+        return program
+
+    def reset(self):
+        """Forget the input independent terms, after values in the namespace change."""
+        for program in self._programs.values():
+            program._constants_cache.clear()
+
+    def calculate(self, *args):
+        """The calculated value of every constant, in the order of self.names."""
+        return self.program.evaluate(*args)[1]
+
+    def __call__(self, *args):
+        expected, calculated = self.program.evaluate(*args)
+        results = {}
+        for name, exp_val, calc_val in zip(self.names, expected, calculated):
+            rel_error = abs((calc_val - exp_val) / exp_val)
+            results[name] = (exp_val, calc_val, rel_error)
+        return results
+
+    def adaptive(self, *args, tol=D('1e-12'), start_prec=16, guard=8, max_prec=None):
+        """
+        Evaluate with as little precision as each constant needs.
+
+        Everything is first computed at start_prec and at start_prec + guard
+        digits.  A constant whose two values agree to a relative tol is done.
+        The rest are recomputed, on their own, at doubling precision until two
+        successive values agree or max_prec (by default the precision of the
+        current context) is reached.
+
+        Returns the usual results dictionary and a {name: precision} map
+        of the precision each value was accepted at.
+        """
+        if max_prec is None:
+            max_prec = getcontext().prec
+        precisions = [min(start_prec, max_prec), min(start_prec + guard, max_prec)]
+        while precisions[-1] < max_prec:
+            precisions.append(min(2 * precisions[-1], max_prec))
+        precisions = sorted(set(precisions))
+
+        previous = {}
+        results = {}
+        used = {}
+        pending = tuple(self.names)
+        for prec in precisions:
+            with localcontext() as ctx:
+                ctx.prec = prec
+                expected, calculated = self._program(pending).evaluate(*args)
+                unstable = []
+                for name, exp_val, calc_val in zip(pending, expected, calculated):
+                    last = previous.get(name)
+                    if (last is not None and abs(calc_val - last) <= tol * abs(calc_val)) \
+                            or prec == precisions[-1]:
+                        results[name] = (exp_val, calc_val, abs((calc_val - exp_val) / exp_val))
+                        used[name] = prec
+                    else:
+                        previous[name] = calc_val
+                        unstable.append(name)
+            pending = tuple(unstable)
+            if not pending:
+                break
+
+        return {name: results[name] for name in self.names}, used
+
+    def stats(self):
+        """Operation counts of the original formulas and of the compiled evaluator."""
+        return {
+            'source_ops':   self.source_ops,
+            'constant_ops': self.program.constant_ops,
+            'call_ops':     self.program.call_ops,
+        }
+
+
+def compile_validation(func, namespace=None) -> CompiledValidation:
+    """Compile a validate_planck_units() style function, see CompiledValidation."""
+    return CompiledValidation(func, namespace)
@@ -0,0 +1,345 @@
+import ast
+import inspect
+import json
+import operator
+import textwrap
+import time
+from collections import Counter
+from contextlib import contextmanager
+from decimal import Decimal
+from typing import Dict, List, NamedTuple
+
+import decimal_math
+
+'''
+    Where the time of validate_planck_units() goes, formula by formula.
+
+    profile_validation() runs calculate_unit_scaling() and
+    validate_planck_units() of a framework as instrumented copies, made
+    from their source, in which
+
+      - every statement is a frame of its own, so each xxx_calc formula,
+        named after the constant it is compared with, gets its own time
+      - every d_p() call is a frame named after its call site, and d_p()
+        and the decimal_math.py functions it calls are instrumented too
+      - every Decimal +, -, *, /, ** and every sqrt(), ln() and exp() is
+        counted against the innermost frame; a frame reports the
+        operations inside it, those of the frames it contains included
+
+    The functions of the framework are not touched, so a normal run costs
+    exactly what it did.  Counting operations slows the profiled run down
+    a few times over; count_ops=False leaves only the frames in place for
+    truer times.
+
+        from constants_framework import validate_planck_units_profile
+        profile = validate_planck_units_profile()
+        print(table(profile))
+        write_speedscope('validate.speedscope.json', profile)   # speedscope.app
+        write_chrome_trace('validate.trace.json', profile)      # chrome://tracing, perfetto
+
+        python formula_profile.py simplified_plancks_constants --sort ops --limit 20
+'''
+
+_BINOPS = {ast.Add: 'add', ast.Sub: 'sub', ast.Mult: 'mul', ast.Div: 'div', ast.Pow: 'pow'}
+_OPERATORS = {'add': operator.add, 'sub': operator.sub, 'mul': operator.mul,
+              'div': operator.truediv, 'pow': operator.pow}
+_METHODS = ('sqrt', 'ln', 'exp', 'log10')
+OPS = ('add', 'sub', 'mul', 'div', 'pow', 'sqrt', 'ln', 'exp', 'log10')
+
+# decimal_math.py functions that run inside d_p(), instrumented along with it
+_KERNEL = ('d_p', '_int_power', 'ln')
+
+_PROFILER = '__profile__'
+
+
+class Event(NamedTuple):
+    name:      str
+    kind:      str              # 'function', 'formula' or 'd_p'
+    start:     float            # perf_counter seconds
+    end:       float
+    depth:     int
+    self_time: float            # less the frames inside it
+    ops:       Dict[str, int]   # Decimal operations, frames inside it included
+
+
+class Profile(NamedTuple):
+    results: Dict               # what validate_planck_units() returned
+    events:  List[Event]        # in the order they finished
+    seconds: float
+
+
+class Row(NamedTuple):
+    name:       str
+    kind:       str
+    calls:      int
+    total:      float
+    self_time:  float
+    ops:        Dict[str, int]
+
+
+class _Profiler:
+    def __init__(self):
+        self.events: List[Event] = []
+        self._stack = []
+
+    def enter(self, name, kind):
+        self._stack.append([name, kind, time.perf_counter(), Counter(), 0.0])
+
+    def exit(self):
+        end = time.perf_counter()
+        name, kind, start, ops, inner = self._stack.pop()
+        if self._stack:
+            parent = self._stack[-1]
+            parent[3].update(ops)
+            parent[4] += end - start
+        self.events.append(Event(name, kind, start, end, len(self._stack), end - start - inner, dict(ops)))
+
+    @contextmanager
+    def frame(self, name, kind):
+        self.enter(name, kind)
+        try:
+            yield
+        finally:
+            self.exit()
+
+    def call(self, site, func, *args, **kwargs):
+        self.enter(site, 'd_p')
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.exit()
+
+    def op(self, kind, a, b):
+        result = _OPERATORS[kind](a, b)
+        if self._stack and isinstance(result, Decimal):
+            self._stack[-1][3][kind] += 1
+        return result
+
+    def method(self, name, obj, *args):
+        result = getattr(obj, name)(*args)
+        if self._stack and isinstance(obj, Decimal):
+            self._stack[-1][3][name] += 1
+        return result
+
+
+def _profiler_attr(name):
+    return ast.Attribute(ast.Name(_PROFILER, ast.Load()), name, ast.Load())
+
+
+class _Instrument(ast.NodeTransformer):
+    """Counting calls around the Decimal operations, frames around the calls to the kernel."""
+
+    def __init__(self, function, count_ops):
+        self.function = function
+        self.count_ops = count_ops
+
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        kind = _BINOPS.get(type(node.op))
+        if not self.count_ops or kind is None:
+            return node
+        return ast.Call(_profiler_attr('op'), [ast.Constant(kind), node.left, node.right], [])
+
+    def visit_AugAssign(self, node):
+        self.generic_visit(node)
+        kind = _BINOPS.get(type(node.op))
+        if not self.count_ops or kind is None or not isinstance(node.target, ast.Name):
+            return node
+        value = ast.Call(_profiler_attr('op'),
+                         [ast.Constant(kind), ast.Name(node.target.id, ast.Load()), node.value], [])
+        return ast.Assign([ast.Name(node.target.id, ast.Store())], value)
+
+    def visit_Call(self, node):
+        site = None
+        if isinstance(node.func, ast.Name) and node.func.id == 'd_p':
+            site = f"{ast.unparse(node)}  {self.function}:{node.lineno}"
+        self.generic_visit(node)
+        if site is not None:
+            return ast.Call(_profiler_attr('call'), [ast.Constant(site), node.func, *node.args], node.keywords)
+        if self.count_ops and isinstance(node.func, ast.Attribute) and node.func.attr in _METHODS:
+            return ast.Call(_profiler_attr('method'),
+                            [ast.Constant(node.func.attr), node.func.value, *node.args], [])
+        return node
+
+
+def _constant_names(body):
+    """{variable: constant} from the calcs = {...} table of validate_planck_units()."""
+    for stmt in body:
+        if (isinstance(stmt, ast.Assign) and isinstance(stmt.targets[0], ast.Name)
+                and stmt.targets[0].id == 'calcs' and isinstance(stmt.value, ast.Dict)):
+            return {v.id: ast.literal_eval(k).strip() for k, v in zip(stmt.value.keys, stmt.value.values)
+                    if isinstance(v, ast.Name)}
+    return {}
+
+
+def _statement_name(stmt, constants):
+    if isinstance(stmt, ast.Assign) and len(stmt.targets) == 1 and isinstance(stmt.targets[0], ast.Name):
+        name = stmt.targets[0].id
+        return f"{name}  ({constants[name]})" if name in constants else name
+    text = ast.unparse(stmt).splitlines()[0]
+    return text if len(text) <= 60 else text[:57] + '...'
+
+
+def instrument(func, namespace, count_ops=True, frames=True):
+    """A copy of func, compiled in namespace, with its d_p() calls and Decimal operations recorded."""
+    tree = ast.parse(textwrap.dedent(inspect.getsource(func)))
+    definition = tree.body[0]
+    definition.decorator_list = []
+    definition.returns = None
+    _Instrument(func.__name__, count_ops).visit(definition)
+    if frames:
+        constants = _constant_names(definition.body)
+        body = []
+        for stmt in definition.body:
+            if isinstance(stmt, ast.Return) or (isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Constant)):
+                body.append(stmt)
+                continue
+            frame = ast.Call(_profiler_attr('frame'),
+                             [ast.Constant(_statement_name(stmt, constants)), ast.Constant('formula')], [])
+            body.append(ast.With([ast.withitem(frame)], [stmt]))
+        definition.body = body
+    ast.fix_missing_locations(tree)
+    exec(compile(tree, inspect.getsourcefile(func) or '<instrumented>', 'exec'), namespace)
+    return namespace[func.__name__]
+
+
+def _kernel(profiler, count_ops):
+    """d_p() with the decimal_math.py functions it calls, instrumented in a namespace of their own."""
+    namespace = dict(vars(decimal_math), **{_PROFILER: profiler})
+    for name in _KERNEL:
+        instrument(getattr(decimal_math, name), namespace, count_ops, frames=False)
+    return namespace['d_p']
+
+
+def profile_validation(calculate, validate, count_ops=True, namespace=None) -> Profile:
+    """Run calculate() into validate() instrumented; the results and a frame for every formula and d_p() call."""
+    profiler = _Profiler()
+    namespace = dict(validate.__globals__ if namespace is None else namespace)
+    namespace[_PROFILER] = profiler
+    namespace['d_p'] = _kernel(profiler, count_ops)
+    calculate = instrument(calculate, namespace, count_ops)
+    validate = instrument(validate, namespace, count_ops)
+
+    start = time.perf_counter()
+    with profiler.frame(calculate.__name__, 'function'):
+        scaling = calculate()
+    with profiler.frame(validate.__name__, 'function'):
+        results = validate(*scaling)
+    return Profile(results, profiler.events, time.perf_counter() - start)
+
+
+def summary(profile, sort='total') -> List[Row]:
+    """One row per frame name, calls added up, sorted by 'total', 'self', 'calls', 'ops' or an operation."""
+    rows = {}
+    for event in profile.events:
+        key = (event.name, event.kind)
+        row = rows.get(key)
+        if row is None:
+            rows[key] = Row(event.name, event.kind, 1, event.end - event.start, event.self_time, Counter(event.ops))
+        else:
+            row.ops.update(event.ops)
+            rows[key] = row._replace(calls=row.calls + 1, total=row.total + event.end - event.start,
+                                     self_time=row.self_time + event.self_time)
+    keys = {
+        'total': lambda r: r.total, 'self': lambda r: r.self_time, 'calls': lambda r: r.calls,
+        'ops': lambda r: sum(r.ops.values()),
+    }
+    key = keys.get(sort) or (lambda r: r.ops.get(sort, 0))
+    return sorted(rows.values(), key=key, reverse=True)
+
+
+def table(profile, sort='total', limit=None, kinds=('formula', 'd_p')) -> str:
+    """The summary as a fixed width text table."""
+    rows = [row for row in summary(profile, sort) if row.kind in kinds][:limit]
+    lines = [f"{'frame':<62} {'calls':>5} {'total us':>10} {'self us':>10} "
+             + ' '.join(f"{op:>5}" for op in OPS)]
+    for row in rows:
+        name = row.name if len(row.name) <= 62 else row.name[:59] + '...'
+        lines.append(f"{name:<62} {row.calls:>5} {row.total * 1e6:>10.1f} {row.self_time * 1e6:>10.1f} "
+                     + ' '.join(f"{row.ops.get(op, 0):>5}" for op in OPS))
+    lines.append(f"{len(profile.events)} frames in {profile.seconds * 1e3:.2f} ms")
+    return '\n'.join(lines)
+
+
+def _ordered(events):
+    """Open and close of every event in time order, parents opened before and closed after their children."""
+    marks = []
+    for event in events:
+        marks.append((event.start, 1, event.depth, 'O', event))
+        marks.append((event.end, 0, -event.depth, 'C', event))
+    marks.sort(key=lambda mark: mark[:3])
+    return [(kind, event, at) for at, _, _, kind, event in marks]
+
+
+def speedscope(profile, name='validate_planck_units') -> Dict:
+    """The profile in the evented file format of https://www.speedscope.app"""
+    frames, index = [], {}
+    events = []
+    origin = min((e.start for e in profile.events), default=0.0)
+    for kind, event, at in _ordered(profile.events):
+        if event.name not in index:
+            index[event.name] = len(frames)
+            frames.append({'name': event.name})
+        events.append({'type': kind, 'frame': index[event.name], 'at': at - origin})
+    return {
+        '$schema': 'https://www.speedscope.app/file-format-schema.json',
+        'shared': {'frames': frames},
+        'profiles': [{
+            'type': 'evented', 'name': name, 'unit': 'seconds',
+            'startValue': 0.0, 'endValue': events[-1]['at'] if events else 0.0, 'events': events,
+        }],
+        'exporter': 'formula_profile.py',
+    }
+
+
+def chrome_trace(profile) -> Dict:
+    """The profile as Chrome trace events, with the operation counts of each frame in its args."""
+    origin = min((e.start for e in profile.events), default=0.0)
+    return {
+        'traceEvents': [{
+            'name': event.name, 'cat': event.kind, 'ph': 'X', 'pid': 0, 'tid': 0,
+            'ts': (event.start - origin) * 1e6, 'dur': (event.end - event.start) * 1e6,
+            'args': event.ops,
+        } for event in sorted(profile.events, key=lambda e: (e.start, e.depth))],
+        'displayTimeUnit': 'ms',
+    }
+
+
+def write_speedscope(path, profile, name='validate_planck_units'):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(speedscope(profile, name), f)
+
+
+def write_chrome_trace(path, profile):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(chrome_trace(profile), f)
+
+
+if __name__ == "__main__":
+    import argparse
+    import importlib
+    from decimal import localcontext
+
+    parser = argparse.ArgumentParser(description="Profile validate_planck_units() formula by formula.")
+    parser.add_argument('framework', nargs='?', default='constants_framework',
+                        choices=['constants_framework', 'simplified_plancks_constants'])
+    parser.add_argument('--sort', default='total', help="total, self, calls, ops or an operation such as sqrt")
+    parser.add_argument('--limit', type=int, default=None)
+    parser.add_argument('--prec', type=int, default=None, help="Decimal precision, the framework's own by default")
+    parser.add_argument('--no-ops', action='store_true', help="frames only, for times closer to a normal run")
+    parser.add_argument('--speedscope', help="write a speedscope profile to this file")
+    parser.add_argument('--chrome', help="write a Chrome trace to this file")
+    args = parser.parse_args()
+
+    framework = importlib.import_module(args.framework)
+    with localcontext() as ctx:
+        ctx.prec = args.prec or framework.PRECISION
+        profile = profile_validation(framework.calculate_unit_scaling, framework.validate_planck_units,
+                                     not args.no_ops)
+    print(table(profile, args.sort, args.limit))
+    if args.speedscope:
+        write_speedscope(args.speedscope, profile, f"{args.framework}.validate_planck_units")
+        print(f"speedscope profile written to {args.speedscope}")
+    if args.chrome:
+        write_chrome_trace(args.chrome, profile)
+        print(f"Chrome trace written to {args.chrome}")
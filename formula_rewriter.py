@@ -0,0 +1,176 @@
+import os
+import signal
+import threading
+import time
+from multiprocessing import Pool
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+
+from sympy import Symbol, cancel, count_ops, powsimp, simplify, together
+from sympy.parsing.sympy_parser import parse_expr
+
+from simplify_cache import lookup, store
+
+'''
+    Batch rewrite of formulas in terms of the unit scalings.
+
+    simplifyconstantformulas.py substitutes h = Hz_kg c^2 and
+    k = K_Hz Hz_kg c^2 into one hand written formula after another, and a
+    single simplify() that never finishes stalls the whole script.  This
+    reads the formulas from formula_catalog.txt instead, and
+
+      - rewrites them on a process pool, streaming each original and
+        simplified pair out as soon as it is done, in completion order
+      - gives every simplify() a wall clock budget; when it runs out the
+        worker falls back to the cheaper cancel(), powsimp() and together()
+        (each with its own budget) and keeps the smallest result
+      - remembers full simplify() results in the simplify_cache.py disk
+        cache, fallbacks are not cached so a bigger budget can retry them;
+        only simplify() runs under the budget, the cache is read before
+        and written after it
+
+        python formula_rewriter.py                     # formula_catalog.txt
+        python formula_rewriter.py my_formulas.txt --budget 2
+
+    The budget is enforced with SIGALRM, so it needs a Unix and the main
+    thread of a process; elsewhere, rewrite() called from another thread
+    say, the formulas still run but without a time limit.
+'''
+
+CATALOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'formula_catalog.txt')
+
+STANDARD = 'h: Hz_kg * c**2, k: K_Hz * Hz_kg * c**2'
+
+FALLBACKS = (('cancel', cancel), ('powsimp', powsimp), ('together', together))
+
+
+class Rewrite(NamedTuple):
+    name:       str
+    original:   object      # sympy expression
+    simplified: object
+    strategy:   str         # simplify, or the fallbacks used when it ran out of time
+    seconds:    float
+
+
+class _OutOfTime(BaseException):
+    """Raised by the alarm; BaseException so sympy's own except clauses let it through."""
+
+
+def _alarm(signum, frame):
+    raise _OutOfTime()
+
+
+def _within(budget, func, *args):
+    """func(*args), or raise _OutOfTime after budget seconds."""
+    if not hasattr(signal, 'setitimer') or threading.current_thread() is not threading.main_thread():
+        return func(*args)                     # signal handlers can only be set in the main thread
+    previous = signal.signal(signal.SIGALRM, _alarm)
+    signal.setitimer(signal.ITIMER_REAL, budget)
+    try:
+        return func(*args)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def parse_catalog(path: str = CATALOG) -> List[Tuple[str, str, List[str], Tuple[str, ...]]]:
+    """(name, formula, substitution stages, positive symbols) for every formula in a catalog."""
+    formulas = []
+    positive = []
+    with open(path, encoding='utf-8') as catalog:
+        for number, line in enumerate(catalog, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if line.startswith('@positive'):
+                positive.extend(line.split()[1:])
+                continue
+            fields = [field.strip() for field in line.split('|')]
+            if len(fields) != 3:
+                raise ValueError(f"{path}:{number}: expected 3 fields, got {len(fields)}")
+            name, formula, subs = fields
+            formulas.append((name, formula, [stage.strip() for stage in (subs or STANDARD).split(';')]))
+    return [(name, formula, stages, tuple(positive)) for name, formula, stages in formulas]
+
+
+def _parse(text, names):
+    return parse_expr(text, local_dict=names)
+
+
+def _substitutions(stage, names) -> Dict:
+    subs = {}
+    for pair in stage.split(','):
+        old, _, new = pair.partition(':')
+        subs[_parse(old.strip(), names)] = _parse(new.strip(), names)
+    return subs
+
+
+def rewrite(name, formula, stages, positive=(), budget=10.0) -> Rewrite:
+    """Substitute and simplify one formula, stage by stage, within budget seconds a stage."""
+    start = time.perf_counter()
+    names = {n: Symbol(n, positive=True) for n in positive}
+    names.setdefault('two_pi', Symbol('2*pi', positive=True))
+    original = _parse(formula, names)
+
+    expr = original
+    used = []
+    for stage in stages:
+        subs = _substitutions(stage, names)
+        cached = lookup(expr, subs)
+        if cached is not None:
+            expr = cached
+            used.append('simplify')
+            continue
+        substituted = expr.subs(subs)
+        try:
+            simplified = _within(budget, simplify, substituted)
+        except _OutOfTime:
+            expr = substituted
+            best, best_name = expr, 'none'
+            for strategy, func in FALLBACKS:
+                try:
+                    candidate = _within(budget, func, expr)
+                except _OutOfTime:
+                    continue
+                if count_ops(candidate) < count_ops(best):
+                    best, best_name = candidate, strategy
+            expr = best
+            used.append(f"timeout/{best_name}")
+        else:
+            store(expr, subs, simplified)      # outside the budget, a slow disk cannot cut it short
+            expr = simplified
+            used.append('simplify')
+    return Rewrite(name, original, expr, ', '.join(used), time.perf_counter() - start)
+
+
+def _rewrite_task(task):
+    return rewrite(*task)
+
+
+def rewrite_catalog(path: str = CATALOG, budget=10.0, workers=None) -> Iterator[Rewrite]:
+    """Rewrite every formula of a catalog on a process pool, yielding each as it finishes."""
+    tasks = [(name, formula, stages, positive, budget)
+             for name, formula, stages, positive in parse_catalog(path)]
+    with Pool(workers or os.cpu_count()) as pool:
+        yield from pool.imap_unordered(_rewrite_task, tasks)
+
+
+def main(catalog=CATALOG, budget=10.0, workers=None):
+    """Print every formula of catalog next to its rewrite, as they finish."""
+    start = time.perf_counter()
+    for result in rewrite_catalog(catalog, budget, workers):
+        print(f"{result.name}:  ({result.strategy}, {result.seconds:.2f} s)")
+        print(f"  Original:   {result.original}")
+        print(f"  Simplified: {result.simplified}")
+        print(flush=True)
+    print(f"done in {time.perf_counter() - start:.2f} s")
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Rewrite a catalog of formulas with the unit scalings.")
+    parser.add_argument('catalog', nargs='?', default=CATALOG)
+    parser.add_argument('--budget', type=float, default=10.0, help="seconds per simplify")
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    main(args.catalog, args.budget, args.workers)
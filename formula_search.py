@@ -0,0 +1,211 @@
+import os
+import sys
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal as D, getcontext, localcontext
+from fractions import Fraction
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+import decimal_math
+from constants_registry import known, registry
+from decimal_math import d_p
+
+'''
+    Search for a formula for a constant from the unit scaling factors.
+
+    Every formula in validate_planck_units() is a product of powers of a
+    few factors: the four unit scalings s_length, s_mass, s_temp and
+    s_charge, and the counting constants c, 2, pi, e and N_A.  Given a
+    target value this finds the small integer or half integer exponents
+
+        target = s_length^a s_mass^b s_temp^c s_charge^d c^e 2^f pi^g e^h N_A^i
+
+    that reproduce it within a tolerance.  That is the step that lets unit
+    analysis predict a constant instead of only describing it.
+
+    Trying every combination is out of reach: exponents from -6 to 6 in
+    halves give 25 choices per factor and 25^9 (about 4e12) products.  In
+    log space the product is a sum, so the factors are split in two halves.
+    The second half (25^5 = 1e7 sums) is put in one sorted table, and for
+    each sum of the first half (25^4 = 4e5) a binary search finds the
+    entries of the table that complete it to log(target).  Chunks of the
+    first half run on a process pool, every worker holding its own copy of
+    the sorted table.
+
+    Candidates found in float64 are checked again with Decimal arithmetic,
+    and the results are ordered from the simplest formula to the most
+    complex.
+
+        python formula_search.py G_0              # a catalog symbol
+        python formula_search.py 7.748091729e-5 --max 4 --step 1
+'''
+
+FACTORS = ('s_length', 's_mass', 's_temp', 's_charge', 'c', '2', 'pi', 'e', 'N_A')
+
+
+class Match(NamedTuple):
+    exponents: Dict[str, Fraction]      # only the non zero exponents
+    value:     D
+    rel_error: D
+
+    @property
+    def complexity(self) -> Fraction:
+        return sum(abs(p) for p in self.exponents.values())
+
+    def formula(self) -> str:
+        """The match written out as a product of powers."""
+        parts = []
+        for name, p in self.exponents.items():
+            parts.append(name if p == 1 else f"{name}**{p}" if p.denominator == 1
+                         else f"{name}**({p})")
+        return ' * '.join(parts) or '1'
+
+
+def factor_values() -> Dict[str, D]:
+    """The search factors as Decimals, with the scalings of simplified_plancks_constants."""
+    from simplified_plancks_constants import calculate_unit_scaling
+    s_length, s_mass, s_temp, s_charge = calculate_unit_scaling()
+    return {
+        's_length': s_length, 's_mass': s_mass, 's_temp': s_temp, 's_charge': s_charge,
+        'c': known('c'), '2': D(2), 'pi': decimal_math.pi(), 'e': known('e'), 'N_A': known('N_A'),
+    }
+
+
+def exponent_range(max_exponent=6, step=Fraction(1, 2)) -> List[Fraction]:
+    """-max_exponent .. max_exponent in steps of step."""
+    step = Fraction(step)
+    count = int(Fraction(max_exponent) / step)
+    return [k * step for k in range(-count, count + 1)]
+
+
+def _sum_table(logs: Sequence[float], ranges: Sequence[Sequence[Fraction]]):
+    """Every exponent combination of some factors as (exponent indices, log sum)."""
+    # the smallest unsigned type that holds the longest range, uint8 up to 256 choices
+    dtype = np.min_scalar_type(max(len(r) for r in ranges) - 1)
+    grids = np.meshgrid(*[np.arange(len(r), dtype=dtype) for r in ranges], indexing='ij')
+    indices = np.stack([g.ravel() for g in grids], axis=1)
+    sums = np.zeros(len(indices))
+    for j, (log, r) in enumerate(zip(logs, ranges)):
+        sums += np.array([float(p) for p in r])[indices[:, j]] * log
+    return indices, sums
+
+
+# per worker copy of the sorted second half table
+_table = None
+
+
+def _init_worker(logs, ranges):
+    global _table
+    indices, sums = _sum_table(logs, ranges)
+    order = np.argsort(sums, kind='stable')
+    _table = indices[order], sums[order]
+
+
+def _search_chunk(left_indices, left_sums, target_log, log_tol, limit):
+    """
+    Pairs (left row, right indices) whose log sums add up to target_log,
+    the limit closest ones, and how many more there were.
+    """
+    right_indices, right_sums = _table
+    lo = np.searchsorted(right_sums, target_log - left_sums - log_tol, side='left')
+    hi = np.searchsorted(right_sums, target_log - left_sums + log_tol, side='right')
+    counts = hi - lo
+    rows = np.repeat(np.arange(len(left_sums)), counts)
+    if len(rows) == 0:
+        return np.empty((0, left_indices.shape[1] + right_indices.shape[1]),
+                        dtype=np.result_type(left_indices, right_indices)), 0
+    right = np.repeat(lo, counts) + np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+    if len(rows) > limit:
+        error = np.abs(left_sums[rows] + right_sums[right] - target_log)
+        keep = np.argsort(error, kind='stable')[:limit]
+        return np.hstack([left_indices[rows[keep]], right_indices[right[keep]]]), len(rows) - limit
+    return np.hstack([left_indices[rows], right_indices[right]]), 0
+
+
+def search(target, max_exponent=6, step=Fraction(1, 2), tol=1e-9, workers=None,
+           factors: Optional[Dict[str, D]] = None, ranges: Optional[Dict[str, Sequence]] = None,
+           chunk_size=32768, limit=10000) -> List[Match]:
+    """
+    Exponents of the factors that reproduce target to a relative tol.
+
+    ranges can restrict single factors, e.g. {'2': [0], 'N_A': [-1, 0, 1]};
+    the others use exponent_range(max_exponent, step).  At most limit
+    candidates are kept per chunk before the Decimal check, the ones
+    closest to target in float64, with a warning when any are dropped.
+    """
+    target = D(target)
+    if target <= 0:
+        raise ValueError("the target has to be positive, the factors are")
+    if factors is None:
+        factors = factor_values()
+    names = list(factors)
+    per_factor = [[Fraction(p) for p in (ranges or {}).get(n, exponent_range(max_exponent, step))]
+                  for n in names]
+    logs = [float(factors[n].ln()) for n in names]
+
+    # the bigger half goes in the sorted table
+    split = len(names) // 2
+    left_indices, left_sums = _sum_table(logs[:split], per_factor[:split])
+    target_log = float(target.ln())
+    log_tol = 2 * tol
+
+    found = []
+    dropped = 0
+    chunks = [(left_indices[i:i + chunk_size], left_sums[i:i + chunk_size])
+              for i in range(0, len(left_sums), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=_init_worker,
+                             initargs=(logs[split:], per_factor[split:])) as pool:
+        jobs = [pool.submit(_search_chunk, li, ls, target_log, log_tol, limit) for li, ls in chunks]
+        for job in jobs:
+            rows, more = job.result()
+            found.extend(rows)
+            dropped += more
+    if dropped:
+        warnings.warn(f"{dropped} float64 candidates over the limit of {limit} per chunk were dropped, "
+                      f"a tighter tol or a larger limit keeps them", RuntimeWarning, stacklevel=2)
+
+    matches = []
+    seen = set()
+    with localcontext() as ctx:
+        ctx.prec = 50
+        for row in found:
+            powers = tuple(per_factor[j][i] for j, i in enumerate(row))
+            if powers in seen:
+                continue
+            seen.add(powers)
+            value = D(1)
+            for name, p in zip(names, powers):
+                if p:
+                    value *= d_p(factors[name], D(p.numerator) / D(p.denominator))
+            rel_error = abs((value - target) / target)
+            if rel_error <= D(tol):
+                matches.append(Match({n: p for n, p in zip(names, powers) if p}, +value, rel_error))
+    matches.sort(key=lambda m: (m.complexity, m.rel_error))
+    return matches
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Find exponent formulas for a constant.")
+    parser.add_argument('target', help="a value, or a name or symbol from constants_catalog.txt")
+    parser.add_argument('--max', type=Fraction, default=Fraction(6), help="largest |exponent|")
+    parser.add_argument('--step', type=Fraction, default=Fraction(1, 2), help="exponent step")
+    parser.add_argument('--tol', type=float, default=1e-9, help="relative tolerance")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--show', type=int, default=20, help="how many matches to print")
+    args = parser.parse_args()
+
+    getcontext().prec = 100
+    entry = registry().get(args.target)
+    target = entry.value if entry is not None else D(args.target)
+    matches = search(target, args.max, args.step, args.tol, args.workers)
+
+    print(f"{len(matches)} formulas for {args.target} = {target}")
+    print(f"{'Complexity':<10} | {'Rel Error':<12} | Formula")
+    print("-" * 80)
+    for match in matches[:args.show]:
+        print(f"{str(match.complexity):<10} | {match.rel_error:<12.4e} | {match.formula()}")
+    sys.exit(0 if matches else 1)
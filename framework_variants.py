@@ -0,0 +1,82 @@
+from decimal import Decimal as D
+from typing import Dict, Tuple
+
+'''
+    The ways to run a framework's validate_planck_units(), for any
+    framework built the same way as constants_framework.py and
+    simplified_plancks_constants.py.
+
+    Every variant only needs the framework's calculate_unit_scaling() and
+    validate_planck_units(), so each framework exposes them with
+
+        _variants = Variants(calculate_unit_scaling, validate_planck_units)
+        validate_planck_units_compiled = _variants.compiled
+
+    and so on.  The module each variant runs on is imported the first time
+    it is called, so importing a framework stays cheap.
+'''
+
+
+class Variants:
+    """compiled, adaptive, sensitivities, uncertainty, reactive and profile runs of one framework."""
+
+    def __init__(self, calculate_unit_scaling, validate_planck_units):
+        self.calculate_unit_scaling = calculate_unit_scaling
+        self.validate_planck_units = validate_planck_units
+        self._compiled = None
+
+    def compiled_validation(self):
+        """The CompiledValidation of validate_planck_units, compiled on first use."""
+        if self._compiled is None:
+            from formula_compiler import compile_validation
+            self._compiled = compile_validation(self.validate_planck_units)
+        return self._compiled
+
+    def compiled(self, *scalings) -> Dict[str, Tuple[D, D, D]]:
+        """validate_planck_units with every shared subterm computed once, see formula_compiler.py"""
+        return self.compiled_validation()(*scalings)
+
+    def adaptive(self, *scalings, tol=D('1e-12'), start_prec=16, guard=8, max_prec=None):
+        """
+        validate_planck_units at the lowest precision each constant needs to be
+        stable to a relative tol.  Returns the results and the precision used
+        for each constant, see CompiledValidation.adaptive in formula_compiler.py
+        """
+        return self.compiled_validation().adaptive(*scalings, tol=tol, start_prec=start_prec,
+                                                   guard=guard, max_prec=max_prec)
+
+    def sensitivities(self, wrt=None, kind=D):
+        """
+        Every constant with its partial derivatives with respect to the
+        reference constants in wrt (by default those of WRT in autodiff.py
+        that the framework reads), in one Dual number pass, see autodiff.py
+        """
+        from autodiff import sensitivities
+        return sensitivities(self.calculate_unit_scaling, self.validate_planck_units, wrt, kind)
+
+    def uncertainty(self, samples=1_000_000, chunk_size=65536, seed=None):
+        """
+        Mean, standard deviation and z-score of every constant under the
+        catalog uncertainties of its inputs, by Monte Carlo, see uncertainty.py
+        """
+        from uncertainty import monte_carlo
+        return monte_carlo(self.calculate_unit_scaling, self.validate_planck_units,
+                           samples, chunk_size, seed)
+
+    def reactive(self):
+        """
+        calculate_unit_scaling and validate_planck_units as one dependency
+        graph that, after an input is changed, recomputes only what depends
+        on it, see reactive.py
+        """
+        from reactive import ReactiveValidation
+        return ReactiveValidation(self.calculate_unit_scaling, self.validate_planck_units)
+
+    def profile(self, count_ops=True):
+        """
+        calculate_unit_scaling and validate_planck_units with every formula
+        and d_p call timed and its Decimal operations counted, see
+        formula_profile.py
+        """
+        from formula_profile import profile_validation
+        return profile_validation(self.calculate_unit_scaling, self.validate_planck_units, count_ops)
@@ -0,0 +1,225 @@
+import os
+import time
+from multiprocessing import Pool
+from typing import Iterator, NamedTuple
+
+import numpy as np
+
+from aaaa10_space_time_ratio import G, c, m, scaled_constants, scaling_pairs
+from nbody import direct_forces
+
+'''
+    Do orbits come out the same when G is m c^3 / m_P^2 in a rescaled
+    unit system?
+
+    aaaa10_space_time_ratio.py works out m, c, m_P and G = m c^3 / m_P^2
+    for a list of (mass scaling, length scaling) pairs.  This integrates
+    one system of bodies once per pair, each run in the units of its pair:
+    masses times the mass scaling, lengths and speeds times the length
+    scaling, gravity m c^3 m1 m2 / (m_P^2 r^2) with the scaled m, c and m_P.
+    The results are scaled back to SI, and if the reformulated G is
+    consistent every run traces the same orbits.
+
+      - the integrator is kick drift kick leapfrog, which is symplectic,
+        so the energy error stays bounded instead of growing
+      - the runs are independent and go to a process pool
+      - every run tracks how far energy and total momentum drift from
+        their starting values
+      - every `every` steps a run writes its state to a checkpoint file
+        in --checkpoints, and picks up from there when started again
+        with the same system, step and length
+
+        python orbit_ensemble.py                         # 10 years, 1 day steps
+        python orbit_ensemble.py --years 1000 --checkpoints orbits/
+'''
+
+AU = 1.495978707e11         # m
+DAY = 86400.0               # s
+YEAR = 365.25 * DAY
+
+# mass kg, semi major axis AU; circular orbits in one plane
+PLANETS = {
+    'Mercury': (3.3011e23, 0.387098),
+    'Venus':   (4.8675e24, 0.723332),
+    'Earth':   (5.97237e24, 1.000001),
+    'Mars':    (6.4171e23, 1.523679),
+    'Jupiter': (1.8982e27, 5.2044),
+}
+SUN = 1.98847e30            # kg
+
+
+class System(NamedTuple):
+    names:      tuple
+    masses:     np.ndarray
+    positions:  np.ndarray
+    velocities: np.ndarray
+
+
+class Orbit(NamedTuple):
+    pair:           tuple       # (mass scaling, length scaling)
+    positions:      np.ndarray  # at the end, scaled back to SI
+    velocities:     np.ndarray
+    energy_drift:   float       # largest |E - E0| / |E0| seen
+    momentum_drift: float       # largest |P - P0| / sum of m |v| at the start
+    steps:          int
+    seconds:        float
+
+
+class ScaledGravity:
+    """gravity_force_new() of dddd01.py with the m, c and m_P of one unit system."""
+
+    def __init__(self, m, c, m_P):
+        self.m, self.c, self.m_P = float(m), float(c), float(m_P)
+
+    def __call__(self, m1, m2, r):
+        mass_term = self.m * m1 * m2 / self.m_P**2
+        length_time_term = self.c**3 / r**2
+        return mass_term * length_time_term
+
+
+def solar_system(seed=0) -> System:
+    """The Sun and the planets of PLANETS on circular orbits, total momentum zero."""
+    rng = np.random.default_rng(seed)
+    names = ('Sun',) + tuple(PLANETS)
+    masses = np.array([SUN] + [mass for mass, _ in PLANETS.values()])
+    radius = np.array([0.0] + [a * AU for _, a in PLANETS.values()])
+    phase = rng.uniform(0, 2 * np.pi, len(names))
+    speed = np.sqrt(float(G) * SUN / np.where(radius > 0, radius, np.inf))
+    positions = np.column_stack([radius * np.cos(phase), radius * np.sin(phase), np.zeros(len(names))])
+    velocities = np.column_stack([-speed * np.sin(phase), speed * np.cos(phase), np.zeros(len(names))])
+    velocities[0] = -(masses[1:, None] * velocities[1:]).sum(axis=0) / masses[0]
+    return System(names, masses, positions, velocities)
+
+
+def energy(positions, velocities, masses, law, softening=0.0, block=512):
+    """Kinetic plus potential energy; the potential of a pair is -F r, right for 1/r^2 forces."""
+    kinetic = 0.5 * float((masses * np.einsum('ij,ij->i', velocities, velocities)).sum())
+    potential = 0.0
+    n = len(masses)
+    for i in range(0, n, block):
+        for j in range(i, n, block):
+            d = positions[None, j:j + block] - positions[i:i + block, None]
+            r = np.sqrt(np.einsum('ijk,ijk->ij', d, d) + softening**2)
+            if i == j:
+                r[np.tril_indices(len(r))] = 1.0    # each pair once, no body with itself
+            pairs = law(masses[i:i + block, None], masses[None, j:j + block], r) * r
+            if i == j:
+                pairs = np.triu(pairs, 1)
+            potential -= float(pairs.sum())
+    return kinetic + potential
+
+
+def _save(path, **arrays):
+    temp = f"{path}.{os.getpid()}.tmp"
+    with open(temp, 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(temp, path)
+
+
+def _load(path, dt, steps, positions):
+    """The checkpoint at path if it is of this run, else None."""
+    try:
+        with np.load(path) as saved:
+            state = {key: saved[key] for key in saved.files}
+    except (OSError, ValueError, EOFError):
+        return None
+    if state['dt'] != dt or state['steps'] != steps or state['positions'].shape != positions.shape:
+        return None
+    if not np.array_equal(state['initial'], positions):
+        return None
+    return state
+
+
+def leapfrog(positions, velocities, masses, law, dt, steps, softening=0.0,
+             checkpoint=None, every=1000):
+    """
+    Integrate steps of dt seconds; returns positions, velocities, energy
+    drift, momentum drift.  With a checkpoint path the state is saved
+    there every `every` steps and a matching checkpoint is resumed from.
+    """
+    masses = np.asarray(masses, dtype=np.float64)
+    initial = np.array(positions, dtype=np.float64)
+    x, v = initial.copy(), np.array(velocities, dtype=np.float64)
+    e0 = energy(x, v, masses, law, softening)
+    p0 = (masses[:, None] * v).sum(axis=0)
+    p_scale = float((masses * np.linalg.norm(v, axis=1)).sum())
+    step, energy_drift, momentum_drift = 0, 0.0, 0.0
+
+    state = _load(checkpoint, dt, steps, initial) if checkpoint else None
+    if state is not None:
+        x, v = state['positions'], state['velocities']
+        step = int(state['step'])
+        energy_drift, momentum_drift = float(state['energy_drift']), float(state['momentum_drift'])
+
+    a = direct_forces(x, masses, law, softening) / masses[:, None]
+    while step < steps:
+        for _ in range(min(every, steps - step)):
+            v += 0.5 * dt * a
+            x += dt * v
+            a = direct_forces(x, masses, law, softening) / masses[:, None]
+            v += 0.5 * dt * a
+            step += 1
+        energy_drift = max(energy_drift, abs(energy(x, v, masses, law, softening) - e0) / abs(e0))
+        momentum_drift = max(momentum_drift,
+                             float(np.linalg.norm((masses[:, None] * v).sum(axis=0) - p0)) / p_scale)
+        if checkpoint:
+            _save(checkpoint, step=step, positions=x, velocities=v, initial=initial,
+                  dt=dt, steps=steps, energy_drift=energy_drift, momentum_drift=momentum_drift)
+    return x, v, energy_drift, momentum_drift
+
+
+def run_member(system, pair, dt, steps, softening=0.0, checkpoint=None, every=1000) -> Orbit:
+    """Integrate system in the units of one (mass scaling, length scaling) pair."""
+    start = time.perf_counter()
+    k = scaled_constants(pair, c, m)
+    m_scaling, l_scaling = (float(value) for value in pair)
+    x, v, energy_drift, momentum_drift = leapfrog(
+        system.positions * l_scaling, system.velocities * l_scaling, system.masses * m_scaling,
+        ScaledGravity(k['m'], k['c'], k['m_P']), dt, steps, softening * l_scaling, checkpoint, every)
+    return Orbit((m_scaling, l_scaling), x / l_scaling, v / l_scaling,
+                 energy_drift, momentum_drift, steps, time.perf_counter() - start)
+
+
+def _run_task(task):
+    return run_member(*task)
+
+
+def run_ensemble(system, pairs=scaling_pairs, dt=DAY, steps=3653, softening=0.0,
+                 workers=None, checkpoints=None, every=1000) -> Iterator[Orbit]:
+    """run_member() for every pair on a process pool, yielding the orbits in the order of pairs."""
+    if checkpoints:
+        os.makedirs(checkpoints, exist_ok=True)
+    tasks = [(system, pair, dt, steps, softening,
+              os.path.join(checkpoints, f"member-{i}.npz") if checkpoints else None, every)
+             for i, pair in enumerate(pairs)]
+    with Pool(workers or os.cpu_count()) as pool:
+        yield from pool.imap(_run_task, tasks)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Integrate the planets once per unit scaling of aaaa10.")
+    parser.add_argument('--years', type=float, default=10.0)
+    parser.add_argument('--dt', type=float, default=1.0, help="step in days")
+    parser.add_argument('--every', type=int, default=1000, help="steps between drift checks and checkpoints")
+    parser.add_argument('--checkpoints', default=None, help="directory for checkpoint files")
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    system = solar_system()
+    dt = args.dt * DAY
+    steps = int(round(args.years * YEAR / dt))
+    print(f"{len(system.names)} bodies, {steps} steps of {args.dt} days, {len(scaling_pairs)} unit systems")
+    print()
+    print("      s_length   s_mass     energy drift  momentum drift  largest deviation (m)   seconds")
+
+    reference = None
+    for orbit in run_ensemble(system, scaling_pairs, dt, steps, workers=args.workers,
+                              checkpoints=args.checkpoints, every=args.every):
+        if reference is None:
+            reference = orbit.positions
+        deviation = float(np.linalg.norm(orbit.positions - reference, axis=1).max())
+        m_scaling, l_scaling = orbit.pair
+        print(f"     {1/l_scaling:<10.5e} {m_scaling:<10.5e} {orbit.energy_drift:<13.6e} "
+              f"{orbit.momentum_drift:<15.6e} {deviation:<22.6e} {orbit.seconds:8.2f}")
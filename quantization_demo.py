@@ -1,5 +1,4 @@
 import numpy as np
-import pandas as pd
 
 
 # This program generates a table of frequencies, their corresponding inverse wavelengths (frequency / c),
@@ -27,49 +26,96 @@ start_frequency = 1.0e1  # Starting frequency in Hz
 step = 0.1e1             # Step size in Hz
 num_steps = 10            # Number of steps (you can adjust this as needed)
 
-# Create lists to store the values
-frequencies = []
-wavelengths = []
-f_over_c_values = []
-f_over_c_hc_values = []
-hf_energies = []
-diffs = []
-
-prev = 0
-# Generate the table data
-for i in range(num_steps):
-    frequency = start_frequency + i * step
-    f_over_c = frequency / c
-    w = c/frequency
-    f_over_c_hc = f_over_c * hc
-    hf_energy = h * frequency
-    diff = prev -f_over_c_hc
-    prev = f_over_c_hc
-    
-    frequencies.append(frequency)
-    wavelengths.append(w)
-    f_over_c_values.append(f_over_c)
-    f_over_c_hc_values.append(f_over_c_hc)
-    hf_energies.append(hf_energy)
-    diffs.append(diff)
-
-# Set display precision globally for the DataFrame
-pd.options.display.float_format = '{:.8e}'.format
-
-# Create a DataFrame for easier viewing
-table = pd.DataFrame({
-    'Frequency (Hz)': frequencies,
-    'λ (m)': wavelengths,
-    '1/λ': "1 / λ =",
-    'f / c (1/m)': f_over_c_values,
-    '(f / c) * K (J)': f_over_c_hc_values,
-    '(E = hf (J))': hf_energies,
-    'diffs': diffs
-})
-
-# Print the table
-print (f"K = ratio between h and c, taken as hc with units J m")
-print(table)
+COLUMNS = [('frequency', 'f8'), ('wavelength', 'f8'), ('f_over_c', 'f8'),
+           ('f_over_c_hc', 'f8'), ('hf_energy', 'f8'), ('diff', 'f8')]
+
+def quantization_chunks(start_frequency=start_frequency, step=step, num_steps=num_steps,
+                        chunk_size=1 << 20, exact_diff=False):
+    """
+    The table one chunk of rows at a time, as a structured array with the
+    fields of COLUMNS, so any number of steps runs in constant memory.
+
+    diff is the previous (f / c) * K minus this one, 0 before the first
+    row, found by subtraction like the loop this replaces.  Subtracting
+    two nearly equal values loses digits, with exact_diff=True it is
+    worked out instead: -h * start_frequency for the first row and
+    -h * step for the others.
+    """
+    prev = 0.0
+    for lo in range(0, num_steps, chunk_size):
+        i = np.arange(lo, min(lo + chunk_size, num_steps), dtype=np.float64)
+        chunk = np.empty(len(i), dtype=COLUMNS)
+        frequency = start_frequency + i * step
+        chunk['frequency']   = frequency
+        chunk['wavelength']  = c / frequency
+        chunk['f_over_c']    = frequency / c
+        chunk['f_over_c_hc'] = chunk['f_over_c'] * hc
+        chunk['hf_energy']   = h * frequency
+        if exact_diff:
+            chunk['diff'] = -h * step
+            if lo == 0:
+                chunk['diff'][0] = -h * start_frequency
+        else:
+            chunk['diff'][0]  = prev - chunk['f_over_c_hc'][0]
+            chunk['diff'][1:] = chunk['f_over_c_hc'][:-1] - chunk['f_over_c_hc'][1:]
+            prev = chunk['f_over_c_hc'][-1]
+        yield chunk
+
+def write_quantization_table(path, start_frequency=start_frequency, step=step,
+                             num_steps=num_steps, chunk_size=1 << 20, exact_diff=False):
+    """Stream the table into a memory mapped .npy file of COLUMNS records."""
+    table = np.lib.format.open_memmap(path, mode='w+', dtype=COLUMNS, shape=(num_steps,))
+    row = 0
+    for chunk in quantization_chunks(start_frequency, step, num_steps, chunk_size, exact_diff):
+        table[row:row + len(chunk)] = chunk
+        row += len(chunk)
+    table.flush()
+    return table
+
+def main(start_frequency=start_frequency, step=step, num_steps=num_steps, out=None,
+         chunk_size=1 << 20, exact_diff=False):
+    """Print the table, or write it to the .npy file out."""
+    import pandas as pd
+
+    if out:
+        table = write_quantization_table(out, start_frequency, step, num_steps, chunk_size, exact_diff)
+        print(f"{len(table)} rows -> {out}")
+        return
+
+    rows = np.concatenate(list(quantization_chunks(start_frequency, step, num_steps,
+                                                   chunk_size, exact_diff)))
+
+    # Set display precision globally for the DataFrame
+    pd.options.display.float_format = '{:.8e}'.format
+
+    # Create a DataFrame for easier viewing
+    table = pd.DataFrame({
+        'Frequency (Hz)': rows['frequency'],
+        'λ (m)': rows['wavelength'],
+        '1/λ': "1 / λ =",
+        'f / c (1/m)': rows['f_over_c'],
+        '(f / c) * K (J)': rows['f_over_c_hc'],
+        '(E = hf (J))': rows['hf_energy'],
+        'diffs': rows['diff']
+    })
+
+    # Print the table
+    print (f"K = ratio between h and c, taken as hc with units J m")
+    print(table)
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Frequency, wavelength and energy table.")
+    parser.add_argument('--steps', type=int, default=num_steps)
+    parser.add_argument('--start', type=float, default=start_frequency, help="first frequency in Hz")
+    parser.add_argument('--step', type=float, default=step, help="frequency step in Hz")
+    parser.add_argument('--out', help="write the table to this .npy file instead of printing it")
+    parser.add_argument('--chunk-size', type=int, default=1 << 20)
+    parser.add_argument('--exact-diff', action='store_true', help="diffs from h * step, not by subtraction")
+    args = parser.parse_args()
+
+    main(args.start, args.step, args.steps, args.out, args.chunk_size, args.exact_diff)
 
 # --------------------------------------------------------------------------------
 # Results:
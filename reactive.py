@@ -0,0 +1,253 @@
+import ast
+import inspect
+import operator
+import textwrap
+from decimal import getcontext
+from typing import Dict, List, Tuple
+
+from formula_compiler import _Graph
+
+'''
+    Incremental recomputation of a framework when one input changes.
+
+    Trying another value for G, or for amp_force, normally means running
+    all of calculate_unit_scaling() and validate_planck_units() again.
+    ReactiveValidation reads both functions into one expression DAG, with
+    the same hash consing as formula_compiler.py, and keeps the value of
+    every node.  Each node knows the nodes computed from it, so changing
+    an input only throws away the values downstream of it, and the next
+    results() recomputes just those:
+
+        from constants_framework import validate_planck_units_reactive
+        from decimal import Decimal as D
+
+        frame = validate_planck_units_reactive()
+        frame.results()                          # everything, once
+        frame.set_known('G', D('6.67408e-11'))   # CODATA 2014 G
+        frame.results()                          # only what depends on G
+        frame.set('amp_force', D('1.0000000005e-7'))
+        frame.results()
+        frame.recomputed                         # operations the last call did
+
+    What can be set:
+
+      - set(name, value) for any name assigned in either function, the
+        parameters of validate_planck_units() included, or a global they
+        read such as c or pi; a name assigned in both is taken from
+        validate_planck_units()
+      - set_known(key, value) for a constants_registry value, every
+        known(key) in both functions at once
+      - reset(name) / reset_known(key) go back to the value the formulas give
+
+    Values are exact to the digit of the original functions, since every
+    node is the same operation on the same operands.  Changing the Decimal
+    precision or rounding recomputes everything on the next call.
+'''
+
+_OPERATORS = {
+    '+': operator.add, '-': operator.sub, '*': operator.mul, '/': operator.truediv, '**': operator.pow,
+}
+_UNARY = {'-': operator.neg, '+': operator.pos}
+_STALE = object()
+
+
+class _ReactiveGraph(_Graph):
+    """_Graph with method calls and a node for every assigned name."""
+
+    def children(self, node):
+        key = self.nodes[node]
+        if key[0] == 'method':
+            return [key[2], *key[3]]
+        if key[0] == 'local':
+            return [key[3]]
+        return super().children(node)
+
+    def expr(self, tree):
+        if isinstance(tree, ast.Call) and isinstance(tree.func, ast.Attribute) and not tree.keywords:
+            self.source_ops += 1
+            target = self.expr(tree.func.value)
+            args = tuple(self.expr(arg) for arg in tree.args)
+            return self.add(('method', tree.func.attr, target, args),
+                            self.varying[target] or any(self.varying[a] for a in args))
+        return super().expr(tree)
+
+    def assign(self, scope, name, tree):
+        """name = tree in the function scope; the name gets a node of its own so it can be set."""
+        value = tree if isinstance(tree, int) else self.expr(tree)
+        self.local[name] = self.add(('local', scope, name, value), self.varying[value])
+        return self.local[name]
+
+
+def _body(func):
+    return ast.parse(textwrap.dedent(inspect.getsource(func))).body[0].body
+
+
+class ReactiveValidation:
+    """calculate_unit_scaling() feeding validate_planck_units(), recomputed only where inputs change."""
+
+    def __init__(self, calculate, validate, namespace=None):
+        self.namespace = validate.__globals__ if namespace is None else namespace
+        graph = self.graph = _ReactiveGraph(())
+        scopes = self._scopes = {}
+
+        scope = calculate.__name__
+        scopes[scope] = {}
+        returned = None
+        for stmt in _body(calculate):
+            if isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Constant):
+                continue
+            if isinstance(stmt, ast.Return) and isinstance(stmt.value, ast.Tuple):
+                returned = [graph.expr(element) for element in stmt.value.elts]
+                break
+            scopes[scope][self._target(stmt)] = graph.assign(scope, self._target(stmt), stmt.value)
+        params = list(inspect.signature(validate).parameters)
+        if returned is None or len(returned) != len(params):
+            raise ValueError(f"{calculate.__name__} does not return the {len(params)} "
+                             f"parameters of {validate.__name__}")
+
+        scope = validate.__name__
+        graph.local = {}
+        scopes[scope] = {name: graph.assign(scope, name, node) for name, node in zip(params, returned)}
+        tables = {}
+        for stmt in _body(validate):
+            if 'expected' in tables and 'calcs' in tables:
+                break                                      # the results loop
+            if isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Constant):
+                continue
+            target = self._target(stmt)
+            if target in ('expected', 'calcs'):
+                tables[target] = {ast.literal_eval(k): graph.expr(v)
+                                  for k, v in zip(stmt.value.keys, stmt.value.values)}
+            else:
+                scopes[scope][target] = graph.assign(scope, target, stmt.value)
+        if 'expected' not in tables or 'calcs' not in tables:
+            raise ValueError(f"{validate.__name__} has no expected and calcs tables")
+
+        self.names = list(tables['expected'])
+        self._outputs = [(tables['expected'][name], tables['calcs'][name]) for name in self.names]
+
+        self._dependents: List[List[int]] = [[] for _ in graph.nodes]
+        for node in range(len(graph.nodes)):
+            for child in set(graph.children(node)):
+                self._dependents[child].append(node)
+        self._values = [_STALE] * len(graph.nodes)
+        self._overrides: Dict[int, object] = {}
+        self._context = None
+        self._results = {}
+        self.recomputed = 0
+
+    @staticmethod
+    def _target(stmt):
+        if not (isinstance(stmt, ast.Assign) and len(stmt.targets) == 1
+                and isinstance(stmt.targets[0], ast.Name)):
+            raise ValueError(f"cannot follow statement: {ast.unparse(stmt)}")
+        return stmt.targets[0].id
+
+    def _node(self, name):
+        for scope in reversed(list(self._scopes)):
+            if name in self._scopes[scope]:
+                return self._scopes[scope][name]
+        node = self.graph.index.get(('name', name))
+        if node is None:
+            raise KeyError(f"{name!r} is neither assigned nor read by the formulas")
+        return node
+
+    def _known(self, key):
+        const = self.graph.index.get(('const', 'str', repr(key)))
+        node = self.graph.index.get(('call', 'known', (const,)))
+        if const is None or node is None:
+            raise KeyError(f"the formulas do not use known({key!r})")
+        return node
+
+    def _invalidate(self, node):
+        stack = [node]
+        while stack:
+            for dependent in self._dependents[stack.pop()]:
+                if dependent not in self._overrides and self._values[dependent] is not _STALE:
+                    self._values[dependent] = _STALE
+                    stack.append(dependent)
+
+    def _override(self, node, value):
+        self._overrides[node] = value
+        self._values[node] = value
+        self._invalidate(node)
+
+    def _restore(self, node):
+        if self._overrides.pop(node, _STALE) is not _STALE:
+            self._values[node] = _STALE
+            self._invalidate(node)
+
+    def set(self, name, value):
+        """Use value for a name assigned or read by the formulas."""
+        self._override(self._node(name), value)
+
+    def set_known(self, key, value):
+        """Use value for known(key) everywhere in the formulas."""
+        self._override(self._known(key), value)
+
+    def reset(self, name):
+        self._restore(self._node(name))
+
+    def reset_known(self, key):
+        self._restore(self._known(key))
+
+    def inputs(self) -> Dict[str, List[str]]:
+        """What can be set: assigned names per function, globals, and known() keys."""
+        graph = self.graph
+        names = {scope: list(assigned) for scope, assigned in self._scopes.items()}
+        names['globals'] = sorted(key[1] for key in graph.nodes if key[0] == 'name')
+        names['known'] = sorted(ast.literal_eval(graph.nodes[key[2][0]][2]) for key in graph.nodes
+                                if key[0] == 'call' and key[1] == 'known')
+        return names
+
+    def _compute(self, node):
+        key = self.graph.nodes[node]
+        kind = key[0]
+        if kind == 'const':
+            return ast.literal_eval(key[2])
+        if kind == 'name':
+            return self.namespace[key[1]]
+        self.recomputed += kind != 'local'
+        value = self._values
+        if kind == 'binop':
+            return _OPERATORS[key[1]](value[key[2]], value[key[3]])
+        if kind == 'unary':
+            return _UNARY[key[1]](value[key[2]])
+        if kind == 'call':
+            return self.namespace[key[1]](*(value[a] for a in key[2]))
+        if kind == 'method':
+            return getattr(value[key[2]], key[1])(*(value[a] for a in key[3]))
+        return value[key[3]]                               # local
+
+    def _value(self, node):
+        values = self._values
+        if values[node] is not _STALE:
+            return values[node]
+        stack = [node]
+        while stack:                                       # children first, without recursion
+            top = stack[-1]
+            missing = [c for c in self.graph.children(top) if values[c] is _STALE]
+            if missing:
+                stack.extend(missing)
+                continue
+            stack.pop()
+            if values[top] is _STALE:
+                values[top] = self._compute(top)
+        return values[node]
+
+    def results(self) -> Dict[str, Tuple]:
+        """{name: (expected, calculated, rel_error)} like validate_planck_units(), recomputing only stale nodes."""
+        ctx = getcontext()
+        if self._context != (ctx.prec, ctx.rounding):
+            self._context = (ctx.prec, ctx.rounding)
+            self._values = [self._overrides.get(n, _STALE) for n in range(len(self.graph.nodes))]
+            self._results = {}
+        self.recomputed = 0
+        results = {}
+        for name, (expected, calculated) in zip(self.names, self._outputs):
+            exp_val, calc_val = self._value(expected), self._value(calculated)
+            last = self._results.get(name)
+            if last is None or last[0] is not exp_val or last[1] is not calc_val:
+                last = self._results[name] = (exp_val, calc_val, abs((calc_val - exp_val) / exp_val))
+            results[name] = last
+        return results
@@ -1,29 +1,27 @@
 import numpy as np
+from rescaler import rescale
 
 # Initial constants
 initial_G = 6.67430e-11   # Gravitational constant in m³/(kg·s²)
 initial_c = 299792458     # Speed of light in m/s
 current_Gc = initial_G * initial_c  # Gc product
 
+def adjust_unit_and_calculate(unit, initial_G, initial_c, target_Gc):
+    # closed form for any product of constants, see rescaler.py
+    result = rescale(target_Gc, {'G': 1, 'c': 1}, [unit], {'G': initial_G, 'c': initial_c})[0]
+    return result['adjustment'][()], result['G'][()], result['c'][()]
+
 def adjust_m_and_calculate(initial_G, initial_c, target_Gc):
-    meter_adjustment = np.power(current_Gc / target_Gc, 1/4)  # Adjust meter factor
-    #meter_adjustment = np.cbrt(current_Gc / target_Gc)  # Adjust meter factor
-    new_c = initial_c / meter_adjustment                # New speed of light (c)
-    new_G = initial_G / meter_adjustment**3             # New gravitational constant (G)
-    return meter_adjustment, new_G, new_c
+    return adjust_unit_and_calculate('m', initial_G, initial_c, target_Gc)
 
 def adjust_kg_and_calculate(initial_G, initial_c, target_Gc):
-    kg_adjustment = current_Gc / target_Gc             # Adjust kilogram factor 
-    new_G = initial_G / kg_adjustment                  # New gravitational constant (G)
-    return kg_adjustment, new_G, initial_c
+    return adjust_unit_and_calculate('kg', initial_G, initial_c, target_Gc)
 
 def adjust_s_and_calculate(initial_G, initial_c, target_Gc):
-    second_adjustment = np.cbrt(current_Gc / target_Gc)  # Adjust second factor
-    new_c = initial_c / second_adjustment             # New speed of light (c)
-    new_G = initial_G / second_adjustment**2             # New gravitational constant (G)
-    return second_adjustment, new_G, new_c
+    return adjust_unit_and_calculate('s', initial_G, initial_c, target_Gc)
 
-def run_Gc_calculations(target_Gc_values):
+def run_Gc_calculations(target_Gc_values, initial_G=initial_G, initial_c=initial_c):
+    current_Gc = initial_G * initial_c
     results = []
     units = ['m','kg','s']
     unit_functions = {
@@ -66,5 +64,6 @@ def run_Gc_calculations(target_Gc_values):
 target_Gc_values = [1.0]  # Example target Gc values
 #target_Gc_values = [initial_G * initial_c,1.0]  # Example target Gc values
 
-# Run the calculations for each target Gc value
-run_Gc_calculations(target_Gc_values)
+if __name__ == "__main__":
+    # Run the calculations for each target Gc value
+    run_Gc_calculations(target_Gc_values)
@@ -0,0 +1,237 @@
+import argparse
+import sys
+import types
+
+'''
+    One command for every analysis in this repo:
+
+        python -m redefine_units framework --prec 200
+        python -m redefine_units simplified --known G=6.6743e-11
+        python -m redefine_units derive --G 6.6743e-11
+        python -m redefine_units redefine-h 1.0 2e-25 --h 6.62607015e-34
+        python -m redefine_units redefine-g 1.0
+        python -m redefine_units rescale-kg --G 6.674e-11
+        python -m redefine_units masses --prec 30
+        python -m redefine_units quantization --steps 1000000 --out table.npy
+        python -m redefine_units simplify --catalog formula_catalog.txt
+        python -m redefine_units plot --out convergence.png --points 2000
+
+    Each subcommand runs the main() of the script it is named after, with
+    the arguments in place of the values that used to be edited in the
+    script between runs.  Only that script is imported, after the
+    arguments are read, so a run pays for numpy, sympy or matplotlib only
+    when it uses them.
+
+    --known SYMBOL=VALUE replaces a reference value from constants_catalog.txt,
+    by symbol or by name, for the whole run; see override() in
+    constants_registry.py.  The constants a script reads from the catalog
+    when it is imported are read again, into a copy of its globals that its
+    functions are rebound to, so an override holds even when the script
+    was imported before.  --prec is the Decimal precision in digits, for
+    the subcommands that work in Decimal; the others are numpy floats.
+'''
+
+# module globals read from the catalog on import, name -> catalog symbol
+_CATALOG_GLOBALS = {
+    'constants_framework':          {'c': 'c', 'e_0': 'epsilon_0', 'k_B': 'k_B'},
+    'simplified_plancks_constants': {'c': 'c', 'e_0': 'epsilon_0', 'k_B': 'k_B'},
+    'define_const_from_units':      {'h': 'h', 'c': 'c', 'mol': 'N_A', 'e': 'e', 'k': 'k_B'},
+    'subatomic_masses':             {name: name for name in ('h', 'c', 'e', 'm_e', 'm_p', 'm_n', 'm_P', 'G')},
+}
+
+
+def _known(values):
+    """'h=6.6e-34' arguments to a {symbol: value} dict for override()."""
+    overrides = {}
+    for value in values or ():
+        symbol, sep, number = value.partition('=')
+        if not sep:
+            raise argparse.ArgumentTypeError(f"--known expects SYMBOL=VALUE, got {value!r}")
+        overrides[symbol.strip()] = number.strip()
+    return overrides
+
+
+def _override(args):
+    from constants_registry import override
+    try:
+        override(_known(args.known))
+    except KeyError as error:
+        raise SystemExit(f"--known: no constant {error.args[0]!r} in the catalog")
+    except ArithmeticError:
+        raise SystemExit(f"--known: not a number in {args.known}")
+
+
+def _reread(module, kind=None, **values):
+    """
+    A copy of module's globals with its catalog constants read again, and
+    any values given, and the functions of module rebound to the copy.
+    """
+    from constants_registry import known
+
+    namespace = dict(vars(module))
+    for name, symbol in _CATALOG_GLOBALS[module.__name__].items():
+        namespace[name] = known(symbol) if kind is None else known(symbol, kind)
+    namespace.update(values)
+    for name, value in vars(module).items():
+        if isinstance(value, types.FunctionType) and value.__module__ == module.__name__:
+            rebound = types.FunctionType(value.__code__, namespace, name, value.__defaults__, value.__closure__)
+            rebound.__kwdefaults__ = value.__kwdefaults__
+            namespace[name] = rebound
+    return namespace
+
+
+def _framework(module_name):
+    def run(args):
+        import importlib
+
+        _override(args)
+        module = importlib.import_module(module_name)
+        from formula_compiler import compile_validation
+
+        namespace = _reread(module)
+        namespace['main'](namespace['calculate_unit_scaling'],
+                          compile_validation(namespace['validate_planck_units'], namespace), args.prec)
+    return run
+
+
+def _derive(args):
+    _override(args)
+    import define_const_from_units as dc
+
+    namespace = _reread(dc, float)
+    namespace['_derived'] = None                  # rebuilt from the values read again
+    namespace['main'](dc.G if args.G is None else args.G)
+
+
+def _redefine_h(args):
+    import simple_redefine_h as rh
+
+    rh.run_hc_calculations(args.targets or rh.target_hc_values,
+                           rh.initial_h if args.h is None else args.h,
+                           rh.initial_c if args.c is None else args.c)
+
+
+def _redefine_g(args):
+    import redefine_g as rg
+
+    rg.run_Gc_calculations(args.targets or rg.target_Gc_values,
+                           rg.initial_G if args.G is None else args.G,
+                           rg.initial_c if args.c is None else args.c)
+
+
+def _rescale_kg(args):
+    import rescaling_kg_to_set_hc_and_G_equal as rk
+
+    rk.analyze_hc_G_scaling(rk.h if args.h is None else args.h,
+                            rk.c if args.c is None else args.c,
+                            rk.G if args.G is None else args.G)
+
+
+def _masses(args):
+    _override(args)
+    import subatomic_masses
+
+    _reread(subatomic_masses)['main'](args.prec)
+
+
+def _quantization(args):
+    import quantization_demo as qd
+
+    qd.main(qd.start_frequency if args.start is None else args.start,
+            qd.step if args.step is None else args.step,
+            qd.num_steps if args.steps is None else args.steps,
+            args.out, args.chunk_size, args.exact_diff)
+
+
+def _simplify(args):
+    if args.catalog:
+        import formula_rewriter
+
+        formula_rewriter.main(args.catalog, args.budget, args.workers)
+    else:
+        import simplifyconstantformulas
+
+        simplifyconstantformulas.main()
+
+
+def _plot(args):
+    import convergence_plot
+
+    convergence_plot.main(args.out, args.points, args.mass)
+
+
+def parser() -> argparse.ArgumentParser:
+    main = argparse.ArgumentParser(prog='python -m redefine_units',
+                                   description="Run one of the unit scaling analyses.")
+    commands = main.add_subparsers(dest='command', metavar='command', required=True)
+
+    def command(name, run, help):
+        sub = commands.add_parser(name, help=help, description=help)
+        sub.set_defaults(run=run)
+        return sub
+
+    def known(sub):
+        sub.add_argument('--known', action='append', metavar='SYMBOL=VALUE',
+                         help="replace a catalog value, may be repeated")
+
+    for name, module, help in (('framework', 'constants_framework', "the Hz_kg, K_Hz, C_kg framework"),
+                               ('simplified', 'simplified_plancks_constants',
+                                "the framework with hc = G = 1")):
+        sub = command(name, _framework(module), f"{help}, every constant recreated from the unit scalings")
+        sub.add_argument('--prec', type=int, default=100, help="Decimal digits")
+        known(sub)
+
+    sub = command('derive', _derive, "derived constants from the base units of h, c and G")
+    sub.add_argument('--G', type=float, help="G the base units are found with")
+    known(sub)
+
+    sub = command('redefine-h', _redefine_h, "rescale m, kg and s to give hc each target value")
+    sub.add_argument('targets', nargs='*', type=float, help="target hc values, default 1.0")
+    sub.add_argument('--h', type=float)
+    sub.add_argument('--c', type=float)
+
+    sub = command('redefine-g', _redefine_g, "rescale m, kg and s to give Gc each target value")
+    sub.add_argument('targets', nargs='*', type=float, help="target Gc values, default 1.0")
+    sub.add_argument('--G', type=float)
+    sub.add_argument('--c', type=float)
+
+    sub = command('rescale-kg', _rescale_kg, "the kg scaling that makes hc equal to G")
+    sub.add_argument('--h', type=float)
+    sub.add_argument('--c', type=float)
+    sub.add_argument('--G', type=float)
+
+    sub = command('masses', _masses, "particle masses as multiples of the photon mass at 1 Hz")
+    sub.add_argument('--prec', type=int, default=50, help="Decimal digits")
+    known(sub)
+
+    sub = command('quantization', _quantization, "frequency, wavelength and energy table")
+    sub.add_argument('--steps', type=int)
+    sub.add_argument('--start', type=float, help="first frequency in Hz")
+    sub.add_argument('--step', type=float, help="frequency step in Hz")
+    sub.add_argument('--out', help="write the table to this .npy file instead of printing it")
+    sub.add_argument('--chunk-size', type=int, default=1 << 20)
+    sub.add_argument('--exact-diff', action='store_true', help="diffs from h * step, not by subtraction")
+
+    sub = command('simplify', _simplify, "formulas rewritten with the unit scalings")
+    sub.add_argument('--catalog', help="rewrite this formula catalog instead, see formula_rewriter.py")
+    sub.add_argument('--budget', type=float, default=10.0, help="seconds per simplify, with --catalog")
+    sub.add_argument('--workers', type=int, default=None, help="with --catalog")
+
+    sub = command('plot', _plot, "h, p and hc of a constant mass as c goes to 1")
+    sub.add_argument('--out', default='convergence_plot.png')
+    sub.add_argument('--points', type=int, default=500)
+    sub.add_argument('--mass', type=float, default=1)
+
+    return main
+
+
+def main(argv=None):
+    args = parser().parse_args(argv)
+    try:
+        args.run(args)
+    except argparse.ArgumentTypeError as error:
+        raise SystemExit(f"{args.command}: {error}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
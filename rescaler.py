@@ -0,0 +1,106 @@
+from typing import Dict, Mapping, Optional, Sequence
+
+import numpy as np
+
+from constants_registry import DIMENSIONS, registry
+
+'''
+    Closed form unit rescaling for any product of constants.
+
+    simple_redefine_h.py and redefine_g.py each have three adjust
+    functions, one per unit, for one product (hc or Gc) and one target at a
+    time.  They are all the same calculation.  A product of constants has a
+    power p of each base unit, taken from the dimensions in the constants
+    catalog (hc is m^3 kg s^-2).  Redefining one unit by an adjustment a
+    divides the value of the product by a^|p|, so
+
+        a = (current / target) ^ (1 / |p|)
+
+    and every constant in the product is divided by a to the power of its
+    own exponent of that unit, with the sign of p.  That is the same
+    convention the adjust functions use: the adjustment is whatever the
+    product is divided by.
+
+    For a unit with a positive power in the product the adjustment is the
+    size of the new unit measured in the old one, and every constant is
+    divided by it, new = old / a^p, the convention unit_solver.py solves
+    in as well.  For a negative power, the second in hc or the kilogram
+    in Gc, the adjust functions report the inverse, the old unit measured
+    in the new one, so the product is still the thing divided by a.
+
+        rescale(targets, {'h': 1, 'c': 1})               # hc
+        rescale(targets, {'G': 1, 'c': 1})               # Gc
+        rescale(targets, {'h': 1, 'G': -1}, ['kg', 's'])  # h/G
+
+    targets can be any array, and the result is a structured array with a
+    row per unit.  A unit the product does not depend on cannot reach the
+    target, its adjustment is nan.
+'''
+
+
+# exact roots for the common powers, x**(1/3) is off by a few ulp
+_ROOTS = {1: np.positive, 2: np.sqrt, 3: np.cbrt}
+
+
+def dimension(product: Mapping[str, float]) -> np.ndarray:
+    """Base unit powers (over DIMENSIONS) of a product {symbol: power} of catalog constants."""
+    powers = np.zeros(len(DIMENSIONS))
+    for symbol, power in product.items():
+        powers += power * np.array(registry()[symbol].dimension, dtype=np.float64)
+    return powers
+
+
+def rescale(targets, product: Mapping[str, float], units: Sequence[str] = ('m', 'kg', 's'),
+            values: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """
+    Redefine each of units so the product takes every value in targets.
+
+    values overrides the starting value of constants in the product, by
+    default they come from the constants catalog.  Returns a structured
+    array of shape (len(units),) + targets.shape with the fields unit,
+    target, adjustment, one field per constant with its new value, the new
+    product and its relative_difference from the target.
+    """
+    targets = np.asarray(targets, dtype=np.float64)
+    symbols = list(product)
+    start = {s: float((values or {}).get(s, registry().value(s))) for s in symbols}
+    current = np.prod([start[s] ** product[s] for s in symbols])
+
+    unit_index = [DIMENSIONS.index(u) for u in units]
+    dims = {s: np.array(registry()[s].dimension, dtype=np.float64)[unit_index] for s in symbols}
+    powers = dimension(product)[unit_index]                       # p per unit
+    sign = np.sign(powers)
+
+    shape = (len(units),) + (1,) * targets.ndim                   # units along the first axis
+    ratio = current / targets
+    adjustment = np.empty((len(units),) + targets.shape)
+    for i, p in enumerate(np.abs(powers)):
+        adjustment[i] = _ROOTS[p](ratio) if p in _ROOTS else ratio ** (1 / p) if p else np.nan
+
+    result = np.empty((len(units),) + targets.shape, dtype=[
+        ('unit', 'U8'), ('target', 'f8'), ('adjustment', 'f8')]
+        + [(s, 'f8') for s in symbols] + [('product', 'f8'), ('relative_difference', 'f8')])
+    result['unit'] = np.array(units).reshape(shape)
+    result['target'] = targets
+    result['adjustment'] = adjustment
+    final = np.ones(result.shape)
+    for s in symbols:
+        result[s] = start[s] / adjustment ** (dims[s] * sign).reshape(shape)
+        final = final * result[s] ** product[s]
+    result['product'] = final
+    result['relative_difference'] = np.abs(final - targets) / targets
+    return result
+
+
+if __name__ == "__main__":
+    targets = np.array([1e-25, 1.0, 1e3])
+    for name, product, units in (('hc', {'h': 1, 'c': 1}, ('m', 'kg', 's')),
+                                 ('Gc', {'G': 1, 'c': 1}, ('m', 'kg', 's')),
+                                 ('G/c', {'G': 1, 'c': -1}, ('m', 'kg', 's')),
+                                 ('h/G', {'h': 1, 'G': -1}, ('m', 'kg', 's'))):
+        print(f"\n{name}: base unit powers {dimension(product)[:3]} (m kg s)")
+        result = rescale(targets, product, units)
+        fields = result.dtype.names
+        print('  '.join(f"{f:>12}" for f in fields))
+        for row in result.ravel():
+            print('  '.join(f"{row[f]:>12}" if f == 'unit' else f"{row[f]:>12.5e}" for f in fields))
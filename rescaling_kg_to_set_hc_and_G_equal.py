@@ -1,13 +1,14 @@
 import numpy as np
 
-def analyze_hc_G_scaling():
+# Original constants
+h = 6.62607015e-34
+c = 299792458
+G = 6.67430e-11
+
+def analyze_hc_G_scaling(h=h, c=c, G=G):
     """
     Analyze how hc and G relate when we scale kg to make their ratio 1
     """
-    # Original constants
-    h = 6.62607015e-34
-    c = 299792458
-    G = 6.67430e-11
 
     # Calculate original hc
     hc_original = h * c
@@ -0,0 +1,129 @@
+from decimal import Decimal
+from typing import Dict, NamedTuple
+
+import numpy as np
+
+from aaaa10_space_time_ratio import c, m, scaled_constants, space_time_ratio
+
+'''
+    p, h, hc, m and G over a whole grid of unit scalings.
+
+    calculate_and_print_results_new() in aaaa10_space_time_ratio.py works
+    through a hand typed list of (m_scaling, l_scaling) pairs in Decimal
+    and prints a row for each.  scaling_grid() takes a log spaced range of
+    mass scalings and one of length scalings and works out the same
+    formulas for every combination at once in float64, a 4096 x 4096 grid
+    in well under a second, as arrays ready for a heat map:
+
+        m, m_P      one value per mass scaling, they do not depend on length
+        c           one value per length scaling
+        p, h, hc, G one row per mass scaling, one column per length scaling
+
+    refine() works chosen cells out again with scaled_constants() in
+    Decimal, at the 100 digits aaaa10 uses, and reports how far the
+    float64 values were off.
+
+        python scaling_grid.py --mass 1e-5 1e5 --length 1e-9 1e5 --size 4096 --out grid.npz
+        python scaling_grid.py --size 512 --refine 0,0 511,511
+'''
+
+FIELDS = ('p', 'h', 'hc', 'G')          # the surfaces, the rest are axes
+
+
+class Grid(NamedTuple):
+    m_scaling: np.ndarray       # the mass axis
+    l_scaling: np.ndarray       # the length axis
+    m:         np.ndarray
+    m_P:       np.ndarray
+    c:         np.ndarray
+    surfaces:  Dict[str, np.ndarray]    # FIELDS, shape (mass, length)
+
+
+class Cell(NamedTuple):
+    i:          int
+    j:          int
+    constants:  Dict[str, Decimal]      # as returned by scaled_constants()
+    rel_error:  Dict[str, float]        # |float64 - Decimal| / |Decimal| of every field
+
+
+def scaling_grid(mass_range=(1e-5, 1e5), length_range=(1e-9, 1e5), shape=(1024, 1024),
+                 c_old=c, m_old=m, fields=FIELDS) -> Grid:
+    """The constants of calculate_and_print_results_new() for log spaced scalings."""
+    m_scaling = np.geomspace(*mass_range, shape[0])
+    l_scaling = np.geomspace(*length_range, shape[1])
+
+    m_new = float(m_old) * m_scaling
+    c_new = float(c_old) * l_scaling
+    m_P = m_new / float(space_time_ratio)
+
+    m_ = m_new[:, None]
+    c_ = c_new[None, :]
+    formulas = {
+        'p':  lambda: m_ * c_,
+        'h':  lambda: m_ * c_**2,
+        'hc': lambda: m_ * c_**3,
+        'G':  lambda: m_ * c_**3 / (m_P**2)[:, None],
+    }
+    return Grid(m_scaling, l_scaling, m_new, m_P, c_new, {name: formulas[name]() for name in fields})
+
+
+def value(grid, name, i, j):
+    """The float64 value of one field in cell (i, j)."""
+    if name in grid.surfaces:
+        return float(grid.surfaces[name][i, j])
+    if name == 'c':
+        return float(grid.c[j])
+    return float(getattr(grid, name)[i])
+
+
+def refine(grid, cells, c_old=c, m_old=m):
+    """Each (i, j) of cells again in Decimal, with the error of the float64 grid."""
+    refined = []
+    for i, j in cells:
+        constants = scaled_constants((grid.m_scaling[i], grid.l_scaling[j]), c_old, m_old)
+        rel_error = {}
+        for name, exact in constants.items():
+            if name in grid.surfaces or name in ('m', 'm_P', 'c'):
+                rel_error[name] = float(abs(Decimal(value(grid, name, i, j)) - exact) / abs(exact))
+        refined.append(Cell(i, j, constants, rel_error))
+    return refined
+
+
+def save(path, grid):
+    """The grid as an .npz file, the surfaces under their own names."""
+    np.savez(path, m_scaling=grid.m_scaling, l_scaling=grid.l_scaling,
+             m=grid.m, m_P=grid.m_P, c=grid.c, **grid.surfaces)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="p, h, hc, m and G over a grid of unit scalings.")
+    parser.add_argument('--mass', type=float, nargs=2, default=(1e-5, 1e5), metavar=('LOW', 'HIGH'))
+    parser.add_argument('--length', type=float, nargs=2, default=(1e-9, 1e5), metavar=('LOW', 'HIGH'))
+    parser.add_argument('--size', type=int, nargs='+', default=[1024], help="points per axis, or mass and length")
+    parser.add_argument('--refine', nargs='*', default=[], metavar='I,J', help="cells to redo in Decimal")
+    parser.add_argument('--out', help="save the grid to this .npz file")
+    args = parser.parse_args()
+
+    shape = (args.size[0], args.size[-1])
+    start = time.perf_counter()
+    grid = scaling_grid(args.mass, args.length, shape)
+    print(f"{shape[0]} x {shape[1]} grid in {time.perf_counter() - start:.2f} s")
+    for name, surface in grid.surfaces.items():
+        print(f"  {name:<3} {surface.min():<13.8e} .. {surface.max():<13.8e}")
+
+    cells = [tuple(int(n) for n in cell.split(',')) for cell in args.refine]
+    if cells:
+        print()
+        print("      s_length   s_mass     hc             h              p             m             G              largest error")
+    for cell in refine(grid, cells):
+        k = cell.constants
+        l_scaling = Decimal(grid.l_scaling[cell.j])
+        print(f"     {1/l_scaling:<10.5e} {grid.m_scaling[cell.i]:<10.5e} {k['hc']:<13.8e} {k['h']:<13.8e} "
+              f"{k['p']:<13.8} {k['m']:<13.8} {k['G']:<13.8}  {max(cell.rel_error.values()):.2e}")
+
+    if args.out:
+        save(args.out, grid)
+        print(f"saved {args.out}")
@@ -33,64 +33,76 @@ wavelength_old =  c_old/f
 energy_old = calculate_energy(mass_old, c_old)
 frequency_old = calculate_frequency(energy_old, h_old)
 
-# New values
+def rescale(meter_scaling, mass_scaling):
+    """The photon at 1 Hz in the units with the meter and the kg rescaled."""
+    s_length_new   = s_length * meter_scaling**3
+    s_mass_new     = s_mass   * mass_scaling
 
-#set hc = 1
-#meter_scaling = 1/s_length**(1/3)
-#mass_scaling  = 1/s_mass
+    c_new          =          c_old / meter_scaling
+    meter_new      =              1 * meter_scaling
+    mass_new       =       (f * s_length_new * s_mass_new)/c_new**3
+    wavelength_new = wavelength_old / meter_scaling
 
-# set hc = 2*10^-25
-#meter_scaling = 0.997735853701971098
-#mass_scaling  = 1.0136931846243198
+    h_new          =  s_length_new * s_mass_new / c_new  # This sets h to 1/c in the new units
 
-# set c = 3*10^8
-meter_scaling = 0.9993081933333333
-mass_scaling  = 1.00891578925934697358163051967611361
+    # Calculate energy and frequency with new values
+    energy_new    = calculate_energy    (mass_new, c_new)
+    frequency_new = calculate_frequency (energy_new, h_new)
 
-# Our current system
-#meter_scaling = 1.0
-#mass_scaling  = 1.0
+    return {'s_length': s_length_new, 's_mass': s_mass_new, 'c': c_new, 'meter': meter_new,
+            'mass': mass_new, 'wavelength': wavelength_new, 'h': h_new,
+            'energy': energy_new, 'frequency': frequency_new}
 
-s_length_new   = s_length * meter_scaling**3
-s_mass_new     = s_mass   * mass_scaling
+if __name__ == "__main__":
+    # New values
 
-c_new          =          c_old / meter_scaling
-meter_new      =              1 * meter_scaling
-mass_new       =       (f * s_length_new * s_mass_new)/c_new**3
-wavelength_new = wavelength_old / meter_scaling
+    #set hc = 1
+    #meter_scaling = 1/s_length**(1/3)
+    #mass_scaling  = 1/s_mass
 
-h_new          =  s_length_new * s_mass_new / c_new  # This sets h to 1/c in the new units
+    # set hc = 2*10^-25
+    #meter_scaling = 0.997735853701971098
+    #mass_scaling  = 1.0136931846243198
 
-# Calculate energy and frequency with new values
-energy_new    = calculate_energy    (mass_new, c_new)
-frequency_new = calculate_frequency (energy_new, h_new)
+    # set c = 3*10^8
+    meter_scaling = 0.9993081933333333
+    mass_scaling  = 1.00891578925934697358163051967611361
 
-# Print results
-print()
-print(f" meter_scaling : {meter_scaling}")
-print(f" kg scaling    : {mass_scaling}")
+    # Our current system
+    #meter_scaling = 1.0
+    #mass_scaling  = 1.0
 
+    new = rescale(meter_scaling, mass_scaling)
+    s_length_new, s_mass_new, c_new, meter_new = new['s_length'], new['s_mass'], new['c'], new['meter']
+    mass_new, wavelength_new, h_new = new['mass'], new['wavelength'], new['h']
+    energy_new, frequency_new = new['energy'], new['frequency']
 
-print()
+    # Print results
+    print()
+    print(f" meter_scaling : {meter_scaling}")
+    print(f" kg scaling    : {mass_scaling}")
 
-print(f"         Freq   Meter      c            Wavelength       Mass              Momentum        Energy           h")
 
-print(f"   old: {frequency_old:<6.3} {meter_old:<10.3} {c_old:<12.10} {wavelength_old:<16.10} {mass_old:<16.10} {energy_old/c_old:<16.10} {energy_old:<16.10e} {h_old:<16.10}")
-print(f"   new: {frequency_new:<6.3} {meter_new:<10.3} {c_new:<12.10} {wavelength_new:<16.10} {mass_new:<16.10} {energy_new/c_new:<16.10} {energy_new:<16.10e} {h_new:<16.10e}")
-print(f" ratio: {frequency_new/frequency_old:<6.3} {meter_new/meter_old:<10.3} {c_new/c_old:<12.10} {wavelength_new/wavelength_old:<16.10} {mass_new/mass_old:<16.10} {(energy_new/c_new)/(energy_old/c_old):<16.10} {energy_new/energy_old:<16.10} {h_new/h_old:<16.10e}")
+    print()
 
-print()
-print ( f"          old                    new")
-print ( f" s_length {s_length}  {s_length_new} \n   s_mass {s_mass}  {s_mass_new}")
-print ( f"       hc {h_old * c_old} {s_length_new * s_mass_new}")
-print ( f"        h {h_old:<22.10} {(s_length_new * s_mass_new)/c_new}")
-print ( f"        G {s_length/s_mass:<22.10} {(s_length_new / s_mass_new)}")
+    print(f"         Freq   Meter      c            Wavelength       Mass              Momentum        Energy           h")
 
-print()
-print (f" c_new              1/c_new              1/c_new^2            1/c_new^3              2/c_new")
-print (f" {c_new} {1/c_new} {1/c_new**2} {1/c_new**3} {2/c_new} ")
+    print(f"   old: {frequency_old:<6.3} {meter_old:<10.3} {c_old:<12.10} {wavelength_old:<16.10} {mass_old:<16.10} {energy_old/c_old:<16.10} {energy_old:<16.10e} {h_old:<16.10}")
+    print(f"   new: {frequency_new:<6.3} {meter_new:<10.3} {c_new:<12.10} {wavelength_new:<16.10} {mass_new:<16.10} {energy_new/c_new:<16.10} {energy_new:<16.10e} {h_new:<16.10e}")
+    print(f" ratio: {frequency_new/frequency_old:<6.3} {meter_new/meter_old:<10.3} {c_new/c_old:<12.10} {wavelength_new/wavelength_old:<16.10} {mass_new/mass_old:<16.10} {(energy_new/c_new)/(energy_old/c_old):<16.10} {energy_new/energy_old:<16.10} {h_new/h_old:<16.10e}")
 
-print()
-print ( f"                             mass_old/mass_new : {mass_old/mass_new}")
-print ( f" mass_old/mass_new * s_length_new * s_mass_new : {mass_old/mass_new * s_length_new * s_mass_new} ")
-print()
+    print()
+    print ( f"          old                    new")
+    print ( f" s_length {s_length}  {s_length_new} \n   s_mass {s_mass}  {s_mass_new}")
+    print ( f"       hc {h_old * c_old} {s_length_new * s_mass_new}")
+    print ( f"        h {h_old:<22.10} {(s_length_new * s_mass_new)/c_new}")
+    print ( f"        G {s_length/s_mass:<22.10} {(s_length_new / s_mass_new)}")
+
+    print()
+    print (f" c_new              1/c_new              1/c_new^2            1/c_new^3              2/c_new")
+    print (f" {c_new} {1/c_new} {1/c_new**2} {1/c_new**3} {2/c_new} ")
+
+    print()
+    print ( f"                             mass_old/mass_new : {mass_old/mass_new}")
+    print ( f" mass_old/mass_new * s_length_new * s_mass_new : {mass_old/mass_new * s_length_new * s_mass_new} ")
+    print()
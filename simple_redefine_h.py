@@ -1,4 +1,5 @@
 import numpy as np
+from rescaler import rescale
 
 # this program demonstrates that h is just a constant K =hc  so that h = K/c
 # No K is not a constant either.
@@ -10,24 +11,22 @@ initial_h = 6.62607015e-34  # Planck's constant in J·s
 initial_c = 299792458       # Speed of light in m/s
 current_hc = initial_h * initial_c
 
+def adjust_unit_and_calculate(unit, initial_h, initial_c, target_hc):
+    # closed form for any product of constants, see rescaler.py
+    result = rescale(target_hc, {'h': 1, 'c': 1}, [unit], {'h': initial_h, 'c': initial_c})[0]
+    return result['adjustment'][()], result['h'][()], result['c'][()]
+
 def adjust_m_and_calculate(initial_h, initial_c, target_hc):
-    meter_adjustment = np.cbrt(current_hc / target_hc) # Adjust meter factor
-    new_c = initial_c / meter_adjustment               # New speed of light (c)
-    new_h = initial_h / meter_adjustment**2            # New Planck's constant (h)
-    return meter_adjustment,new_h, new_c
+    return adjust_unit_and_calculate('m', initial_h, initial_c, target_hc)
 
 def adjust_kg_and_calculate(initial_h, initial_c, target_hc):
-    kg_adjustment = current_hc / target_hc   # Adjust kilogram factor 
-    new_h = initial_h / kg_adjustment        # New Planck's constant (h)
-    return kg_adjustment,new_h, initial_c
+    return adjust_unit_and_calculate('kg', initial_h, initial_c, target_hc)
 
 def adjust_s_and_calculate(initial_h, initial_c, target_hc):
-    second_adjustment = np.sqrt(current_hc /target_hc) # Adjust second factor
-    new_c = initial_c / second_adjustment                  # New speed of light (c)
-    new_h = initial_h / second_adjustment                  # New Planck's constant (h)
-    return second_adjustment,new_h, new_c
+    return adjust_unit_and_calculate('s', initial_h, initial_c, target_hc)
 
-def run_hc_calculations(target_hc_values):
+def run_hc_calculations(target_hc_values, initial_h=initial_h, initial_c=initial_c):
+    current_hc = initial_h * initial_c
     results = []
     units = ['m','kg','s']
     unit_functions = {
@@ -70,5 +69,6 @@ def run_hc_calculations(target_hc_values):
 #target_hc_values = [current_hc, 2e-25, 1e-25, 1e-24, 1.0]  # Example target hc values
 target_hc_values = [1.0]  # Example target hc values
 
-# Run the calculations for each target hc value
-run_hc_calculations(target_hc_values)
+if __name__ == "__main__":
+    # Run the calculations for each target hc value
+    run_hc_calculations(target_hc_values)
@@ -1,5 +1,8 @@
 from decimal import Decimal as D, getcontext, Context, ROUND_DOWN
 from typing import Dict, Tuple
+from constants_registry import known
+from decimal_math import d_p, pi as d_pi, sqrt_two_pi as d_sqrt_two_pi
+from framework_variants import Variants
 
 '''
     This program calculates the individual unit scaling
@@ -26,21 +29,21 @@ from typing import Dict, Tuple
 
     Author: James Rogers, SE Ohio, 26 Nov 2024 1824
 '''
-c   = D('299792458.0')     # speed of light
-e_0 = D('8.854187817e-12') # epsilon_0
-k_B = D('1.380649e-23')    # Boltzmann constant in J/K
-pi  = D('3.141592653589793238462643383279502884197169399375105820974944592')
+c   = known('c')           # speed of light
+e_0 = known('epsilon_0')   # epsilon_0
+k_B = known('k_B')         # Boltzmann constant in J/K
 
-# Set precision to 50 D places
-getcontext().prec = 100
+# The precision the formulas are written for.  main() sets it, anything
+# importing this module runs them at the precision of its own context.
+PRECISION = 100
 
 def calculate_unit_scaling():
 
     # isolate all the base scaling factors
 
     # Original constants
-    h = D('6.62607015e-34')
-    G = D('6.67430e-11')
+    h = known('h')
+    G = known('G')
 
     # Calculate original hc
     hc = h * c
@@ -92,22 +95,13 @@ def calculate_unit_scaling():
 
     return s_length, s_mass, s_temp, s_charge
 
-# Decimal_power
-def d_p(base: D, exponent: D) -> D:
-    """Raise a D to a power using high-precision arithmetic."""
-    if base == 0 and exponent == 0:
-        raise ValueError("0**0 is undefined")
-    elif base < 0:
-        raise ValueError("Negative bases with fractional exponents are not supported.")
-    else:
-        # Using `ln()` and `exp()` to perform precise power calculation
-        return (base.ln() * exponent).exp()
-
 def validate_planck_units(s_length, s_mass, s_temp, s_charge) -> Dict[str, Tuple[D, D, D]]:
-    e         = D('1.602176634e-19')
-    m_e       = D('9.1093837139e-31')  # kg electron mass
-    m_p       = D('1.67262192595e-27') # kg proton mass
-    N_A       = D('6.02214076e23')     # mol^−1 Avogadro constant
+    e         = known('e')
+    m_e       = known('m_e')     # kg electron mass
+    m_p       = known('m_p')     # kg proton mass
+    N_A       = known('N_A')     # mol^−1 Avogadro constant
+    pi          = d_pi()          # to the precision of the context
+    sqrt_two_pi = d_sqrt_two_pi()
 
     # the following 4 are set in main from the output of the calculate_unit_scaling() funtion above
 
@@ -122,16 +116,16 @@ def validate_planck_units(s_length, s_mass, s_temp, s_charge) -> Dict[str, Tuple
     p_calc       = (s_length * s_mass) / c**2
     m_calc       = (s_length * s_mass) / c**3
     G_calc       =  s_length / s_mass
-    length_calc  =  s_length / (d_p(D(2) * pi, D('0.5')) * d_p(c, D(2)))
-    time_calc    =  s_length / (d_p(D(2) * pi, D('0.5')) * d_p(c, D(3)))
+    length_calc  =  s_length / (sqrt_two_pi * d_p(c, D(2)))
+    time_calc    =  s_length / (sqrt_two_pi * d_p(c, D(3)))
     charge_calc  =  s_charge * d_p(D(2), D('0.5'))
-    temp_calc    =  d_p(c, D(2)) * s_temp / (d_p(D(2) * pi, D('0.5')) * s_length)
+    temp_calc    =  d_p(c, D(2)) * s_temp / (sqrt_two_pi * s_length)
     angular_momentum_calc = h_calc / (D(2) * pi)
-    mass_calc      = s_mass                            / d_p(D(2) * pi, D('0.5'))
+    mass_calc      = s_mass                            / sqrt_two_pi
     #momentun_calc = d_p(((h_bar_calc * c* c* c)       /G_calc), D(0.5))
     #momentun_calc = d_p((((s_length * s_mass) / (D(2) * pi * c) * c* c* c)/(s_length / s_mass)), D(0.5))
-    momentun_calc  = s_mass * c                        / d_p((D(2) * pi ), D(0.5))
-    energy_calc    = s_mass * d_p(c, D(2))             / d_p((D(2) * pi), D(0.5))
+    momentun_calc  = s_mass * c                        / sqrt_two_pi
+    energy_calc    = s_mass * d_p(c, D(2))             / sqrt_two_pi
     force_calc     = s_mass * d_p(c, D(4))             / s_length
     power_calc     = s_mass * d_p(c, D(5))             / s_length
     density_calc   = s_mass * d_p(c, D(6)) * D(2) * pi / d_p(s_length, D(3))
@@ -177,52 +171,52 @@ def validate_planck_units(s_length, s_mass, s_temp, s_charge) -> Dict[str, Tuple
     '''
 
     expected = {
-        'hc':                      D('1.9864458571489287e-25'),
-        'Planck constant E at 1Hz':D('6.62607015e-34'),
-        'momentum at 1Hz':         D('2.2102190943042336e-42'),
-        'mass at 1Hz':             D('7.3724973238127079e-51'),
-        'h_bar':                   D('1.054571817e-34'),
-        'Gravitational constant':  D('6.67430e-11'),
-        'Planck Length':           D('1.616255e-35'),
-        'Planck Time':             D('5.391247e-44'),
-        'Planck Mass':             D('2.176434e-8'),
-        'Planck Charge':           D('1.875545e-18'),
-        'Planck Temperature':      D('1.416784e32'),
-        "Planck angular momentum": D('1.054571817e-34'),
-        'Planck momentum':         D('6.5249'),
-        'Planck energy':           D('1.9561e+09'),
-        'Planck force':            D('1.2103e+44'),
-        'Planck power':            D('3.6283e+52'),
-        'Planck density':          D('5.1550e+96'),
-        'Planck area':             D('2.6121e-70'),
-        'Planck volume':           D('4.2217e-105'),
-        'Planck acceleration':     D('5.5608e+51'),
-        'Planck pressure':         D('4.6332e+113'),
-        'Bolzmann Temperature':    D('1.380649e-23'),
-        'Epsilon_0 Temperature':   D('8.854187817e-12'),
-        'Fine Structure Constant': D('0.0072973525693'),
-        'Gas Constant R':          D('8.31446261815324'),
-        'Stefan-Boltzmann':        D('5.670374419e-8'),
-        'von Klitzing RK':         D('25812.807'),
-        'Josephson constant':      D('483597.8484e9'), 
-        'conductance quantum':     D('7.748091729e-5'), # S
-        'first radiation':         D('3.741771852e-16'), # W⋅m
-        'first radiation sr':      D('1.191042972e-16'), # W⋅m2⋅sr−1	
-        'second radiation':        D('1.438776877e-2'), # m⋅K
-        'magnetic flux quantum':   D('2.067833848e-15'), # Wb
-        'Rydberg constant':        D('10973731.568157'), # m^−1
-        'vacuum magnetic permeability':  D('1.25663706127e-6'), # N⋅A−2
-        'permittivity':            D('1.112650056e-10'), # F m−1
-        'character impedance vacuum': D('376.730313412'), # Ω
-        'quantum of circulation':   D('3.6369475467e-4'), # m2⋅s−1	
-        'Bohr magneton':            D('9.2740100657e-24'), # J⋅T−1
-        'nuclear magneton':         D('5.0507837393e-27'), # J⋅T−1
-        'classical electron radius':D('2.8179403205e-15'), # m
-        'Thomson cross section':    D('6.6524587051e-29'), # m^2
-        'Bohr radius':              D('5.29177210544e-11'), # m
-        'Hartree energy':           D('4.3597447222060e-18'), # J
-        'cosmological' :            D('1.089e-52'),
-        #'Fermi coupling constant':  D('1.1663787e−5'), # GeV−2	
+        'hc':                      known('hc'),        # J⋅m
+        'Planck constant E at 1Hz':known('h'),         # J⋅s
+        'momentum at 1Hz':         known('p_1Hz'),     # kg⋅m⋅s−1 at 1 Hz
+        'mass at 1Hz':             known('m_1Hz'),     # kg⋅s
+        'h_bar':                   known('hbar'),      # J⋅s
+        'Gravitational constant':  known('G'),         # m3⋅kg−1⋅s−2
+        'Planck Length':           known('l_P'),       # m
+        'Planck Time':             known('t_P'),       # s
+        'Planck Mass':             known('m_P'),       # kg
+        'Planck Charge':           known('q_P'),       # C
+        'Planck Temperature':      known('T_P'),       # K
+        "Planck angular momentum": known('hbar'),      # J⋅s
+        'Planck momentum':         known('p_P'),       # kg⋅m⋅s−1
+        'Planck energy':           known('E_P'),       # J
+        'Planck force':            known('F_P'),       # N
+        'Planck power':            known('P_P'),       # W
+        'Planck density':          known('rho_P'),     # kg⋅m−3
+        'Planck area':             known('A_P'),       # m2
+        'Planck volume':           known('V_P'),       # m3
+        'Planck acceleration':     known('a_P'),       # m⋅s−2
+        'Planck pressure':         known('pres_P'),    # Pa
+        'Bolzmann Temperature':    known('k_B'),       # J⋅K−1
+        'Epsilon_0 Temperature':   known('epsilon_0'), # F⋅m−1
+        'Fine Structure Constant': known('alpha'),     # dimensionless
+        'Gas Constant R':          known('R'),         # J⋅mol−1⋅K−1
+        'Stefan-Boltzmann':        known('sigma'),     # W⋅m−2⋅K−4
+        'von Klitzing RK':         known('R_K'),       # Ω
+        'Josephson constant':      known('K_J'),       # Hz⋅V−1
+        'conductance quantum':     known('G_0'),       # S
+        'first radiation':         known('c_1'),       # W⋅m2
+        'first radiation sr':      known('c_1L'),      # W⋅m2⋅sr−1
+        'second radiation':        known('c_2'),       # m⋅K
+        'magnetic flux quantum':   known('Phi_0'),     # Wb
+        'Rydberg constant':        known('R_inf'),     # m−1
+        'vacuum magnetic permeability':known('mu_0'),  # N⋅A−2
+        'permittivity':            known('eps_au'),    # F⋅m−1
+        'character impedance vacuum':known('Z_0'),     # Ω
+        'quantum of circulation':  known('h/2m_e'),    # m2⋅s−1
+        'Bohr magneton':           known('mu_B'),      # J⋅T−1
+        'nuclear magneton':        known('mu_N'),      # J⋅T−1
+        'classical electron radius':known('r_e'),      # m
+        'Thomson cross section':   known('sigma_e'),   # m2
+        'Bohr radius':             known('a_0'),       # m
+        'Hartree energy':          known('E_h'),       # J
+        'cosmological':            known('Lambda'),    # m−2
+        #'Fermi coupling constant':  D('1.1663787e−5'), # GeV−2
     }
 
     calcs = {
@@ -284,8 +278,19 @@ def validate_planck_units(s_length, s_mass, s_temp, s_charge) -> Dict[str, Tuple
 
     return results
 
-if __name__ == "__main__":
-    s_length, s_mass, s_temp, s_charge  = calculate_unit_scaling()
+_variants = Variants(calculate_unit_scaling, validate_planck_units)
+
+validate_planck_units_compiled      = _variants.compiled
+validate_planck_units_adaptive      = _variants.adaptive
+validate_planck_units_sensitivities = _variants.sensitivities
+validate_planck_units_uncertainty   = _variants.uncertainty
+validate_planck_units_reactive      = _variants.reactive
+validate_planck_units_profile       = _variants.profile
+
+def main(calculate=calculate_unit_scaling, validate=validate_planck_units_compiled, prec=PRECISION):
+    """Print the unit scalings and every constant recreated from them, at prec digits."""
+    getcontext().prec = prec
+    s_length, s_mass, s_temp, s_charge  = calculate()
     # Print the result with high precision
     print(f"s_length: {s_length:.50e} m    length unit scaling")
     print(f"s_mass  : {s_mass:.50e} kg   mass unit scaling")
@@ -297,7 +302,7 @@ if __name__ == "__main__":
 
     
     # Validate Planck units
-    planck_results = validate_planck_units(s_length, s_mass, s_temp, s_charge)
+    planck_results = validate(s_length, s_mass, s_temp, s_charge)
     
     print("\nPlanck Units Validation:")
     print(f"{'Name':<28} | {'Expected':<20} | {'Calculated':<22} | {'Rel Error'}")
@@ -307,3 +312,6 @@ if __name__ == "__main__":
     #for name, (expected, calculated, error, ratio) in planck_results.items():
         print(f"{name:<28} | {expected:<20} | {calculated:<22.16e} | {error:<12.6e} ")
         #print(f"{name:<28} | {expected:<20} | {calculated:<22.16e} | {error:<12.6e} | {ratio:.6e}")
+
+if __name__ == "__main__":
+    main()
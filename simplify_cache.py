@@ -0,0 +1,150 @@
+import ast
+import hashlib
+import os
+import shutil
+
+import sympy
+from sympy import Basic, simplify, srepr
+
+'''
+    On disk cache for sympy simplify().
+
+    simplify() is by far the slowest step of simplifyconstantformulas.py,
+    and every run redoes every formula.  cached_simplify(expr, subs) does
+    expr.subs(subs) followed by simplify(), and stores the result under a
+    key made from the srepr() of the expression and of the substitutions.
+    srepr() spells out the whole expression tree including the symbol
+    assumptions, so equal keys mean equal inputs.  Running the rewrites
+    again after adding a formula only simplifies the new one.  lookup()
+    and store() are the two halves, for callers that run simplify()
+    themselves, under a time limit say.
+
+    Entries are small text files holding the srepr() of the result,
+    written to a temporary name and renamed into place, so several
+    processes can share the cache.  They live in a directory per sympy
+    version, since another version can simplify to another form; the
+    directories of other versions are removed the first time the cache is
+    written to.
+
+    The files are not evaluated.  load() walks the parsed srepr() and
+    only calls sympy classes, and the undefined functions of Function(),
+    with literal arguments, so a file that holds anything else reads as a
+    miss rather than running code.
+'''
+
+CACHE_DIR = os.environ.get('SIMPLIFY_CACHE', os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '.simplify_cache'))
+
+stats = {'hits': 0, 'misses': 0}
+_pruned = False
+_basic = None
+
+
+def _version_dir(cache_dir):
+    return os.path.join(cache_dir, f"sympy-{sympy.__version__}")
+
+
+def cache_key(expr, subs=None) -> str:
+    """sha256 of the srepr of expr and of the substitutions, in order."""
+    parts = [srepr(expr)]
+    for old, new in (subs.items() if hasattr(subs, 'items') else subs or ()):
+        parts.append(f"{srepr(old)} -> {srepr(new)}")
+    return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()
+
+
+def _classes():
+    """Every sympy class by name, ExprCondPair and the like are not in the sympy namespace."""
+    global _basic
+    if _basic is None:
+        _basic, stack = {}, [Basic]
+        while stack:
+            cls = stack.pop()
+            _basic.setdefault(cls.__name__, cls)
+            stack.extend(cls.__subclasses__())
+    return _basic
+
+
+def _node(tree):
+    """The sympy object a parsed srepr() node spells, or ValueError for anything else."""
+    if isinstance(tree, ast.Constant) and isinstance(tree.value, (int, float, str, bool, type(None))):
+        return tree.value
+    if isinstance(tree, ast.UnaryOp) and isinstance(tree.op, ast.USub):
+        value = _node(tree.operand)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return -value
+    if isinstance(tree, (ast.Tuple, ast.List)):
+        return tuple(_node(element) for element in tree.elts)
+    if isinstance(tree, ast.Name):
+        value = getattr(sympy, tree.id, None)
+        if isinstance(value, Basic) or value is sympy.Function:
+            return value
+        value = _classes().get(tree.id)
+        if value is not None:
+            return value
+    if isinstance(tree, ast.Call):
+        func = _node(tree.func)
+        if callable(func):
+            return func(*(_node(arg) for arg in tree.args),
+                        **{kw.arg: _node(kw.value) for kw in tree.keywords if kw.arg})
+    raise ValueError(f"not a sympy srepr: {ast.dump(tree)[:80]}")
+
+
+def load(text):
+    """The sympy expression of an srepr() string, built without evaluating the text."""
+    return _node(ast.parse(text.strip(), mode='eval').body)
+
+
+def _prune(cache_dir):
+    """Remove the entries of other sympy versions."""
+    global _pruned
+    _pruned = True
+    keep = os.path.basename(_version_dir(cache_dir))
+    for name in os.listdir(cache_dir):
+        if name.startswith('sympy-') and name != keep:
+            shutil.rmtree(os.path.join(cache_dir, name), ignore_errors=True)
+
+
+def _path(expr, subs, cache_dir):
+    return os.path.join(_version_dir(cache_dir or CACHE_DIR), cache_key(expr, subs) + '.txt')
+
+
+def lookup(expr, subs=None, cache_dir=None):
+    """The cached simplify(expr.subs(subs)), or None on a miss."""
+    try:
+        with open(_path(expr, subs, cache_dir), encoding='utf-8') as f:
+            result = load(f.read())
+        stats['hits'] += 1
+        return result
+    except (OSError, SyntaxError, TypeError, ValueError, sympy.SympifyError):
+        stats['misses'] += 1                   # missing or unreadable, recompute
+        return None
+
+
+def store(expr, subs, result, cache_dir=None):
+    """Remember result as simplify(expr.subs(subs))."""
+    cache_dir = cache_dir or CACHE_DIR
+    path = _path(expr, subs, cache_dir)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if not _pruned:
+            _prune(cache_dir)
+        temp = f"{path}.{os.getpid()}.tmp"
+        with open(temp, 'w', encoding='utf-8') as f:
+            f.write(srepr(result))
+        os.replace(temp, path)
+    except OSError:
+        pass                                   # read only checkout, just don't cache
+
+
+def cached_simplify(expr, subs=None, cache_dir=None):
+    """simplify(expr.subs(subs)), remembered on disk."""
+    result = lookup(expr, subs, cache_dir)
+    if result is None:
+        result = simplify(expr.subs(subs) if subs else expr)
+        store(expr, subs, result, cache_dir)
+    return result
+
+
+def clear(cache_dir=None):
+    """Remove every cached result."""
+    shutil.rmtree(cache_dir or CACHE_DIR, ignore_errors=True)
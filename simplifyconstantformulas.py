@@ -1,83 +1,73 @@
-from sympy import symbols, sqrt, pi, simplify,Mul
+def rewrites():
+    """(title, symbol, original, simplified) for every formula, rewritten with the unit scalings."""
+    from sympy import symbols, sqrt, pi, simplify,Mul
+    from simplify_cache import cached_simplify
 
-# Define symbols
-m, f_m, f_T, T, c, f, e = symbols("m f_m f_T T c f e", positive=True)
-h, k, λ_max = symbols("h k λ_max")  # Planck's constant and Boltzmann's constant
+    results = []
 
-# Define modular unit scaling factors
-Hz_kg, kg_J = symbols("Hz_kg kg_J", positive=True)
-K_Hz = symbols("K_Hz", positive=True)
-two_pi = symbols("2*pi")
+    # Define symbols
+    m, f_m, f_T, T, c, f, e = symbols("m f_m f_T T c f e", positive=True)
+    h, k, λ_max = symbols("h k λ_max")  # Planck's constant and Boltzmann's constant
 
-#two_pi = Mul(2,pi,evaluate=False)
-# Define original thermal de Broglie wavelength formula
-λ_th = h / sqrt(two_pi * m *  T * k)
+    # Define modular unit scaling factors
+    Hz_kg, kg_J = symbols("Hz_kg kg_J", positive=True)
+    K_Hz = symbols("K_Hz", positive=True)
+    two_pi = symbols("2*pi")
 
-# Substitute h and k with modular scaling factors
-λ_th_simplified = λ_th.subs({h: Hz_kg * kg_J, k: K_Hz * Hz_kg * kg_J, m:f_m * Hz_kg, T:f_T/K_Hz, kg_J: c**2 })
+    #two_pi = Mul(2,pi,evaluate=False)
+    # Define original thermal de Broglie wavelength formula
+    λ_th = h / sqrt(two_pi * m *  T * k)
 
-# Further simplification
-λ_th_simplified = simplify(λ_th_simplified)
-λ_th_simplified = simplify(λ_th_simplified)
+    # Substitute h and k with modular scaling factors
+    # and simplify, results are cached on disk, see simplify_cache.py
+    λ_th_simplified = cached_simplify(λ_th, {h: Hz_kg * kg_J, k: K_Hz * Hz_kg * kg_J, m:f_m * Hz_kg, T:f_T/K_Hz, kg_J: c**2 })
 
-# Print result
-print()
-print("Thermal de Broglie Wavelength:")
-print("Original:   λ_th =", λ_th)
-print("Simplified: λ_th =", λ_th_simplified)
-print()
+    # Further simplification
+    λ_th_simplified = cached_simplify(λ_th_simplified)
 
-σ = 2*pi**5*k**4 / (15*h**3*c**2)
-σ_simplified = σ.subs({h: Hz_kg * c**2, k: K_Hz * Hz_kg * c**2 })
-σ_simplified = simplify(σ_simplified)
+    results.append(("Thermal de Broglie Wavelength", "λ_th", λ_th, λ_th_simplified))
 
-print("Stephan-Boltzmann Formula:")
-print("Original:   σ =", σ)
-print("Simplified: σ =", σ_simplified)
-print()
+    σ = 2*pi**5*k**4 / (15*h**3*c**2)
+    σ_simplified = cached_simplify(σ, {h: Hz_kg * c**2, k: K_Hz * Hz_kg * c**2 })
 
-planck_law = ((2 * h * f**3)/c**2)*(1/(e**((h*f)/(k * T))-1))
-planck_law_simplified = planck_law.subs({h: Hz_kg * c**2, k: K_Hz * Hz_kg * c**2 })
-planck_law_simplified = simplify(planck_law_simplified)
+    results.append(("Stephan-Boltzmann Formula", "σ", σ, σ_simplified))
 
-print("Planck law Formula:")
-print("Original:   B(f T) =", planck_law)
-print("Simplified: B(f T) =", planck_law_simplified)
-print()
+    planck_law = ((2 * h * f**3)/c**2)*(1/(e**((h*f)/(k * T))-1))
+    planck_law_simplified = cached_simplify(planck_law, {h: Hz_kg * c**2, k: K_Hz * Hz_kg * c**2 })
 
-λ_max = symbols("λ_max")
+    results.append(("Planck law Formula", "B(f T)", planck_law, planck_law_simplified))
 
-x_peak = h*c / (λ_max * k*T)
-x_peak_simplified = x_peak.subs({h: Hz_kg * c**2, k: K_Hz * Hz_kg * c**2 })
-x_peak_simplified = simplify(x_peak_simplified)
+    λ_max = symbols("λ_max")
 
-print("Wien's Displacement Constant:")
-print("Original:   x_peak =", x_peak)
-print("Simplified: x_peak =", x_peak_simplified)
-print()
+    x_peak = h*c / (λ_max * k*T)
+    x_peak_simplified = cached_simplify(x_peak, {h: Hz_kg * c**2, k: K_Hz * Hz_kg * c**2 })
 
-Θ_D, Θ_E, Hz_K, ν_D, ν_E  = symbols("Θ_D Θ_E Hz_K ν_D ν_E")
+    results.append(("Wien's Displacement Constant", "x_peak", x_peak, x_peak_simplified))
 
-Θ_D = h * ν_D / k 
-Θ_D_simplified = Θ_D.subs({h: Hz_kg * c**2, k: K_Hz * Hz_kg * c**2 })
-Θ_D_simplified = simplify(Θ_D_simplified)
-Θ_D_simplified = Θ_D_simplified.subs({K_Hz: 1/Hz_K})
-Θ_D_simplified = simplify(Θ_D_simplified)
+    Θ_D, Θ_E, Hz_K, ν_D, ν_E  = symbols("Θ_D Θ_E Hz_K ν_D ν_E")
 
-print("Debye Temperature:")
-print("Original:   Θ_D =", Θ_D)
-print("Simplified: Θ_D =", Θ_D_simplified)
-print()
+    Θ_D = h * ν_D / k
+    Θ_D_simplified = cached_simplify(Θ_D, {h: Hz_kg * c**2, k: K_Hz * Hz_kg * c**2 })
+    Θ_D_simplified = cached_simplify(Θ_D_simplified, {K_Hz: 1/Hz_K})
 
-Θ_E = h * ν_E / k
-Θ_E_simplified = Θ_E.subs({h: Hz_kg * c**2, k: K_Hz * Hz_kg * c**2 })
-Θ_E_simplified = simplify(Θ_E_simplified)
-Θ_E_simplified = Θ_E_simplified.subs({K_Hz: 1/Hz_K})
-Θ_E_simplified = simplify(Θ_E_simplified)
+    results.append(("Debye Temperature", "Θ_D", Θ_D, Θ_D_simplified))
 
-print("Einstein Temperature:")
-print("Original:   Θ_E =", Θ_E)
-print("Simplified: Θ_E =", Θ_E_simplified)
-print()
+    Θ_E = h * ν_E / k
+    Θ_E_simplified = cached_simplify(Θ_E, {h: Hz_kg * c**2, k: K_Hz * Hz_kg * c**2 })
+    Θ_E_simplified = cached_simplify(Θ_E_simplified, {K_Hz: 1/Hz_K})
 
+    results.append(("Einstein Temperature", "Θ_E", Θ_E, Θ_E_simplified))
 
+    return results
+
+def main():
+    # Print result
+    print()
+    for title, symbol, original, simplified in rewrites():
+        print(f"{title}:")
+        print(f"Original:   {symbol} =", original)
+        print(f"Simplified: {symbol} =", simplified)
+        print()
+
+if __name__ == "__main__":
+    main()
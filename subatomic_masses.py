@@ -1,38 +1,37 @@
 from decimal import Decimal as D, getcontext
-
-# Set precision
-getcontext().prec = 50
+from constants_registry import known
 
 # Constants
-h = D('6.62607015e-34')  # Planck's constant (J·s)
-c = D('299792458.0')     # Speed of light (m/s)
-e = D('1.602176634e-19') # Elementary charge (C)
-m_e = D('9.1093837015e-31')  # Electron mass (kg)
-m_p = D('1.67262192369e-27') # Proton mass (kg)
-m_n = D('1.67492749804e-27') # Neutron mass (kg)
-m_P = D('2.176434e-8')       # Planck mass (kg)
-G = D('6.67430e-11')         # Gravitational constant (m³·kg⁻¹·s⁻²)
-
-# Calculate the mass of a photon at 1 Hz
-m_photon = h / c**2
+h = known('h')               # Planck's constant (J·s)
+c = known('c')               # Speed of light (m/s)
+e = known('e')               # Elementary charge (C)
+m_e = known('m_e')           # Electron mass (kg)
+m_p = known('m_p')           # Proton mass (kg)
+m_n = known('m_n')           # Neutron mass (kg)
+m_P = known('m_P')           # Planck mass (kg)
+G = known('G')               # Gravitational constant (m³·kg⁻¹·s⁻²)
 
 # List of masses to compare
-masses = {
-    "Photon at 1 Hz": m_photon,
-    "Electron mass": m_e,
-    "Proton mass": m_p,
-    "Neutron mass": m_n,
-    "Planck mass": m_P,
-}
+def particle_masses():
+    # Calculate the mass of a photon at 1 Hz
+    m_photon = h / c**2
+    return {
+        "Photon at 1 Hz": m_photon,
+        "Electron mass": m_e,
+        "Proton mass": m_p,
+        "Neutron mass": m_n,
+        "Planck mass": m_P,
+    }
 
 # Accepted energy values in eV (from established physics)
-accepted_energy_eV = {
-    "Photon at 1 Hz": D('4.135667696e-15'),  # Energy of a 1 Hz photon
-    "Electron mass": D('5.109989500e5'),     # 511 keV
-    "Proton mass": D('9.382720882e8'),       # 938.272 MeV
-    "Neutron mass": D('9.395654205e8'),      # 939.565 MeV
-    "Planck mass": D('1.220889936e28'),      # Planck energy
-}
+def accepted_energies():
+    return {
+        "Photon at 1 Hz": known('h_eV'),                  # Energy of a 1 Hz photon
+        "Electron mass": known('m_e_MeV') * D('1e6'),     # 511 keV
+        "Proton mass": known('m_p_MeV') * D('1e6'),       # 938.272 MeV
+        "Neutron mass": known('m_n_MeV') * D('1e6'),      # 939.565 MeV
+        "Planck mass": known('m_P_eV'),                   # Planck energy
+    }
 
 # Function to compare masses and calculate ratios, frequencies, and energies
 def compare_masses(masses, reference_mass, accepted_energy_eV):
@@ -46,18 +45,30 @@ def compare_masses(masses, reference_mass, accepted_energy_eV):
         results[name] = (mass, ratio, frequency, energy_joules, energy_eV, accepted_eV)
     return results
 
-# Compare masses to the photon mass at 1 Hz
-results = compare_masses(masses, m_photon, accepted_energy_eV)
-
-# Print results
-print()
-print()
-print(f"Mass of a photon at 1 Hz: {m_photon:.10e} kg")
-print(f"Quantum of relative mass: {m_photon:.10e} kg s")
-print()
-print(f"{'Particle':<15} | {'kg':<14} | {'kg/kgs Hz':<14} | {'J':<14} | {'eV':<14} | {'Accepted eV':<14}")
-print("-" * 120)
-for name, (mass, ratio, frequency, energy_joules, energy_eV, accepted_eV) in results.items():
-    print(f"{name:<15} | {mass:<14.8e} | {ratio:<14.8e} | {energy_joules:<14.8e} | {energy_eV:<14.8e} | {accepted_eV:<14.8e}")
-print()
-print()
+def main(prec=50):
+    """Print every mass as a frequency and an energy next to the accepted energy."""
+    # Set precision
+    getcontext().prec = prec
+
+    masses = particle_masses()
+    m_photon = masses["Photon at 1 Hz"]
+    accepted_energy_eV = accepted_energies()
+
+    # Compare masses to the photon mass at 1 Hz
+    results = compare_masses(masses, m_photon, accepted_energy_eV)
+
+    # Print results
+    print()
+    print()
+    print(f"Mass of a photon at 1 Hz: {m_photon:.10e} kg")
+    print(f"Quantum of relative mass: {m_photon:.10e} kg s")
+    print()
+    print(f"{'Particle':<15} | {'kg':<14} | {'kg/kgs Hz':<14} | {'J':<14} | {'eV':<14} | {'Accepted eV':<14}")
+    print("-" * 120)
+    for name, (mass, ratio, frequency, energy_joules, energy_eV, accepted_eV) in results.items():
+        print(f"{name:<15} | {mass:<14.8e} | {ratio:<14.8e} | {energy_joules:<14.8e} | {energy_eV:<14.8e} | {accepted_eV:<14.8e}")
+    print()
+    print()
+
+if __name__ == "__main__":
+    main()
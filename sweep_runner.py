@@ -0,0 +1,179 @@
+import importlib
+import json
+import os
+import struct
+from multiprocessing import Pool
+from typing import Dict, Iterator, NamedTuple
+
+import numpy as np
+
+'''
+    Parameter sweeps for simple_redefine_h.py and redefine_g.py.
+
+    run_hc_calculations() and run_Gc_calculations() print about eight lines
+    for every target and unit, which is fine for a handful of targets and
+    useless for a million.  This runner sweeps a range of target hc or Gc
+    values through the same adjust_m/kg/s_and_calculate() functions, but
+
+      - the range is cut into shards that run on a process pool, one shard
+        is a numpy array of targets for one unit, and the adjust functions
+        work on it unchanged since they are written with numpy
+      - each finished shard is appended to the output file straight away,
+        nothing is collected in a results list
+
+        python sweep_runner.py hc 1e-30 1e-20 1000000 hc.sweep
+        python sweep_runner.py Gc 1e-3 1e3 1000000 gc.sweep --linear
+
+    The output is columnar: a small header, then one block per shard with
+    each column stored contiguously, so a column can be read without
+    touching the others.
+
+        header    b'SWP1', u32 length, that many bytes of json describing
+                  the sweep and the columns
+        block     u64 row count, then every column as raw little endian
+                  values in the order of the header
+'''
+
+_MAGIC = b'SWP1'
+_LENGTH = struct.Struct('<I')
+_ROWS = struct.Struct('<Q')
+
+UNITS = ('m', 'kg', 's')
+
+
+class Sweep(NamedTuple):
+    module:  str        # where the adjust_*_and_calculate functions live
+    initial: str        # the other constant, h or G
+    current: str        # its product with c before any rescaling
+
+
+SWEEPS = {
+    'hc': Sweep('simple_redefine_h', 'initial_h', 'current_hc'),
+    'Gc': Sweep('redefine_g', 'initial_G', 'current_Gc'),
+}
+
+
+def columns(kind):
+    """(name, dtype) of every column of a sweep of kind."""
+    other = SWEEPS[kind].initial.split('_')[1]
+    return [('target', '<f8'), ('unit', '<u1'), ('adjustment', '<f8'),
+            ('final_c', '<f8'), (f'final_{other}', '<f8'), ('relative_difference', '<f8')]
+
+
+def targets(first, last, count, lo, hi, linear=False):
+    """Targets lo..hi of count values from first to last, spaced evenly in log or linearly."""
+    i = np.arange(lo, hi, dtype=np.float64)
+    step = i / (count - 1) if count > 1 else i * 0
+    if linear:
+        return first + (last - first) * step
+    return np.exp(np.log(first) + (np.log(last) - np.log(first)) * step)
+
+
+def _run_shard(task):
+    kind, unit, first, last, count, lo, hi, linear = task
+    sweep = SWEEPS[kind]
+    module = importlib.import_module(sweep.module)
+    initial, initial_c = getattr(module, sweep.initial), module.initial_c
+    current = getattr(module, sweep.current)
+
+    target = targets(first, last, count, lo, hi, linear)
+    adjust = getattr(module, f'adjust_{unit}_and_calculate')
+    adjustment, final, final_c = (np.broadcast_to(x, target.shape).astype(np.float64)
+                                  for x in adjust(initial, initial_c, target))
+
+    # the scripts leave the units alone when the target is already met
+    same = target == current
+    adjustment[same], final[same], final_c[same] = 1, initial, initial_c
+
+    relative_difference = np.abs(final * final_c - target) / target
+    return (target, np.full(target.shape, UNITS.index(unit), dtype=np.uint8),
+            adjustment, final_c, final, relative_difference)
+
+
+def run_sweep(kind, first, last, count, path, linear=False, workers=None, shard_size=1 << 16):
+    """
+    Sweep count targets of kind ('hc' or 'Gc') through every unit and
+    stream the results to path.  Returns the number of rows written.
+    """
+    if kind not in SWEEPS:
+        raise ValueError(f"unknown sweep {kind!r}, expected one of {', '.join(SWEEPS)}")
+    tasks = [(kind, unit, first, last, count, lo, min(lo + shard_size, count), linear)
+             for unit in UNITS for lo in range(0, count, shard_size)]
+    header = json.dumps({
+        'kind': kind, 'first': first, 'last': last, 'count': count, 'linear': linear,
+        'units': UNITS, 'columns': columns(kind),
+    }).encode('utf-8')
+
+    rows = 0
+    with open(path, 'wb') as out, Pool(workers or os.cpu_count()) as pool:
+        out.write(_MAGIC + _LENGTH.pack(len(header)) + header)
+        for block in pool.imap(_run_shard, tasks):
+            out.write(_ROWS.pack(len(block[0])))
+            for (_, dtype), column in zip(columns(kind), block):
+                out.write(column.astype(dtype, copy=False).tobytes())
+            rows += len(block[0])
+    return rows
+
+
+def read_header(path) -> Dict:
+    with open(path, 'rb') as f:
+        if f.read(4) != _MAGIC:
+            raise ValueError(f"{path} is not a sweep file")
+        length, = _LENGTH.unpack(f.read(_LENGTH.size))
+        return json.loads(f.read(length))
+
+
+def iter_blocks(path, names=None) -> Iterator[Dict[str, np.ndarray]]:
+    """The blocks of a sweep file one at a time, optionally just some columns."""
+    header = read_header(path)
+    data = np.memmap(path, dtype=np.uint8, mode='r')
+    offset = 4 + _LENGTH.size + _LENGTH.unpack(bytes(data[4:8]))[0]
+    while offset < len(data):
+        count, = _ROWS.unpack(bytes(data[offset:offset + _ROWS.size]))
+        offset += _ROWS.size
+        block = {}
+        for name, dtype in header['columns']:
+            size = np.dtype(dtype).itemsize * count
+            if names is None or name in names:
+                block[name] = data[offset:offset + size].view(dtype)
+            offset += size
+        yield block
+
+
+def read_sweep(path, names=None) -> Dict[str, np.ndarray]:
+    """Whole columns of a sweep file."""
+    blocks = list(iter_blocks(path, names))
+    if not blocks:
+        return {}
+    return {name: np.concatenate([b[name] for b in blocks]) for name in blocks[0]}
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Sweep target hc or Gc values through m, kg and s.")
+    parser.add_argument('kind', choices=sorted(SWEEPS))
+    parser.add_argument('first', type=float)
+    parser.add_argument('last', type=float)
+    parser.add_argument('count', type=int)
+    parser.add_argument('path')
+    parser.add_argument('--linear', action='store_true', help="linear instead of log spacing")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--shard-size', type=int, default=1 << 16)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rows = run_sweep(args.kind, args.first, args.last, args.count, args.path,
+                     args.linear, args.workers, args.shard_size)
+    elapsed = time.perf_counter() - start
+    print(f"{rows} rows in {elapsed:.2f} s ({rows / elapsed:.3e} rows/s) -> {args.path}")
+
+    worst = {}
+    for block in iter_blocks(args.path, ('unit', 'relative_difference')):
+        for code, unit in enumerate(UNITS):
+            diff = block['relative_difference'][block['unit'] == code]
+            if len(diff):
+                worst[unit] = max(worst.get(unit, 0.0), float(diff.max()))
+    for unit, diff in worst.items():
+        print(f"  {unit:<3} max relative difference: {diff:.3e}")
@@ -0,0 +1,9 @@
+import os
+import sys
+
+'''
+    The modules of this repo are scripts at its top level, not a package,
+    so the tests import them from there.
+'''
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
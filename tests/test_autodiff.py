@@ -0,0 +1,78 @@
+import types
+from decimal import Decimal as D, localcontext
+
+import pytest
+
+import autodiff
+import constants_framework
+import simplified_plancks_constants
+from constants_registry import known
+from formula_compiler import compile_validation
+
+'''
+    Dual number partials of the frameworks against central finite
+    differences, both in Decimal, and one elasticity known by hand.
+'''
+
+PREC = 60
+STEP = D('1e-20')
+
+
+def _calculate(module, symbol, factor):
+    """Every calculated constant of module with the reference value of symbol times factor."""
+    value = known(symbol) * factor
+    namespace = dict(vars(module), known=lambda key: value if key == symbol else known(key))
+    if autodiff._GLOBALS.get(symbol) in namespace:
+        namespace[autodiff._GLOBALS[symbol]] = value
+    scaling = types.FunctionType(module.calculate_unit_scaling.__code__, namespace)()
+    compiled = compile_validation(module.validate_planck_units, namespace)
+    return dict(zip(compiled.names, compiled.calculate(*scaling)))
+
+
+@pytest.mark.parametrize('module', [constants_framework, simplified_plancks_constants],
+                         ids=lambda m: m.__name__)
+def test_partials_match_central_differences(module):
+    with localcontext() as ctx:
+        ctx.prec = PREC
+        result = autodiff.sensitivities(module.calculate_unit_scaling, module.validate_planck_units)
+        inputs = list(next(iter(result.values())).partials)
+        assert 'h' in inputs and 'G' in inputs
+        for symbol in inputs:
+            up = _calculate(module, symbol, 1 + STEP)
+            down = _calculate(module, symbol, 1 - STEP)
+            for name, sensitivity in result.items():
+                if not sensitivity.value:
+                    continue
+                # d ln value / d ln input, the partial scaled to the size of both
+                estimate = (up[name] - down[name]) / (2 * STEP * sensitivity.value)
+                assert abs(estimate - sensitivity.elasticities[symbol]) < D('1e-30'), (name, symbol)
+
+
+def test_planck_length_elasticities():
+    with localcontext() as ctx:
+        ctx.prec = PREC
+        result = autodiff.sensitivities(constants_framework.calculate_unit_scaling,
+                                        constants_framework.validate_planck_units)
+        result = {name.strip(): s for name, s in result.items()}
+        elasticities = result['Planck Length'].elasticities
+        assert abs(elasticities['h'] - D('0.5')) < D('1e-50')
+        assert abs(elasticities['G'] - D('0.5')) < D('1e-50')
+        assert abs(elasticities['c'] + D('1.5')) < D('1e-50')
+
+
+def test_float_kind():
+    result = autodiff.sensitivities(constants_framework.calculate_unit_scaling,
+                                    constants_framework.validate_planck_units, wrt=('h', 'G'),
+                                    kind=float)
+    result = {name.strip(): s for name, s in result.items()}
+    length = result['Planck Length']
+    assert isinstance(length.value, float)
+    assert length.elasticities['h'] == pytest.approx(0.5, rel=1e-12)
+    assert length.elasticities['G'] == pytest.approx(0.5, rel=1e-12)
+
+
+def test_dual_power_rule():
+    x = autodiff.Dual(D(3), (D(1),))
+    y = x ** D(2) / x.sqrt()
+    assert abs(y.value - D(3) ** D('1.5')) < D('1e-25')
+    assert abs(y.grad[0] - D('1.5') * D(3).sqrt()) < D('1e-25')
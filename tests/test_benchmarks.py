@@ -0,0 +1,69 @@
+import json
+import os
+import subprocess
+import sys
+
+import benchmarks
+
+'''
+    One quick benchmark case end to end, and the json it writes, against
+    the same schema as the committed baseline.
+'''
+
+CASE = 'framework[module=constants_framework,validate=compiled,prec=28]'
+RESULT_KEYS = {'number', 'repeat', 'min', 'median', 'mean', 'stdev', 'times', 'group', 'params'}
+MACHINE_KEYS = {'platform', 'machine', 'processor', 'cpu_count', 'python', 'implementation',
+                'libmpdec', 'numpy', 'sympy', 'commit', 'date'}
+
+
+def _check_schema(document):
+    assert set(document) == {'machine', 'results'}
+    assert set(document['machine']) == MACHINE_KEYS
+    for name, result in document['results'].items():
+        assert set(result) == RESULT_KEYS, name
+        assert len(result['times']) == result['repeat']
+        assert 0 < result['min'] <= result['median'] <= max(result['times'])
+        assert result['number'] >= 1
+
+
+def test_run_one_case():
+    document = benchmarks.run([CASE], repeat=2, min_time=0.001)
+    assert list(document['results']) == [CASE]
+    _check_schema(json.loads(json.dumps(document)))
+    result = document['results'][CASE]
+    assert result['group'] == 'framework'
+    assert result['params'] == {'module': 'constants_framework', 'validate': 'compiled', 'prec': 28}
+
+
+def test_baseline_covers_every_case():
+    with open(benchmarks.BASELINE, encoding='utf-8') as f:
+        baseline = json.load(f)
+    _check_schema(baseline)
+    assert set(baseline['results']) == {case.name for case in benchmarks.cases()}
+
+
+def test_compare_flags_regressions():
+    def document(medians):
+        return {'results': {name: {'median': m} for name, m in medians.items()}}
+
+    compared = {c.name: c for c in benchmarks.compare(document({'a': 1.2, 'b': 1.05, 'new': 1.0}),
+                                                      document({'a': 1.0, 'b': 1.0}), threshold=0.1)}
+    assert compared['a'].regressed and not compared['b'].regressed
+    assert compared['new'].baseline is None and not compared['new'].regressed
+
+
+def test_command_line(tmp_path):
+    out = tmp_path / 'run.json'
+    baseline = tmp_path / 'baseline.json'
+    command = [sys.executable, benchmarks.__file__, '-k', CASE, '--repeat', '2', '--min-time', '0.001',
+               '--baseline', str(baseline)]
+    done = subprocess.run(command + ['--update-baseline', '--out', str(out)],
+                          capture_output=True, text=True, timeout=120)
+    assert done.returncode == 0, done.stderr
+    with open(out, encoding='utf-8') as f:
+        _check_schema(json.load(f))
+    assert os.path.exists(baseline)
+
+    done = subprocess.run(command + ['--threshold', '100'], capture_output=True, text=True, timeout=120)
+    assert done.returncode == 0, done.stderr
+    assert '0 regression(s)' in done.stdout
@@ -0,0 +1,99 @@
+import os
+import shutil
+from decimal import Decimal as D, localcontext
+
+import numpy as np
+import pytest
+
+import codata_vintages as cv
+import constants_framework as cf
+from constants_registry import snapshot_path
+
+'''
+    Reading a NIST allascii.txt listing, on a short excerpt of the 2014
+    one, and running the frameworks against it.
+'''
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'allascii_small.txt')
+
+
+@pytest.fixture
+def listing(tmp_path):
+    """A copy of the excerpt, so its snapshot is written to tmp_path."""
+    return shutil.copy(DATA, tmp_path / 'allascii.txt')
+
+
+def test_number():
+    assert cv._number(' 6.674 08 e-11  ') == '6.67408e-11'
+    assert cv._number('8.854 187 817... e-12') == '8.854187817e-12'
+    assert cv._number('(exact)') == 'exact'
+
+
+def test_parse_allascii(listing):
+    rows = {row[0]: row for row in cv.parse_allascii(listing)}
+    assert len(rows) == 9
+    assert rows['Newtonian constant of gravitation'] == (
+        'Newtonian constant of gravitation', 'G', '6.67408e-11', '0.00031e-11', 'm^3 kg^-1 s^-2',
+        (3, -1, -2, 0, 0, 0, 0))
+    assert rows['speed of light in vacuum'][2:4] == ('299792458', 'exact')
+    # old names under the current one, the first of two rows with the same name kept
+    assert rows['vacuum electric permittivity'][1:4] == ('epsilon_0', '8.854187817e-12', 'exact')
+    assert rows['reduced Planck constant'][1] == 'hbar'
+    # not in the catalog, no symbol
+    assert rows['alpha particle-electron mass ratio'][1:5] == ('', '7294.29954136', '0.00000024', '')
+
+
+def test_not_a_listing(tmp_path):
+    path = tmp_path / 'empty.txt'
+    path.write_text("no constants here\n", encoding='utf-8')
+    with pytest.raises(ValueError, match='no constants'):
+        cv.parse_allascii(str(path))
+    assert cv.adjustment(str(path)) == 'empty'
+
+
+def test_vintage(listing):
+    vintage = cv.Vintage.open(str(listing))
+    assert vintage.label == cv.adjustment(listing) == '2014'
+    assert os.path.exists(snapshot_path(str(listing)))
+    assert vintage.known('G') == D('6.67408e-11')
+    assert vintage.known('Newtonian constant of gravitation') == D('6.67408e-11')
+    assert vintage.known('epsilon_0', float) == 8.854187817e-12
+    assert vintage.known('hc') == D('6.626070040e-34') * 299792458
+    assert vintage.fallbacks == set()
+    assert vintage.known('m_e') == cv.registry().value('m_e')
+    assert vintage.fallbacks == {'m_e'}
+
+
+def test_residual_matrix(listing):
+    with localcontext() as ctx:
+        ctx.prec = 50
+        catalog = cv.Vintage('catalog')
+        result = cv.residual_matrix([catalog, cv.Vintage.open(str(listing))],
+                                    ('constants_framework', 'simplified_plancks_constants'))
+        nominal = cf.validate_planck_units(*cf.calculate_unit_scaling())
+    assert result.vintages == ['catalog', '2014']
+    assert result.residuals.shape == (2, len(result.columns))
+    # the catalog row is what the framework gives on its own
+    for name, (expected, calculated, _) in nominal.items():
+        column = result.columns.index(f"constants_framework: {name.strip()}")
+        assert result.residuals[0, column] == pytest.approx(float((calculated - expected) / expected),
+                                                            rel=1e-12, abs=1e-30)
+    assert np.isfinite(result.residuals).all()
+    assert (result.residuals[0] != result.residuals[1]).any()
+    assert result.fallbacks['catalog'] == []
+
+
+def test_define_const_catalog_row(listing):
+    import define_const_from_units as dc
+
+    result = cv.residual_matrix([cv.Vintage('catalog'), cv.Vintage.open(str(listing))],
+                                ('define_const_from_units',))
+    # the ratios the script prints, against its own 2018 reference set
+    calculated = dc.derived_catalog().evaluate(**dict(zip(('kg', 's', 'm', 'K', 'C', 'A'),
+                                                          dc.calculate_base_units(dc.h, dc.c, dc.G))))
+    reference = dc.reference_values()
+    for j, column in enumerate(result.columns):
+        name = column.split(': ', 1)[1]
+        assert result.residuals[0, j] == calculated[name] / reference[name] - 1, name
+    G = result.residuals[:, result.columns.index('define_const_from_units: G')]
+    assert abs(G[0]) < 1e-12 and abs(G[1]) < 1e-12
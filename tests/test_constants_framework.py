@@ -0,0 +1,58 @@
+from decimal import Decimal as D, localcontext
+
+import numpy as np
+import pytest
+
+import constants_framework as cf
+
+'''
+    validate_planck_units_batch() against validate_planck_units(), one
+    candidate scaling set at a time.
+'''
+
+
+@pytest.fixture
+def candidates():
+    """The framework's own scalings with Hz_kg and t_Ph off by up to a percent."""
+    with localcontext() as ctx:
+        ctx.prec = cf.PRECISION
+        Hz_kg, K_Hz, C_kg, t_Ph, s_lum = cf.calculate_unit_scaling()
+    factors = np.array([1.0, 1.01, 0.99, 1.001])
+    return Hz_kg, K_Hz, C_kg, t_Ph, s_lum, factors
+
+
+def _reference(Hz_kg, K_Hz, C_kg, t_Ph, s_lum, factor):
+    with localcontext() as ctx:
+        ctx.prec = cf.PRECISION
+        return cf.validate_planck_units(Hz_kg * D(factor), K_Hz, C_kg, t_Ph / D(factor), s_lum)
+
+
+def test_float64_batch_matches_decimal(candidates):
+    Hz_kg, K_Hz, C_kg, t_Ph, s_lum, factors = candidates
+    batch = cf.validate_planck_units_batch(float(Hz_kg) * factors, float(K_Hz), float(C_kg),
+                                           float(t_Ph) / factors, float(s_lum), chunk_size=3)
+    assert batch.calculated.shape == (len(batch.names), len(factors))
+    for column, factor in enumerate(factors):
+        reference = _reference(Hz_kg, K_Hz, C_kg, t_Ph, s_lum, factor)
+        assert batch.names == list(reference)
+        for row, name in enumerate(batch.names):
+            exp_val, calc_val, rel_error = reference[name]
+            assert batch.expected[row] == pytest.approx(float(exp_val), rel=1e-15)
+            assert batch.calculated[row, column] == pytest.approx(float(calc_val), rel=1e-14), name
+            assert batch.rel_error[row, column] == pytest.approx(float(rel_error), rel=1e-6, abs=1e-14), name
+
+
+def test_decimal_batch_matches_compiled(candidates):
+    Hz_kg, K_Hz, C_kg, t_Ph, s_lum, factors = candidates
+    with localcontext() as ctx:
+        ctx.prec = 60
+        masses = [Hz_kg * D(f) for f in factors]
+        times = [t_Ph / D(f) for f in factors]
+    batch = cf.validate_planck_units_batch(masses, K_Hz, C_kg, times, s_lum, prec=60)
+    for column, (mass, time) in enumerate(zip(masses, times)):
+        with localcontext() as ctx:
+            ctx.prec = 60
+            reference = cf.validate_planck_units_compiled(mass, K_Hz, C_kg, time, s_lum)
+        for row, name in enumerate(batch.names):
+            assert batch.calculated[row, column] == reference[name][1], name
+            assert batch.rel_error[row, column] == reference[name][2], name
@@ -0,0 +1,131 @@
+import os
+from decimal import Decimal as D
+
+import pytest
+
+import constants_registry as cr
+
+'''
+    The binary snapshot of a constants catalog: everything that goes in
+    comes back out, by name and by symbol, however the keys collide in its
+    hash table.
+'''
+
+
+def _row(name, symbol, value='1', uncertainty='', units='', dimension='m'):
+    return name, symbol, value, uncertainty, units, cr.parse_dimension(dimension)
+
+
+def _colliding(count, slots=8, start=0):
+    """count keys that all hash to the last slot of a table of slots."""
+    keys = []
+    number = start
+    while len(keys) < count:
+        key = f"k{number}"
+        if cr._hash(key.encode()) & (slots - 1) == slots - 1:
+            keys.append(key)
+        number += 1
+    return keys
+
+
+def test_snapshot_round_trip():
+    rows = cr.parse_catalog()
+    registry = cr.Registry(cr.build_snapshot(rows))
+    assert len(registry) == len(rows)
+    for (name, symbol, value, uncertainty, units, dimension), entry in zip(rows, registry):
+        assert entry == registry[name] == registry[symbol]
+        assert (entry.name, entry.symbol, entry.units, entry.dimension) == (name, symbol, units, dimension)
+        assert entry.value == D(value)
+        if uncertainty == 'exact':
+            assert entry.uncertainty == 0
+        elif uncertainty == '':
+            assert entry.uncertainty is None
+        else:
+            assert entry.uncertainty == D(uncertainty)
+
+
+def test_catalog_lookups():
+    registry = cr.registry()
+    assert registry.value('h') == D('6.62607015e-34')
+    assert registry['Planck constant'].symbol == 'h'
+    assert registry['G'].dimension == (3, -1, -2, 0, 0, 0, 0)
+    assert registry['G'].relative_uncertainty == D('0.00015e-11') / D('6.67430e-11')
+    assert 'no such constant' not in registry
+    assert registry.get('no such constant', 'default') == 'default'
+    with pytest.raises(KeyError):
+        registry['no such constant']
+
+
+def test_hash_probing():
+    # names and symbols all in the last of 8 slots, so the probe wraps around to slot 0
+    names = _colliding(4)
+    rows = [_row(names[0], names[1], '1'), _row(names[2], names[3], '2')]
+    data = cr.build_snapshot(rows)
+    registry = cr.Registry(data)
+    assert registry._slots == 8
+    assert [registry.value(key) for key in names] == [1, 1, 2, 2]
+    # a missing key in the same slot walks the whole run of collisions
+    missing = _colliding(1, start=int(names[-1][1:]) + 1)[0]
+    assert missing not in registry
+    assert registry.get(missing) is None
+
+
+def test_duplicate_keys_rejected():
+    with pytest.raises(ValueError):
+        cr.build_snapshot([_row('one', 'x'), _row('two', 'x')])
+    # a constant may use the same text as name and symbol
+    assert cr.Registry(cr.build_snapshot([_row('x', 'x')])).value('x') == 1
+
+
+def test_bad_snapshot_rejected():
+    data = bytearray(cr.build_snapshot([_row('one', 'x')]))
+    data[:4] = b'XXXX'
+    with pytest.raises(ValueError):
+        cr.Registry(bytes(data))
+
+
+def test_snapshot_rebuilt_when_stale(tmp_path):
+    catalog = tmp_path / 'catalog.txt'
+    catalog.write_text("# comment\n\nlength | l | 2 | exact | m | m\n", encoding='utf-8')
+    registry = cr.open_registry(str(catalog))
+    snapshot = cr.snapshot_path(str(catalog))
+    assert snapshot == str(tmp_path / 'catalog.snapshot')
+    assert os.path.exists(snapshot)
+    assert registry.value('l') == 2 and registry['length'].uncertainty == 0
+
+    calls = []
+
+    def parse(path):
+        calls.append(path)
+        return cr.parse_catalog(path)
+
+    assert cr.open_registry(str(catalog), parse).value('l') == 2
+    assert calls == []                                # fresh snapshot, not parsed
+
+    catalog.write_text("length | l | 3 | | m | m\n", encoding='utf-8')
+    os.utime(catalog, (os.path.getmtime(snapshot) + 10,) * 2)
+    registry = cr.open_registry(str(catalog), parse)
+    assert calls == [str(catalog)]
+    assert registry.value('length') == 3 and registry['l'].uncertainty is None
+
+
+def test_parse_errors(tmp_path):
+    catalog = tmp_path / 'catalog.txt'
+    catalog.write_text("length | l | 2 | exact | m\n", encoding='utf-8')
+    with pytest.raises(ValueError, match='expected 6 fields'):
+        cr.parse_catalog(str(catalog))
+    with pytest.raises(ValueError, match='unknown base unit'):
+        cr.parse_dimension('m^2 furlong')
+
+
+def test_override():
+    try:
+        cr.override({'Planck constant': '1e-33'})
+        assert cr.known('h') == cr.known('Planck constant') == D('1e-33')
+        assert cr.known('h', float) == 1e-33
+        assert cr.known('c') == 299792458
+        with pytest.raises(KeyError):
+            cr.override({'no such constant': 1})
+    finally:
+        cr.override({})
+    assert cr.known('h') == D('6.62607015e-34')
@@ -0,0 +1,91 @@
+from decimal import Decimal as D, localcontext
+
+import pytest
+
+import decimal_math
+from decimal_math import d_p
+
+'''
+    Each route of d_p() against exp(ln(base) * exponent) worked out with
+    20 more digits, and pi and sqrt(2 pi) at more than one precision.
+'''
+
+PI_60 = D('3.14159265358979323846264338327950288419716939937510582097494')
+BASES = [D('2'), D('299792458'), D('6.62607015e-34'), D('0.5'), D('1.0000001')]
+
+
+def _reference(base, exponent, prec):
+    with localcontext() as ctx:
+        ctx.prec = prec + 20
+        value = (base.ln() * D(exponent)).exp()
+    with localcontext() as ctx:
+        ctx.prec = prec
+        return +value
+
+
+def _close(value, reference, prec):
+    """Within one unit in the last of prec digits."""
+    return abs(value - reference) <= abs(reference).scaleb(1 - prec)
+
+
+@pytest.mark.parametrize('prec', [28, 100])
+@pytest.mark.parametrize('base', BASES, ids=str)
+@pytest.mark.parametrize('exponent', [2, 3, -1, -4, 17, '0.5', '-0.5', '2.5', '-3.5', '0.25', '1.3', '-2.7'])
+def test_d_p_routes(base, exponent, prec):
+    with localcontext() as ctx:
+        ctx.prec = prec
+        assert _close(d_p(base, D(exponent)), _reference(base, exponent, prec), prec)
+
+
+def test_integer_powers_exact():
+    # repeated squaring with guard digits gives the correctly rounded result
+    with localcontext() as ctx:
+        ctx.prec = 50
+        assert d_p(D(3), D(40)) == +D(3 ** 40)
+        assert d_p(D(2), D(-3)) == D('0.125')
+        assert d_p(D(-2), D(3)) == -8
+        assert d_p(D(7), D(0)) == 1
+        assert d_p(D(0), D(5)) == 0
+
+
+def test_ln_cache():
+    decimal_math._ln_cache.clear()
+    with localcontext() as ctx:
+        ctx.prec = 40
+        first = d_p(D(10), D('0.3'))
+        assert len(decimal_math._ln_cache) == 1
+        assert d_p(D(10), D('-1.7')) == _reference(D(10), '-1.7', 40)
+        assert d_p(D(10), D('0.3')) == first
+        assert len(decimal_math._ln_cache) == 1
+        ctx.prec = 60
+        assert _close(d_p(D(10), D('0.3')), _reference(D(10), '0.3', 60), 60)
+        assert len(decimal_math._ln_cache) == 2
+
+
+def test_errors():
+    with pytest.raises(ValueError, match='undefined'):
+        d_p(D(0), D(-1))
+    with pytest.raises(ValueError, match='undefined'):
+        d_p(D(0), D(0))
+    with pytest.raises(ValueError, match='Negative bases'):
+        d_p(D(-2), D('0.5'))
+
+
+@pytest.mark.parametrize('prec', [10, 28, 50])
+def test_pi(prec):
+    with localcontext() as ctx:
+        ctx.prec = prec
+        assert decimal_math.pi() == +PI_60
+        assert _close(decimal_math.sqrt_two_pi(), (2 * PI_60).sqrt(), prec)
+
+
+def test_pi_beyond_100_digits():
+    # not held to the 100 digits of the frameworks
+    with localcontext() as ctx:
+        ctx.prec = 300
+        pi = decimal_math.pi()
+        ctx.prec = 320
+        pi_more = decimal_math.pi()
+        assert pi_more != pi
+        ctx.prec = 300
+        assert +pi_more == pi
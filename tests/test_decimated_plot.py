@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+import decimated_plot as dp
+
+'''
+    Decimation keeps what the eye sees: minmax the extremes of every pixel
+    column, LTTB the first and last point.
+'''
+
+
+def _noisy(n=20_000, seed=1):
+    rng = np.random.default_rng(seed)
+    x = np.linspace(0.0, 10.0, n)
+    return x, np.sin(x) + rng.normal(0, 0.3, n)
+
+
+def test_minmax_keeps_every_bucket_extreme():
+    x, y = _noisy()
+    columns = 100
+    edges = dp.pixel_columns(x, columns)
+    keep = dp.minmax(x, y, columns)
+    assert len(keep) <= 4 * columns
+    kept = set(keep.tolist())
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        assert lo in kept and hi - 1 in kept
+        assert lo + int(y[lo:hi].argmin()) in kept
+        assert lo + int(y[lo:hi].argmax()) in kept
+    assert y[keep].min() == y.min() and y[keep].max() == y.max()
+
+
+def test_minmax_descending_x_and_nan():
+    x, y = _noisy()
+    x, y = x[::-1].copy(), y.copy()
+    y[::7] = np.nan
+    keep = dp.minmax(x, y, 50)
+    assert np.nanmin(y[keep]) == np.nanmin(y) and np.nanmax(y[keep]) == np.nanmax(y)
+    assert dp.minmax(x[:100], y[:100], 50).tolist() == list(range(100))
+    with pytest.raises(ValueError, match='sorted'):
+        dp.pixel_columns(np.array([0.0, 2.0, 1.0]), 2)
+
+
+def test_lttb_keeps_endpoints():
+    x, y = _noisy()
+    keep = dp.lttb(x, y, 200)
+    assert len(keep) == 200
+    assert keep[0] == 0 and keep[-1] == len(x) - 1
+    assert (np.diff(keep) > 0).all()
+
+    y[0] = y[-1] = np.nan                           # the ends are the first and last finite points
+    keep = dp.lttb(x, y, 200)
+    assert keep[0] == 1 and keep[-1] == len(x) - 2
+    assert dp.lttb(x[:10], y[:10], 200).tolist() == list(range(1, 10))
+
+
+def test_render(tmp_path):
+    path = tmp_path / 'curves.png'
+    drawn = dp.render(str(path), dp.convergence_curves(points=50_000), size=(4, 3), dpi=50)
+    assert path.stat().st_size > 0
+    assert drawn <= 4 * 4 * 200
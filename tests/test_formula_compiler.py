@@ -0,0 +1,83 @@
+from decimal import Decimal as D, localcontext
+
+import pytest
+
+import constants_framework
+import decimal_math
+import simplified_plancks_constants
+
+'''
+    The compiled evaluator against the validate_planck_units() it was
+    compiled from, which it has to match digit for digit.
+'''
+
+FRAMEWORKS = [constants_framework, simplified_plancks_constants]
+
+
+@pytest.mark.parametrize('framework', FRAMEWORKS, ids=lambda m: m.__name__)
+@pytest.mark.parametrize('prec', [100, 50, 28])
+def test_compiled_matches_validate(framework, prec):
+    with localcontext() as ctx:
+        ctx.prec = prec
+        scalings = framework.calculate_unit_scaling()
+        expected = framework.validate_planck_units(*scalings)
+        compiled = framework.validate_planck_units_compiled(*scalings)
+    assert list(compiled) == list(expected)
+    for name in expected:
+        assert compiled[name] == expected[name], name
+
+
+@pytest.mark.parametrize('framework', FRAMEWORKS, ids=lambda m: m.__name__)
+def test_compiled_follows_the_precision(framework):
+    # constants that do not depend on the inputs are cached per precision
+    results = {}
+    for prec in (100, 40, 100):
+        with localcontext() as ctx:
+            ctx.prec = prec
+            scalings = framework.calculate_unit_scaling()
+            results.setdefault(prec, []).append(framework.validate_planck_units_compiled(*scalings))
+            assert results[prec][-1] == framework.validate_planck_units(*scalings)
+    assert results[100][0] == results[100][1]
+    assert results[40][0] != results[100][0]
+
+
+@pytest.mark.parametrize('framework', FRAMEWORKS, ids=lambda m: m.__name__)
+@pytest.mark.parametrize('tol', ['1e-12', '1e-30'])
+def test_adaptive_within_tol(framework, tol):
+    tol = D(tol)
+    with localcontext() as ctx:
+        ctx.prec = framework.PRECISION
+        scalings = framework.calculate_unit_scaling()
+        full = framework.validate_planck_units(*scalings)
+        results, used = framework.validate_planck_units_adaptive(*scalings, tol=tol)
+    assert list(results) == list(full)
+    assert set(used) == set(full)
+    for name, (exp_val, calc_val, rel_error) in results.items():
+        assert used[name] <= framework.PRECISION
+        assert exp_val == full[name][0], name
+        # accepted once it agrees with the value one precision step lower to tol
+        assert abs(calc_val - full[name][1]) <= 2 * tol * abs(full[name][1]), name
+
+
+@pytest.mark.parametrize('framework', FRAMEWORKS, ids=lambda m: m.__name__)
+def test_adaptive_stops_early(framework):
+    with localcontext() as ctx:
+        ctx.prec = framework.PRECISION
+        scalings = framework.calculate_unit_scaling()
+        _, used = framework.validate_planck_units_adaptive(*scalings, tol=D('1e-12'))
+        _, capped = framework.validate_planck_units_adaptive(*scalings, tol=D('1e-12'), max_prec=20)
+    assert min(used.values()) < framework.PRECISION
+    assert max(capped.values()) <= 20
+
+
+@pytest.mark.parametrize('framework', FRAMEWORKS, ids=lambda m: m.__name__)
+def test_pi_follows_the_precision(framework):
+    # h_bar = h / (2 pi) to all 200 digits, not to the 100 of PRECISION
+    with localcontext() as ctx:
+        ctx.prec = 200
+        scalings = framework.calculate_unit_scaling()
+        for results in (framework.validate_planck_units(*scalings),
+                        framework.validate_planck_units_compiled(*scalings)):
+            h = results['Planck constant E at 1Hz'][1]
+            h_bar = results['h_bar'][1]
+            assert abs(h_bar * 2 * decimal_math.pi() / h - 1) < D('1e-195')
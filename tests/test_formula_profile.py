@@ -0,0 +1,60 @@
+import json
+from decimal import localcontext
+
+import pytest
+
+import constants_framework
+import formula_profile
+import simplified_plancks_constants
+
+'''
+    The instrumented copies of the frameworks return what the originals
+    do, and account for the Decimal operations they run.
+'''
+
+
+@pytest.mark.parametrize('module', [constants_framework, simplified_plancks_constants],
+                         ids=lambda m: m.__name__)
+@pytest.mark.parametrize('count_ops', [True, False])
+def test_same_results_as_validate(module, count_ops):
+    with localcontext() as ctx:
+        ctx.prec = module.PRECISION
+        expected = module.validate_planck_units(*module.calculate_unit_scaling())
+        profile = module.validate_planck_units_profile(count_ops)
+    assert profile.results == expected
+
+    kinds = {event.kind for event in profile.events}
+    assert kinds == {'function', 'formula', 'd_p'}
+    top = [event for event in profile.events if event.depth == 0]
+    assert [event.name for event in top] == ['calculate_unit_scaling', 'validate_planck_units']
+    ops = sum((sum(event.ops.values()) for event in top))
+    assert (ops > 0) == count_ops
+
+
+def test_operation_counts():
+    with localcontext() as ctx:
+        ctx.prec = constants_framework.PRECISION
+        profile = constants_framework.validate_planck_units_profile()
+    rows = formula_profile.summary(profile, 'ops')
+    assert sum(rows[0].ops.values()) > 0
+    validate = next(row for row in rows if row.name == 'validate_planck_units')
+    for op in ('sub', 'mul', 'div', 'pow', 'sqrt'):
+        assert validate.ops.get(op, 0) > 0, op
+    formulas = [row for row in rows if row.kind == 'formula']
+    assert sum(sum(row.ops.values()) for row in formulas) <= sum(
+        sum(row.ops.values()) for row in rows if row.kind == 'function')
+    d_p = [row for row in rows if row.kind == 'd_p']
+    assert d_p and all(row.calls > 0 and sum(row.ops.values()) > 0 for row in d_p)
+    assert 'frames in' in formula_profile.table(profile, limit=5)
+
+
+def test_trace_files(tmp_path):
+    profile = constants_framework.validate_planck_units_profile(count_ops=False)
+    formula_profile.write_speedscope(str(tmp_path / 'a.json'), profile)
+    formula_profile.write_chrome_trace(str(tmp_path / 'b.json'), profile)
+    speedscope = json.loads((tmp_path / 'a.json').read_text(encoding='utf-8'))
+    events = speedscope['profiles'][0]['events']
+    assert len(events) == 2 * len(profile.events)
+    assert sum(1 if e['type'] == 'O' else -1 for e in events) == 0
+    trace = json.loads((tmp_path / 'b.json').read_text(encoding='utf-8'))
+    assert len(trace['traceEvents']) == len(profile.events)
@@ -0,0 +1,111 @@
+import os
+import threading
+import time
+
+import pytest
+from sympy import Symbol, simplify
+
+import formula_rewriter as fr
+import simplify_cache
+
+'''
+    The batch rewrite on a small catalog, with the simplify cache in a
+    temporary directory.
+'''
+
+CATALOG = """\
+# test formulas
+@positive c Hz_kg K_Hz Hz_K ν ν_D
+
+photon energy      | h * ν            |
+second radiation   | h * c / k        |
+Debye temperature  | h * ν_D / k      | h: Hz_kg * c**2, k: K_Hz * Hz_kg * c**2; K_Hz: 1 / Hz_K
+"""
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(simplify_cache, 'CACHE_DIR', str(tmp_path / 'cache'))
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    path = tmp_path / 'formulas.txt'
+    path.write_text(CATALOG, encoding='utf-8')
+    return str(path)
+
+
+def _symbols(*names):
+    return [Symbol(n, positive=True) for n in names]
+
+
+def test_parse_catalog(catalog):
+    formulas = fr.parse_catalog(catalog)
+    assert [f[0] for f in formulas] == ['photon energy', 'second radiation', 'Debye temperature']
+    assert formulas[0][2] == [fr.STANDARD]
+    assert formulas[2][2] == ['h: Hz_kg * c**2, k: K_Hz * Hz_kg * c**2', 'K_Hz: 1 / Hz_K']
+    assert all(f[3] == ('c', 'Hz_kg', 'K_Hz', 'Hz_K', 'ν', 'ν_D') for f in formulas)
+
+
+def test_parse_errors(tmp_path):
+    path = tmp_path / 'bad.txt'
+    path.write_text("photon energy | h * ν\n", encoding='utf-8')
+    with pytest.raises(ValueError, match='expected 3 fields'):
+        fr.parse_catalog(str(path))
+
+
+def test_rewrite_stages(catalog):
+    name, formula, stages, positive = fr.parse_catalog(catalog)[2]
+    result = fr.rewrite(name, formula, stages, positive)
+    Hz_K, ν_D = _symbols('Hz_K', 'ν_D')
+    assert result.strategy == 'simplify, simplify'
+    assert simplify(result.simplified - Hz_K * ν_D) == 0
+
+
+def test_rewrite_catalog(catalog):
+    results = {r.name: r for r in fr.rewrite_catalog(catalog, workers=2)}
+    assert set(results) == {'photon energy', 'second radiation', 'Debye temperature'}
+    c, K_Hz = _symbols('c', 'K_Hz')
+    assert simplify(results['second radiation'].simplified - c / K_Hz) == 0
+    assert all(r.strategy.startswith('simplify') for r in results.values())
+
+
+def test_timeout_falls_back(catalog, monkeypatch):
+    def slow(expr):
+        time.sleep(5)
+
+    monkeypatch.setattr(fr, 'simplify', slow)
+    name, formula, stages, positive = fr.parse_catalog(catalog)[1]
+    start = time.perf_counter()
+    result = fr.rewrite(name, formula, stages, positive, budget=0.2)
+    assert time.perf_counter() - start < 4
+    assert result.strategy.startswith('timeout/')
+    c, K_Hz = _symbols('c', 'K_Hz')
+    assert simplify(result.simplified - c / K_Hz) == 0
+
+
+def test_cache_write_is_outside_the_budget(catalog, monkeypatch, tmp_path):
+    store = fr.store
+
+    def slow_store(*args):
+        time.sleep(0.4)
+        store(*args)
+
+    monkeypatch.setattr(fr, 'store', slow_store)
+    name, formula, stages, positive = fr.parse_catalog(catalog)[1]
+    assert fr.rewrite(name, formula, stages, positive, budget=0.2).strategy == 'simplify'
+    files = [f for _, _, names in os.walk(tmp_path / 'cache') for f in names]
+    assert len(files) == 1 and files[0].endswith('.txt')
+
+    monkeypatch.setattr(fr, 'simplify', None)               # the second run only reads the cache
+    assert fr.rewrite(name, formula, stages, positive, budget=0.2).strategy == 'simplify'
+
+
+def test_off_the_main_thread(catalog):
+    name, formula, stages, positive = fr.parse_catalog(catalog)[2]
+    results = []
+    thread = threading.Thread(target=lambda: results.append(fr.rewrite(name, formula, stages, positive)))
+    thread.start()
+    thread.join()
+    assert len(results) == 1
+    assert results[0].strategy == 'simplify, simplify'
@@ -0,0 +1,71 @@
+from decimal import localcontext
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+import formula_search as fs
+from constants_registry import known
+
+'''
+    The exponent search, on ranges small enough to run in a test.
+'''
+
+HALVES = fs.exponent_range(2)
+WHOLE = fs.exponent_range(2, 1)
+RANGES = {'s_length': HALVES, 's_mass': HALVES, 's_temp': [0], 's_charge': [0],
+          'c': WHOLE, '2': WHOLE, 'pi': [-1, 0, 1], 'e': WHOLE, 'N_A': [0]}
+
+
+def test_exponent_range():
+    assert fs.exponent_range(1) == [-1, Fraction(-1, 2), 0, Fraction(1, 2), 1]
+    assert fs.exponent_range(Fraction(3, 2), 1) == [-1, 0, 1]
+
+
+def test_finds_conductance_quantum():
+    with localcontext() as ctx:
+        ctx.prec = 100
+        target = known('G_0')
+        matches = fs.search(target, tol=1e-9, workers=1, ranges=RANGES)
+    assert matches
+    best = matches[0]
+    assert best.exponents == {'s_length': -1, 's_mass': -1, 'c': 1, '2': 1, 'e': 2}
+    assert best.formula() == 's_length**-1 * s_mass**-1 * c * 2 * e**2'
+    assert best.rel_error < 1e-9
+    assert [m.complexity for m in matches] == sorted(m.complexity for m in matches)
+
+
+def test_rejects_non_positive_target():
+    with pytest.raises(ValueError):
+        fs.search(-1, workers=1, ranges=RANGES)
+
+
+def test_sum_table_long_ranges():
+    # more choices than fit in an int8
+    ranges = [fs.exponent_range(100, 1), [0, 1]]
+    indices, sums = fs._sum_table([1.0, 10.0], ranges)
+    assert indices.dtype == np.uint8
+    assert len(indices) == 201 * 2
+    assert indices[:, 0].max() == 200
+    expected = np.array([float(ranges[0][i]) + 10.0 * ranges[1][j] for i, j in indices])
+    assert np.array_equal(sums, expected)
+
+
+def test_truncation_keeps_closest():
+    exponents = [Fraction(k, 100) for k in range(-50, 51)]
+    fs._init_worker([1.0], [exponents])
+    try:
+        rows, dropped = fs._search_chunk(np.zeros((1, 1), dtype=np.uint8), np.zeros(1), 0.0, 0.1, 5)
+    finally:
+        fs._table = None
+    # 21 exponents from -0.1 to 0.1 are within the tolerance, the 5 nearest 0 are kept
+    assert dropped == 21 - 5
+    assert sorted(abs(exponents[i]) for i in rows[:, 1]) == [Fraction(k, 100) for k in (0, 1, 1, 2, 2)]
+
+
+def test_truncation_warns():
+    with localcontext() as ctx:
+        ctx.prec = 100
+        with pytest.warns(RuntimeWarning, match='dropped'):
+            matches = fs.search(known('G_0'), tol=1e-2, workers=1, ranges=RANGES, limit=1)
+    assert len(matches) <= 1                        # one chunk of 9 * 9 left sums
@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+'''
+    The modules that used to run as scripts import without printing,
+    without writing files, without touching the Decimal context and
+    without loading pandas, matplotlib or sympy.  Each is imported in a
+    fresh interpreter so one cannot hide what another loads.
+'''
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = ('aaaa10_space_time_ratio', 'convergence_plot', 'dddd01', 'find_gamma_delta',
+           'quantization_demo', 'redefine_g', 'seeinghow_mass_kg_are_dependent', 'simple_redefine_h',
+           'simplifyconstantformulas', 'subatomic_masses', 'working_imperial_units_model',
+           'define_const_from_units', 'constants_framework', 'simplified_plancks_constants')
+
+CHECK = """
+import decimal, sys
+sys.path.insert(0, {root!r})
+context = decimal.getcontext().prec, decimal.getcontext().rounding
+import {module}
+assert (decimal.getcontext().prec, decimal.getcontext().rounding) == context, 'Decimal context changed'
+heavy = [name for name in ('pandas', 'matplotlib', 'sympy') if name in sys.modules]
+assert not heavy, 'imported ' + ', '.join(heavy)
+"""
+
+
+def _files(path):
+    found = set()
+    for directory, subdirectories, names in os.walk(path):
+        subdirectories[:] = [d for d in subdirectories if d not in ('.git', '__pycache__', '.pytest_cache')]
+        found.update(os.path.join(directory, name) for name in names)
+    return found
+
+
+@pytest.mark.parametrize('module', MODULES)
+def test_import_is_silent(module, tmp_path):
+    before = _files(ROOT)
+    done = subprocess.run([sys.executable, '-c', CHECK.format(root=ROOT, module=module)],
+                          cwd=tmp_path, capture_output=True, text=True, timeout=120)
+    assert done.returncode == 0, done.stderr
+    assert done.stdout == ''
+    assert done.stderr == ''
+    assert _files(ROOT) == before
+    assert not os.listdir(tmp_path)
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+import nbody
+
+'''
+    The direct and Barnes-Hut force sums against a plain loop over pairs.
+'''
+
+
+@pytest.fixture
+def bodies():
+    return nbody.plummer(300, seed=3)
+
+
+def _pairwise(positions, masses, law):
+    force = nbody.LAWS[law]
+    forces = np.zeros((len(masses), 3))
+    for i in range(len(masses)):
+        for j in range(len(masses)):
+            if i != j:
+                d = positions[j] - positions[i]
+                r = np.linalg.norm(d)
+                forces[i] += force(masses[i], masses[j], r) * d / r
+    return forces
+
+
+@pytest.mark.parametrize('law', sorted(nbody.LAWS))
+def test_direct_matches_pairs(law):
+    positions, masses = nbody.plummer(40, seed=1)
+    expected = _pairwise(positions, masses, law)
+    for block in (7, 40, 512):
+        forces = nbody.direct_forces(positions, masses, law, block=block)
+        assert nbody.relative_difference(forces, expected) < 1e-12
+    assert np.allclose(nbody.direct_forces(positions, masses, law, targets=[3, 17]),
+                       expected[[3, 17]], rtol=1e-12, atol=0)
+
+
+def test_laws_agree(bodies):
+    positions, masses = bodies
+    new = nbody.direct_forces(positions, masses, 'new')
+    traditional = nbody.direct_forces(positions, masses, 'traditional')
+    assert nbody.relative_difference(new, traditional) < 1e-4
+    # equal and opposite pairs
+    assert np.abs(new.sum(axis=0)).max() < 1e-10 * np.abs(new).max()
+
+
+def test_octree(bodies):
+    positions, masses = bodies
+    tree = nbody.build_octree(positions, masses, leaf_size=4)
+    assert sorted(tree.order) == list(range(len(masses)))
+    assert tree.mass[0] == pytest.approx(masses.sum())
+    assert np.allclose(tree.center[0], (masses[:, None] * positions).sum(axis=0) / masses.sum())
+    leaves = tree.first_child < 0
+    assert (tree.end[leaves] - tree.start[leaves]).sum() == len(masses)
+    internal = np.flatnonzero(~leaves)
+    for cell in internal:
+        kids = tree.first_child[cell] + np.arange(tree.children[cell])
+        assert tree.mass[kids].sum() == pytest.approx(tree.mass[cell])
+
+
+@pytest.mark.parametrize('law', sorted(nbody.LAWS))
+def test_barnes_hut(bodies, law):
+    positions, masses = bodies
+    direct = nbody.direct_forces(positions, masses, law)
+    # theta = 0 opens every cell down to its leaves, which is the direct sum
+    exact = nbody.barnes_hut_forces(positions, masses, law, theta=0.0, block=64)
+    assert nbody.relative_difference(exact, direct) < 1e-10
+    errors = [nbody.relative_difference(nbody.barnes_hut_forces(positions, masses, law, theta=theta), direct)
+              for theta in (0.2, 0.5)]
+    assert errors[0] < errors[1] < 0.05
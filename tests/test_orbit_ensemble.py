@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+import orbit_ensemble as oe
+
+'''
+    The leapfrog ensemble: a run resumed from its checkpoint ends where an
+    uninterrupted run does, and the energy error stays bounded.
+'''
+
+
+class _Interrupt(Exception):
+    pass
+
+
+class _Stopping:
+    """A force law that raises after calls calls, like a killed run."""
+
+    def __init__(self, law, calls):
+        self.law, self.calls = law, calls
+
+    def __call__(self, m1, m2, r):
+        self.calls -= 1
+        if self.calls < 0:
+            raise _Interrupt()
+        return self.law(m1, m2, r)
+
+
+def _law():
+    k = oe.scaled_constants(oe.scaling_pairs[0], oe.c, oe.m)
+    return oe.ScaledGravity(k['m'], k['c'], k['m_P'])
+
+
+def test_resume_matches_uninterrupted(tmp_path):
+    system = oe.solar_system(seed=3)
+    law = _law()
+    args = (system.positions, system.velocities, system.masses)
+    whole = oe.leapfrog(*args, law, oe.DAY, 300, every=40)
+
+    checkpoint = str(tmp_path / 'member.npz')
+    with pytest.raises(_Interrupt):
+        oe.leapfrog(*args, _Stopping(law, 150), oe.DAY, 300, checkpoint=checkpoint, every=40)
+    with np.load(checkpoint) as saved:
+        assert 0 < int(saved['step']) < 300
+    resumed = oe.leapfrog(*args, law, oe.DAY, 300, checkpoint=checkpoint, every=40)
+
+    assert np.array_equal(resumed[0], whole[0])
+    assert np.array_equal(resumed[1], whole[1])
+    assert resumed[2:] == whole[2:]
+
+
+def test_checkpoint_of_another_run_is_ignored(tmp_path):
+    system = oe.solar_system()
+    law = _law()
+    args = (system.positions, system.velocities, system.masses, law, oe.DAY)
+    checkpoint = str(tmp_path / 'member.npz')
+    oe.leapfrog(*args, 100, checkpoint=checkpoint, every=40)
+    longer = oe.leapfrog(*args, 120, checkpoint=checkpoint, every=40)
+    assert np.array_equal(longer[0], oe.leapfrog(*args, 120, every=40)[0])
+
+
+def test_energy_drift_stays_bounded():
+    system = oe.solar_system()
+    one = oe.run_member(system, oe.scaling_pairs[0], oe.DAY, int(oe.YEAR / oe.DAY), every=100)
+    ten = oe.run_member(system, oe.scaling_pairs[0], oe.DAY, int(10 * oe.YEAR / oe.DAY), every=100)
+    assert ten.energy_drift < 1e-7
+    assert ten.energy_drift < 1.5 * one.energy_drift        # no secular growth over ten orbits of Earth
+    assert ten.momentum_drift < 1e-13
+
+
+def test_unit_systems_trace_the_same_orbits():
+    system = oe.solar_system()
+    orbits = [oe.run_member(system, pair, oe.DAY, 365) for pair in oe.scaling_pairs[:3]]
+    for orbit in orbits[1:]:
+        deviation = np.linalg.norm(orbit.positions - orbits[0].positions, axis=1).max()
+        assert deviation < 1e-6 * oe.AU
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+import quantization_demo as qd
+
+'''
+    The streamed quantization table: chunking does not change it, and the
+    worked out diffs are -h * step after a first row of -h * start.
+'''
+
+
+def _table(**kwargs):
+    return np.concatenate(list(qd.quantization_chunks(**kwargs)))
+
+
+def test_exact_diff():
+    rows = _table(start_frequency=1e12, step=1e11, num_steps=25, chunk_size=7, exact_diff=True)
+    assert rows['diff'][0] == -qd.h * 1e12
+    assert (rows['diff'][1:] == -qd.h * 1e11).all()
+    subtracted = _table(start_frequency=1e12, step=1e11, num_steps=25, chunk_size=7)
+    assert subtracted['diff'] == pytest.approx(rows['diff'], rel=1e-6)
+
+
+def test_chunks_do_not_change_the_table():
+    whole = _table(start_frequency=10.0, step=1.0, num_steps=50)
+    for chunk_size in (1, 7, 50):
+        assert np.array_equal(_table(start_frequency=10.0, step=1.0, num_steps=50,
+                                     chunk_size=chunk_size), whole)
+    assert whole['frequency'][-1] == 59.0
+    assert whole['hf_energy'] == pytest.approx(qd.h * whole['frequency'], rel=1e-15)
+    assert whole['wavelength'] == pytest.approx(qd.c / whole['frequency'], rel=1e-15)
+
+
+def test_write_table(tmp_path):
+    path = tmp_path / 'table.npy'
+    qd.write_quantization_table(str(path), num_steps=30, chunk_size=8, exact_diff=True)
+    assert np.array_equal(np.load(path), _table(num_steps=30, exact_diff=True))
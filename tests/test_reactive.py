@@ -0,0 +1,79 @@
+from decimal import Decimal as D, localcontext
+
+import pytest
+
+import autodiff
+import constants_framework as framework
+import constants_registry as cr
+
+'''
+    Changing one input of the reactive framework recomputes only what
+    depends on it, and gives the same digits as running the framework
+    again from scratch.
+'''
+
+G_2014 = D('6.67408e-11')
+
+
+def _full(overrides):
+    try:
+        cr.override(overrides)
+        return framework.validate_planck_units(*framework.calculate_unit_scaling())
+    finally:
+        cr.override({})
+
+
+def test_first_results_match_validate():
+    with localcontext() as ctx:
+        ctx.prec = framework.PRECISION
+        frame = framework.validate_planck_units_reactive()
+        assert frame.results() == _full({})
+        assert frame.recomputed > 0
+        frame.results()
+        assert frame.recomputed == 0
+
+
+def test_changing_G_recomputes_only_its_dependents():
+    with localcontext() as ctx:
+        ctx.prec = framework.PRECISION
+        frame = framework.validate_planck_units_reactive()
+        before = frame.results()
+        everything = frame.recomputed
+
+        frame.set_known('G', G_2014)
+        after = frame.results()
+        assert 0 < frame.recomputed < everything / 4
+        assert after == _full({'G': G_2014})
+
+        # the constants that do not depend on G are the very same objects
+        elasticities = autodiff.sensitivities(framework.calculate_unit_scaling,
+                                              framework.validate_planck_units, wrt=('G',))
+        for name, sensitivity in elasticities.items():
+            if sensitivity.partials['G'] == 0:
+                assert after[name] is before[name], name
+            else:
+                assert after[name][1] != before[name][1], name
+
+        frame.reset_known('G')
+        assert frame.results() == before
+
+
+def test_set_a_name_and_precision_change():
+    with localcontext() as ctx:
+        ctx.prec = framework.PRECISION
+        frame = framework.validate_planck_units_reactive()
+        frame.results()
+        frame.set('c', D(3e8))
+        changed = frame.results()
+        assert changed != _full({})
+        frame.reset('c')
+        ctx.prec = 50
+        assert frame.results() == _full({})
+
+
+def test_unknown_inputs_raise():
+    frame = framework.validate_planck_units_reactive()
+    with pytest.raises(KeyError):
+        frame.set('no_such_name', 1)
+    with pytest.raises(KeyError):
+        frame.set_known('no_such_key', 1)
@@ -0,0 +1,55 @@
+import re
+
+import pytest
+
+import constants_registry
+import redefine_units
+
+'''
+    The python -m redefine_units entry point, run in this process the way
+    the command line runs it.
+'''
+
+
+@pytest.fixture(autouse=True)
+def no_overrides():
+    yield
+    constants_registry.override({})
+
+
+def _row(output, name):
+    return re.search(rf"^{name}\s*\|\s*(\S+)\s*\|\s*(\S+)\s*\|\s*(\S+)", output, re.M).groups()
+
+
+def test_framework_uses_known_override(capsys):
+    import constants_framework                             # imported first, --known must still hold
+
+    redefine_units.main(['framework', '--prec', '50', '--known', 'G=6.67e-11'])
+    output = capsys.readouterr().out
+    expected, calculated, error = _row(output, 'Gravitational constant')
+    assert expected == '6.67E-11' and calculated == '6.67000000000E-11'
+    assert float(error) < 1e-45                           # worked at 50 digits, not 100 or 28
+    assert constants_framework.known('G') == constants_registry.D('6.67e-11')
+
+    constants_registry.override({})
+    redefine_units.main(['framework', '--prec', '50'])
+    default = capsys.readouterr().out
+    assert _row(default, 'Gravitational constant')[0] == '6.67430E-11'
+    assert _row(default, 'Planck Length')[1] != _row(output, 'Planck Length')[1]
+
+
+def test_derive_uses_known_override(capsys):
+    redefine_units.main(['derive'])
+    default = capsys.readouterr().out
+    redefine_units.main(['derive', '--known', 'h=6.6e-34'])
+    assert capsys.readouterr().out != default
+
+
+@pytest.mark.parametrize('argv, message', [
+    (['framework', '--known', 'G'], 'SYMBOL=VALUE'),
+    (['framework', '--known', 'no_such_constant=1'], 'no constant'),
+    (['framework', '--known', 'G=fast'], 'not a number'),
+])
+def test_bad_known(argv, message):
+    with pytest.raises(SystemExit, match=message):
+        redefine_units.main(argv)
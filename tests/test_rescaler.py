@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+import rescaler
+from constants_registry import known
+
+'''
+    The closed form rescaler against the adjust functions it replaced,
+    copied here from simple_redefine_h.py and redefine_g.py as they were.
+'''
+
+h = known('h', float)
+c = known('c', float)
+G = known('G', float)
+
+
+def _hc_adjust(target):
+    current_hc = h * c
+    meter = np.cbrt(current_hc / target)
+    kg = current_hc / target
+    second = np.sqrt(current_hc / target)
+    return {'m':  (meter, h / meter**2, c / meter),
+            'kg': (kg, h / kg, c),
+            's':  (second, h / second, c / second)}
+
+
+def _Gc_adjust(target):
+    current_Gc = G * c
+    meter = np.power(current_Gc / target, 1/4)
+    kg = current_Gc / target
+    second = np.cbrt(current_Gc / target)
+    return {'m':  (meter, G / meter**3, c / meter),
+            'kg': (kg, G / kg, c),
+            's':  (second, G / second**2, c / second)}
+
+
+TARGETS = [1e-25, 1.0, 1e3, 2.5e-11]
+
+
+@pytest.mark.parametrize('product, adjust', [({'h': 1, 'c': 1}, _hc_adjust),
+                                             ({'G': 1, 'c': 1}, _Gc_adjust)], ids=['hc', 'Gc'])
+def test_matches_adjust_functions(product, adjust):
+    result = rescaler.rescale(TARGETS, product)
+    assert result.shape == (3, len(TARGETS))
+    first = list(product)[0]
+    for row, unit in enumerate(('m', 'kg', 's')):
+        assert (result['unit'][row] == unit).all()
+        for column, target in enumerate(TARGETS):
+            adjustment, new_first, new_c = adjust(target)[unit]
+            entry = result[row, column]
+            assert entry['target'] == target
+            assert entry['adjustment'] == pytest.approx(adjustment, rel=1e-15)
+            assert entry[first] == pytest.approx(new_first, rel=1e-15)
+            assert entry['c'] == pytest.approx(new_c, rel=1e-15)
+            assert entry['product'] == pytest.approx(target, rel=1e-15)
+            assert entry['relative_difference'] < 1e-15
+
+
+def test_dimension():
+    assert list(rescaler.dimension({'h': 1, 'c': 1})[:3]) == [3, 1, -2]
+    assert list(rescaler.dimension({'G': 1, 'c': 1})[:3]) == [4, -1, -3]
+
+
+def test_broadcast_and_values():
+    targets = np.array([[1.0, 2.0], [3.0, 4.0]])
+    result = rescaler.rescale(targets, {'h': 1, 'c': 1}, units=('kg',), values={'h': 2.0})
+    assert result.shape == (1, 2, 2)
+    assert np.array_equal(result['adjustment'][0], 2.0 * c / targets)
+    assert np.allclose(result['product'][0], targets, rtol=1e-15)
+
+
+def test_unit_not_in_product():
+    result = rescaler.rescale([1.0], {'h': 1, 'c': 1}, units=('K',))
+    assert np.isnan(result['adjustment']).all()
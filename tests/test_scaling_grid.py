@@ -0,0 +1,53 @@
+from decimal import Decimal, localcontext
+
+import numpy as np
+
+import aaaa10_space_time_ratio as aaaa10
+import scaling_grid
+
+'''
+    The float64 grid against the Decimal formulas of aaaa10, cell by cell.
+'''
+
+
+def _decimal(m_scaling, l_scaling):
+    """The aaaa10 formulas written out again, at its precision."""
+    with localcontext() as ctx:
+        ctx.prec = aaaa10.PRECISION
+        m = aaaa10.m * Decimal(m_scaling)
+        c = aaaa10.c * Decimal(l_scaling)
+        m_P = m / aaaa10.space_time_ratio
+        return {'m': m, 'c': c, 'm_P': m_P, 'p': m * c, 'h': m * c**2, 'hc': m * c**3,
+                'G': m * c**3 / m_P**2}
+
+
+def test_refine_agrees_with_the_decimal_formulas():
+    grid = scaling_grid.scaling_grid(shape=(64, 48))
+    assert grid.surfaces['G'].shape == (64, 48)
+    cells = [(0, 0), (63, 47), (0, 47), (63, 0), (17, 29), (40, 5)]
+    for cell in scaling_grid.refine(grid, cells):
+        expected = _decimal(grid.m_scaling[cell.i], grid.l_scaling[cell.j])
+        with localcontext() as ctx:
+            ctx.prec = aaaa10.PRECISION
+            for name, value in expected.items():
+                assert abs(cell.constants[name] / value - 1) < Decimal('1e-95'), (cell.i, cell.j, name)
+        assert set(cell.rel_error) == set(expected)
+        assert max(cell.rel_error.values()) < 1e-14
+
+
+def test_grid_axes():
+    grid = scaling_grid.scaling_grid(mass_range=(1e-2, 1e2), length_range=(1e-3, 1e3), shape=(5, 7))
+    assert np.allclose(grid.m_scaling, np.geomspace(1e-2, 1e2, 5))
+    assert np.allclose(grid.l_scaling, np.geomspace(1e-3, 1e3, 7))
+    assert np.allclose(grid.surfaces['p'], grid.m[:, None] * grid.c[None, :], rtol=1e-15)
+    assert scaling_grid.value(grid, 'c', 3, 4) == grid.c[4]
+    assert scaling_grid.value(grid, 'm_P', 3, 4) == grid.m_P[3]
+
+
+def test_save(tmp_path):
+    grid = scaling_grid.scaling_grid(shape=(4, 4))
+    path = tmp_path / 'grid.npz'
+    scaling_grid.save(str(path), grid)
+    with np.load(path) as saved:
+        assert set(saved.files) == {'m_scaling', 'l_scaling', 'm', 'm_P', 'c', 'p', 'h', 'hc', 'G'}
+        assert np.array_equal(saved['G'], grid.surfaces['G'])
@@ -0,0 +1,85 @@
+import os
+
+import pytest
+import sympy
+from sympy import Function, Piecewise, Rational, exp, pi, sqrt, srepr, symbols
+
+import simplify_cache
+
+'''
+    The simplify cache in a temporary directory: hits, misses, pruning of
+    other sympy versions, and files that are not plain srepr() text.
+'''
+
+x, y = symbols('x y', positive=True)
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(simplify_cache, 'CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(simplify_cache, '_pruned', False)
+    monkeypatch.setattr(simplify_cache, 'stats', {'hits': 0, 'misses': 0})
+    return tmp_path
+
+
+def _entries(cache_dir):
+    version = cache_dir / f"sympy-{sympy.__version__}"
+    return sorted(os.listdir(version)) if version.exists() else []
+
+
+def test_hit_and_miss(cache_dir):
+    expr = (x**2 - y**2) / (x - y)
+    first = simplify_cache.cached_simplify(expr)
+    assert first == x + y
+    assert simplify_cache.stats == {'hits': 0, 'misses': 1}
+    assert len(_entries(cache_dir)) == 1
+
+    assert simplify_cache.cached_simplify(expr) == first
+    assert simplify_cache.stats == {'hits': 1, 'misses': 1}
+
+    # another expression, or the same one with other substitutions, is a miss
+    assert simplify_cache.cached_simplify((x**2 - y**2) / (x + y)) == x - y
+    assert simplify_cache.cached_simplify(expr, {y: 2 * x}) == 3 * x
+    assert simplify_cache.stats == {'hits': 1, 'misses': 3}
+    assert len(_entries(cache_dir)) == 3
+    assert not [name for name in _entries(cache_dir) if name.endswith('.tmp')]
+
+
+def test_key_depends_on_assumptions():
+    plain = symbols('x')
+    assert simplify_cache.cache_key(x) != simplify_cache.cache_key(plain)
+    assert simplify_cache.cache_key(x, {x: y}) != simplify_cache.cache_key(x, {y: x})
+
+
+def test_prunes_other_versions(cache_dir):
+    old = cache_dir / 'sympy-0.0.1'
+    old.mkdir()
+    (old / 'entry.txt').write_text("Symbol('x')", encoding='utf-8')
+    other = cache_dir / 'notes'
+    other.mkdir()
+    simplify_cache.cached_simplify(x + x)
+    assert not old.exists()
+    assert other.exists()
+    assert len(_entries(cache_dir)) == 1
+
+
+def test_load_round_trips():
+    f = Function('f')
+    for expr in (x**2 / y + Rational(1, 3) * pi * sqrt(2), f(x) * exp(-y),
+                 Piecewise((x, x > 1), (y, True)), -3 * x):
+        assert simplify_cache.load(srepr(expr)) == expr
+
+
+def test_code_in_the_cache_is_not_run(cache_dir, tmp_path):
+    expr = x * y / y
+    path = cache_dir / f"sympy-{sympy.__version__}" / (simplify_cache.cache_key(expr) + '.txt')
+    path.parent.mkdir()
+    marker = tmp_path / 'ran'
+    path.write_text(f"__import__('pathlib').Path({str(marker)!r}).touch()", encoding='utf-8')
+    assert simplify_cache.cached_simplify(expr) == x
+    assert not marker.exists()
+    assert simplify_cache.stats == {'hits': 0, 'misses': 1}
+    assert simplify_cache.load(path.read_text(encoding='utf-8')) == x
+    for text in ("Symbol('x').__class__", "Integer(2) + Integer(3)", "Symbol.__subclasses__()"):
+        with pytest.raises(ValueError):
+            simplify_cache.load(text)
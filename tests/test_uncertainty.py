@@ -0,0 +1,57 @@
+from decimal import localcontext
+
+import pytest
+
+import constants_framework
+import simplified_plancks_constants
+from constants_registry import registry
+
+'''
+    Monte Carlo propagation with few samples, against the nominal Decimal
+    results of the frameworks.
+'''
+
+FRAMEWORKS = [constants_framework, simplified_plancks_constants]
+SAMPLES = 2000
+
+
+@pytest.fixture(scope='module', params=FRAMEWORKS, ids=lambda m: m.__name__)
+def framework(request):
+    return request.param
+
+
+@pytest.fixture(scope='module')
+def results(framework):
+    return framework.validate_planck_units_uncertainty(SAMPLES, 512, seed=1)
+
+
+def test_reproducible(framework, results):
+    assert framework.validate_planck_units_uncertainty(SAMPLES, 512, seed=1) == results
+    assert framework.validate_planck_units_uncertainty(SAMPLES, 512, seed=2) != results
+
+
+def test_mean_near_nominal(framework, results):
+    with localcontext() as ctx:
+        ctx.prec = framework.PRECISION
+        nominal = framework.validate_planck_units(*framework.calculate_unit_scaling())
+    assert list(results) == list(nominal)
+    for name, (exp_val, calc_val, _) in nominal.items():
+        result = results[name]
+        assert result.expected == pytest.approx(float(exp_val), rel=1e-15), name
+        # well inside 6 standard errors of the mean
+        assert abs(result.mean - float(calc_val)) <= 6 * result.std / SAMPLES ** 0.5 \
+            + 1e-14 * abs(float(calc_val)), name
+
+
+def test_gravitational_constant(results):
+    G = registry()['G']
+    result = results['Gravitational constant']
+    assert result.std / result.expected == pytest.approx(float(G.relative_uncertainty), rel=0.1)
+    # the formula and the reference are the same draw of G
+    assert result.residual_std < 1e-6 * result.std
+    assert abs(result.z) < 2
+
+
+def test_exact_inputs_stay_exact():
+    result = constants_framework.validate_planck_units_uncertainty(100, 64, seed=1)['Planck constant E at 1Hz']
+    assert result.std == result.residual_std == result.z == 0
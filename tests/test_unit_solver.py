@@ -0,0 +1,69 @@
+from decimal import Decimal as D, localcontext
+
+import pytest
+
+import constants_registry as cr
+import unit_solver
+
+'''
+    The unit solver against the scalings working_imperial_units_model.py
+    printed before it used the solver, and the targets it cannot reach.
+'''
+
+
+def test_imperial_scalings():
+    with localcontext() as ctx:
+        ctx.prec = 50
+        solution = unit_solver.solve_scalings({'hc': 1, 'G': 1}, units=('m', 'kg'))
+        assert solution.residual < D('1e-40')
+        assert float(1 / solution.adjustments['m']) == pytest.approx(6.50009330403e+5, rel=1e-11)
+        assert float(1 / solution.adjustments['kg']) == pytest.approx(1.83300857081e+7, rel=1e-11)
+        for value in solution.values.values():
+            assert abs(value - 1) < D('1e-45')
+
+
+def test_divides_by_the_adjustment():
+    with localcontext() as ctx:
+        ctx.prec = 50
+        solution = unit_solver.solve_scalings({'c': 1})
+        assert abs(solution.adjustments['m'] / cr.known('c') - 1) < D('1e-45')
+
+
+def test_batch_matches_single_solves():
+    with localcontext() as ctx:
+        ctx.prec = 40
+        targets = [3e8, 1, 186282.397]
+        batch = unit_solver.solve_scalings({'c': targets})
+        assert len(batch) == len(targets)
+        for target, solution in zip(targets, batch):
+            single = unit_solver.solve_scalings({'c': target})
+            assert abs(solution.adjustments['m'] / single.adjustments['m'] - 1) < D('1e-35')
+
+
+def test_numeric_jacobian_model():
+    with localcontext() as ctx:
+        ctx.prec = 40
+        c = cr.known('c')
+        models = {'c2': lambda adjustments: c * c / adjustments['m'] ** 2}
+        solution = unit_solver.solve_scalings({'c2': 1}, units=('m',), models=models)
+        assert abs(solution.adjustments['m'] - c) < D('1e-30')
+
+
+def test_unreachable_targets_raise():
+    with pytest.raises(ValueError, match='do not fix'):
+        unit_solver.solve_scalings({'c': 1}, units=('kg',))
+    with pytest.raises(ValueError, match='do not fix'):
+        unit_solver.solve_scalings({'c': 1, 'hc': 1}, units=('m', 'K'))
+    with pytest.raises(ValueError, match='2 targets need 2 units'):
+        unit_solver.solve_scalings({'hc': 1, 'G': 1}, units=('m',))
+
+
+def test_catalog_model_follows_override():
+    try:
+        cr.override({'G': '6.67e-11'})
+        model = unit_solver.catalog_model('G')
+        assert model({}) == D('6.67e-11')
+        assert model({'kg': D(2)}) == D('6.67e-11') * 2
+    finally:
+        cr.override({})
+    assert unit_solver.catalog_model('G')({}) == cr.known('G')
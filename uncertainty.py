@@ -0,0 +1,159 @@
+import types
+from typing import Dict, NamedTuple
+
+import numpy as np
+
+from constants_registry import registry
+from formula_compiler import compile_validation
+
+'''
+    Monte Carlo propagation of the CODATA uncertainties through the
+    frameworks.
+
+    The rel_error column of validate_planck_units says how far a formula
+    lands from the reference value, but not whether that distance matters:
+    G is only known to about 22 ppm, so a 1e-5 residual in anything built
+    on G is noise.  This draws every input the frameworks take from
+    known() from a normal distribution with its standard uncertainty in
+    constants_catalog.txt (exact and blank uncertainties stay fixed), and
+    runs calculate_unit_scaling() and validate_planck_units() on the
+    samples.
+
+    The reference values are drawn too, so correlations between a formula
+    and its reference (the G formula and the G reference are the same
+    number) cancel the way they should.  For every constant the result has
+    the mean and standard deviation of the calculated value, and the mean,
+    standard deviation and z-score of calculated minus reference.  A |z|
+    under 2 or so means the residual is inside the measurement noise.
+    Correlations between different CODATA constants are not modelled.
+
+    The formulas run on float64 arrays, one chunk of samples at a time,
+    through the same namespace rebinding validate_planck_units_batch() uses,
+    so memory depends on the chunk size and not on the number of samples.
+'''
+
+# catalog symbols the frameworks keep in module globals, and the global names
+_GLOBALS = {'c': 'c', 'k_B': 'k_B', 'epsilon_0': 'e_0'}
+
+
+# relative rounding error allowed for a float64 run through the formulas
+_ROUNDING = 64 * np.finfo(np.float64).eps
+
+
+class _Samples(np.ndarray):
+    """float64 samples with the .sqrt() method the frameworks call on Decimals."""
+
+    def sqrt(self):
+        return np.sqrt(self)
+
+
+class Uncertainty(NamedTuple):
+    expected:      float    # reference value
+    mean:          float    # of the calculated value
+    std:           float
+    residual:      float    # mean of calculated - reference
+    residual_std:  float
+    z:             float    # residual / residual_std
+
+    @property
+    def rel_error(self) -> float:
+        return abs(self.residual / self.expected)
+
+    @property
+    def rel_std(self) -> float:
+        return self.residual_std / abs(self.expected)
+
+
+class _Draws:
+    """known() for one chunk: every constant drawn once and reused."""
+
+    def __init__(self, rng, size):
+        self.rng = rng
+        self.size = size
+        self.drawn = {}
+
+    def __call__(self, key):
+        entry = registry()[key]
+        values = self.drawn.get(entry.symbol)
+        if values is None:
+            sigma = float(entry.uncertainty or 0)
+            if self.rng is not None and sigma:
+                values = self.rng.normal(float(entry.value), sigma, self.size)
+            else:
+                values = np.full(self.size, float(entry.value))
+            values = self.drawn[entry.symbol] = values.view(_Samples)
+        return values
+
+
+def monte_carlo(calculate_unit_scaling, validate_planck_units, samples=1_000_000,
+                chunk_size=65536, seed=None) -> Dict[str, Uncertainty]:
+    """
+    Propagate the catalog uncertainties through a framework with samples
+    draws, chunk_size at a time.  Returns an Uncertainty per constant.
+    """
+    rng = np.random.default_rng(seed)
+    namespace = dict(calculate_unit_scaling.__globals__, D=np.float64, d_p=np.power,
+                     d_pi=lambda: np.float64(np.pi), d_sqrt_two_pi=lambda: np.sqrt(2 * np.pi))
+    scaling = types.FunctionType(calculate_unit_scaling.__code__, namespace)
+    compiled = compile_validation(validate_planck_units, namespace)
+
+    def run(draws):
+        namespace['known'] = draws
+        for symbol, name in _GLOBALS.items():
+            if name in namespace:
+                namespace[name] = draws(symbol)
+        compiled.reset()
+        expected, calculated = compiled.program.evaluate(*scaling())
+        shape = (draws.size,)
+        return (np.array([np.broadcast_to(v, shape) for v in expected]),
+                np.array([np.broadcast_to(v, shape) for v in calculated]))
+
+    # sums are taken around the nominal values to keep them accurate
+    nominal_expected, nominal = (v[:, 0] for v in run(_Draws(None, 1)))
+    count = 0
+    sums = np.zeros((4, len(compiled.names)))          # calc, calc^2, diff, diff^2
+    while count < samples:
+        size = min(chunk_size, samples - count)
+        expected, calculated = run(_Draws(rng, size))
+        shifted = calculated - nominal[:, None]
+        diff = (calculated - expected) - (nominal - nominal_expected)[:, None]
+        sums += [shifted.sum(1), (shifted ** 2).sum(1), diff.sum(1), (diff ** 2).sum(1)]
+        count += size
+
+    results = {}
+    for i, name in enumerate(compiled.names):
+        s1, s2, d1, d2 = sums[:, i]
+        std = np.sqrt(max(s2 - s1 * s1 / count, 0) / max(count - 1, 1))
+        residual_std = np.sqrt(max(d2 - d1 * d1 / count, 0) / max(count - 1, 1))
+        residual = nominal[i] - nominal_expected[i] + d1 / count
+        # float64 rounding is noise too, or exact formulas come out at z = inf
+        noise = np.hypot(residual_std, _ROUNDING * abs(nominal_expected[i]))
+        if noise > 0:
+            z = residual / noise
+        else:
+            z = 0.0 if residual == 0 else float(np.copysign(np.inf, residual))
+        results[name] = Uncertainty(float(nominal_expected[i]), float(nominal[i] + s1 / count),
+                                    float(std), float(residual), float(residual_std), float(z))
+    return results
+
+
+if __name__ == "__main__":
+    import importlib
+    import sys
+    import time
+    from decimal import getcontext
+
+    module = importlib.import_module(sys.argv[1] if len(sys.argv) > 1 else 'constants_framework')
+    getcontext().prec = module.PRECISION
+    samples = int(float(sys.argv[2])) if len(sys.argv) > 2 else 1_000_000
+
+    start = time.perf_counter()
+    results = monte_carlo(module.calculate_unit_scaling, module.validate_planck_units, samples)
+    print(f"{samples} samples through {module.__name__} in {time.perf_counter() - start:.2f} s\n")
+
+    print(f"{'Name':<30} | {'Mean':<22} | {'Resid Std':<10} | {'Rel Error':<10} | {'z':>8}")
+    print("-" * 94)
+    for name, u in results.items():
+        if name.startswith('\n'):
+            print()
+        print(f"{name.strip():<30} | {u.mean:<22.15e} | {u.rel_std:<10.3e} | {u.rel_error:<10.3e} | {u.z:>8.2f}")
@@ -0,0 +1,124 @@
+from fractions import Fraction
+from typing import Dict, List
+
+import numpy as np
+
+'''
+    Unit algebra on exponent vectors.
+
+    A constant in define_const_from_units.py is a number times a product
+    of powers of the base unit scalings (m, kg, s, K, C, A).  A
+    UnitProduct keeps exactly that: the number, and the vector of powers.
+    Multiplying, dividing and raising UnitProducts just adds, subtracts and
+    scales the vectors, so writing
+
+        hc = m**3 * kg / s**2
+
+    with the symbolic base units from base_units() records the powers
+    (3, 1, -2, 0, 0, 0) without anyone having to write them down.
+
+    A UnitCatalog stacks the vectors of a whole set of constants into one
+    exponent matrix.  Evaluating every constant for a set of base unit
+    values is then a single matrix product in log space,
+
+        log(values) = log(factors) + exponents @ log(base units)
+
+    and handing in arrays of base unit values evaluates every constant for
+    every unit system in the same product.
+'''
+
+BASE_UNITS = ('m', 'kg', 's', 'K', 'C', 'A')
+
+
+def _power(p) -> Fraction:
+    return Fraction(p).limit_denominator(1000) if isinstance(p, float) else Fraction(p)
+
+
+class UnitProduct:
+    """factor * m**a * kg**b * s**c * K**d * C**e * A**f"""
+
+    __slots__ = ('factor', 'powers')
+
+    def __init__(self, factor=1.0, powers=(0,) * len(BASE_UNITS)):
+        self.factor = factor
+        self.powers = tuple(Fraction(p) for p in powers)
+
+    def __mul__(self, other):
+        if isinstance(other, UnitProduct):
+            return UnitProduct(self.factor * other.factor,
+                               (a + b for a, b in zip(self.powers, other.powers)))
+        return UnitProduct(self.factor * other, self.powers)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if isinstance(other, UnitProduct):
+            return UnitProduct(self.factor / other.factor,
+                               (a - b for a, b in zip(self.powers, other.powers)))
+        return UnitProduct(self.factor / other, self.powers)
+
+    def __rtruediv__(self, other):
+        return UnitProduct(other / self.factor, (-a for a in self.powers))
+
+    def __pow__(self, p):
+        p = _power(p)
+        return UnitProduct(self.factor ** float(p), (a * p for a in self.powers))
+
+    def __neg__(self):
+        return UnitProduct(-self.factor, self.powers)
+
+    def units(self) -> str:
+        """The base unit product, like 'm^3 kg s^-2'."""
+        parts = []
+        for unit, p in zip(BASE_UNITS, self.powers):
+            if p == 1:
+                parts.append(unit)
+            elif p:
+                parts.append(f"{unit}^{p}")
+        return ' '.join(parts) or '1'
+
+    def __repr__(self):
+        return f"UnitProduct({self.factor!r}, {self.units()})"
+
+
+def base_units():
+    """The symbolic base units, in the order of BASE_UNITS."""
+    return tuple(UnitProduct(1.0, [1 if j == i else 0 for j in range(len(BASE_UNITS))])
+                 for i in range(len(BASE_UNITS)))
+
+
+class UnitCatalog:
+    """A set of named UnitProducts stacked into a factor vector and an exponent matrix."""
+
+    def __init__(self, products: Dict[str, UnitProduct]):
+        # plain numbers are dimensionless constants
+        products = {name: p if isinstance(p, UnitProduct) else UnitProduct(p)
+                    for name, p in products.items()}
+        self.names: List[str] = list(products)
+        self.products = products
+        self.factors = np.array([products[n].factor for n in self.names], dtype=np.float64)
+        self.exponents = np.array([[float(p) for p in products[n].powers] for n in self.names],
+                                  dtype=np.float64)
+
+    def __len__(self):
+        return len(self.names)
+
+    def evaluate(self, **bases) -> Dict[str, np.ndarray]:
+        """
+        Every constant for the given base unit values, by name.
+
+        Each base unit can be a number or an array; arrays broadcast, so a
+        sweep over many unit systems is still one matrix product.
+        """
+        missing = set(BASE_UNITS) - set(bases)
+        if missing:
+            raise TypeError(f"missing base units: {', '.join(sorted(missing))}")
+        values = self.evaluate_matrix(*(bases[u] for u in BASE_UNITS))
+        return {name: values[i] for i, name in enumerate(self.names)}
+
+    def evaluate_matrix(self, m, kg, s, K, C, A) -> np.ndarray:
+        """(constants,) or (constants, samples) array of values."""
+        logs = np.stack(np.broadcast_arrays(*(np.log(np.asarray(x, dtype=np.float64))
+                                              for x in (m, kg, s, K, C, A))))
+        product = np.exp(np.tensordot(self.exponents, logs, axes=1))
+        return self.factors.reshape((-1,) + (1,) * (logs.ndim - 1)) * product
@@ -0,0 +1,161 @@
+from decimal import Decimal as D, getcontext, localcontext
+from typing import Callable, Dict, List, Mapping, NamedTuple, Optional, Sequence
+
+from constants_registry import DIMENSIONS, known, registry
+
+'''
+    Solve for the meter, kg and second adjustments that give constants chosen
+    values.
+
+    The README describes searching for a meter redefinition that lands on
+    a target hc, and working_imperial_units_model.py used meter and mass
+    scalings found by hand.  This finds them to the full Decimal precision.
+
+    The adjustment of a unit is the size of the new unit measured in the
+    old one, the convention of rescaler.py and the adjust functions of
+    redefine_g.py and simple_redefine_h.py: a constant with base unit
+    powers p is divided by it,
+
+        new = old / (meter^p_m * kg^p_kg * second^p_s)
+
+    so one over an adjustment is how many new units fit in one old unit,
+    the meter_scaling that working_imperial_units_model.py printed.
+
+    In log space that is linear, so Newton's method on the logs of the
+    adjustments is exact after one step for the catalog constants, and
+    quadratic for any other model handed in as a function.
+
+        solve_scalings({'hc': 1, 'G': 1}, units=('m', 'kg'))
+        solve_scalings({'c': 3e8})                               # meter only
+        solve_scalings({'c': [3e8, 1, 186282.397]})              # a batch
+
+    A batch solves each set of targets in turn, starting from the previous
+    solution, so nearby targets take only a few iterations each.
+'''
+
+
+class Solution(NamedTuple):
+    adjustments: Dict[str, D]    # unit -> size of the new unit in old units
+    values:      Dict[str, D]    # the target constants in the new units
+    iterations:  int
+    residual:    D               # largest |ln(value / target)|
+
+
+def _solve_linear(matrix, rhs):
+    """matrix x = rhs by Gaussian elimination with partial pivoting, in Decimal."""
+    n = len(rhs)
+    a = [list(row) + [r] for row, r in zip(matrix, rhs)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(a[r][col]))
+        if a[pivot][col] == 0:
+            raise ValueError("the targets do not fix the adjustments of these units, "
+                             "pick units the target constants depend on independently")
+        a[col], a[pivot] = a[pivot], a[col]
+        for r in range(col + 1, n):
+            f = a[r][col] / a[col][col]
+            for k in range(col, n + 1):
+                a[r][k] -= f * a[col][k]
+    x = [D(0)] * n
+    for r in reversed(range(n)):
+        x[r] = (a[r][n] - sum(a[r][k] * x[k] for k in range(r + 1, n))) / a[r][r]
+    return x
+
+
+def catalog_model(symbol) -> Callable[[Dict[str, D]], D]:
+    """The value of a catalog constant after rescaling the units, starting from known(symbol)."""
+    start = known(symbol)
+    powers = dict(zip(DIMENSIONS, registry()[symbol].dimension))
+
+    def model(adjustments):
+        value = start
+        for unit, adjustment in adjustments.items():
+            if powers[unit]:
+                value /= adjustment ** powers[unit]
+        return value
+    model.powers = powers
+    return model
+
+
+def solve_scalings(targets: Mapping[str, object], units: Optional[Sequence[str]] = None,
+                   models: Optional[Mapping[str, Callable]] = None, tol=None, max_iter=50):
+    """
+    Adjustments of units that give every target constant its target value.
+
+    targets maps a catalog symbol (or a name in models) to a value or a
+    sequence of values.  units default to the first len(targets) of m, kg,
+    s.  models can give the rescaled value of a target as a function of the
+    {unit: adjustment} dict.  Returns a Solution, or a list of them for
+    sequences of targets.
+    """
+    names = list(targets)
+    units = tuple(units or ('m', 'kg', 's')[:len(names)])
+    if len(units) != len(names):
+        raise ValueError(f"{len(names)} targets need {len(names)} units, got {', '.join(units)}")
+    models = {name: (models or {}).get(name) or catalog_model(name) for name in names}
+
+    batch = [not isinstance(targets[n], (int, float, str, D)) for n in names]
+    if any(batch):
+        size = max(len(targets[n]) for n, b in zip(names, batch) if b)
+        rows = [{n: targets[n][i] if b else targets[n] for n, b in zip(names, batch)}
+                for i in range(size)]
+    else:
+        rows = [dict(targets)]
+
+    if tol is None:
+        tol = D(10) ** (8 - getcontext().prec)
+
+    # analytic Jacobian of the logs when every target is a catalog constant
+    jacobian = None
+    if all(hasattr(models[n], 'powers') for n in names):
+        jacobian = [[D(-models[n].powers[u]) for u in units] for n in names]
+
+    solutions = []
+    x = [D(0)] * len(units)                           # log adjustments, start at no change
+    for row in rows:
+        goal = [D(str(row[n])).ln() for n in names]
+        iterations = 0
+        while True:
+            adjustments = {u: xi.exp() for u, xi in zip(units, x)}
+            values = [models[n](adjustments) for n in names]
+            residual = [v.ln() - g for v, g in zip(values, goal)]
+            worst = max(abs(r) for r in residual)
+            if worst <= tol or iterations >= max_iter:
+                break
+            step = _solve_linear(jacobian or _numeric_jacobian(models, names, units, x), residual)
+            x = [xi - s for xi, s in zip(x, step)]
+            iterations += 1
+        solutions.append(Solution(adjustments, dict(zip(names, values)), iterations, worst))
+
+    return solutions if any(batch) else solutions[0]
+
+
+def _numeric_jacobian(models, names, units, x):
+    """d ln(model) / d ln(adjustment) by central differences at extra precision."""
+    with localcontext() as ctx:
+        step = D(10) ** -(ctx.prec // 3)
+        ctx.prec += ctx.prec // 3
+        columns = []
+        for j in range(len(units)):
+            up = {u: (xi + (step if i == j else 0)).exp() for i, (u, xi) in enumerate(zip(units, x))}
+            down = {u: (xi - (step if i == j else 0)).exp() for i, (u, xi) in enumerate(zip(units, x))}
+            columns.append([(models[n](up).ln() - models[n](down).ln()) / (2 * step) for n in names])
+    return [[+columns[j][i] for j in range(len(units))] for i in range(len(names))]
+
+
+if __name__ == "__main__":
+    getcontext().prec = 50
+
+    for targets, units in (({'c': 3e8}, ('m',)),
+                           ({'hc': 1, 'G': 1}, ('m', 'kg')),
+                           ({'c': 1, 'hc': 1, 'G': 1}, ('m', 'kg', 's'))):
+        solution = solve_scalings(targets, units)
+        print(f"\ntargets {targets} by rescaling {', '.join(units)} "
+              f"({solution.iterations} iterations, residual {solution.residual:.3e})")
+        for unit, adjustment in solution.adjustments.items():
+            print(f"  {unit:<3} adjustment {adjustment}  ({1 / adjustment} new per old)")
+
+    batch = solve_scalings({'c': [3e8, 1, 186282.397, 983571056.43]})
+    print("\nbatch of c targets by rescaling m")
+    for solution in batch:
+        print(f"  c = {solution.values['c']:<50.40}  m adjustment {solution.adjustments['m']:.30}  "
+              f"({solution.iterations} iterations)")